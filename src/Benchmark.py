@@ -0,0 +1,114 @@
+import argparse
+import sys
+import time
+import numpy as np
+from ImageMask import Mask
+import ImageJit
+
+
+def synthetic_sheet(rows: int = 16, columns: int = 16, sprite: int = 24, gap: int = 8) -> np.ndarray:
+    """
+
+    build a synthetic sheet of rows x columns plus shaped sprites on a 0 background.
+
+    :return: the sheet as a 2D uint8 array
+    :rtype: np.ndarray
+
+    """
+    cell = sprite + gap
+    sheet = np.zeros((rows * cell + gap, columns * cell + gap), dtype=np.uint8)
+    middle = sprite // 2
+    for i in range(rows):
+        for j in range(columns):
+            top, left = gap + i * cell, gap + j * cell
+            sheet[top + middle, left:left + sprite] = 1
+            sheet[top:top + sprite, left + middle] = 1
+    return sheet
+
+
+def best_time(function, repeat: int):
+    """
+
+    call function repeat times and keep the best time.
+
+    :return: the best time in seconds and the last result
+    :rtype: tuple[float, object]
+
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def labelling_backends(workers: int = None, tile_size: int = 512):
+    """
+
+    get the labelling backends to compare, by name, numba only if it is installed.
+
+    :rtype: dict[str, Callable[[Mask], BoxSet]]
+
+    """
+    backends = {
+        "serial": lambda mask: mask.find_sprite_boxes(),
+        "parallel-thread": lambda mask: mask.find_sprite_boxes(workers, tile_size, "thread"),
+        "parallel-process": lambda mask: mask.find_sprite_boxes(workers, tile_size, "process"),
+    }
+    if ImageJit.AVAILABLE:
+        backends["numba"] = lambda mask: mask.find_sprite_boxes(backend="numba")
+    return backends
+
+
+def benchmark_labelling(mask: Mask, repeat: int = 3, workers: int = None, tile_size: int = 512):
+    """
+
+    time each labelling backend on the mask and check their boxes are the serial ones.
+
+    :return: for each backend, its name, best time, box count and if its boxes are identical
+    :rtype: list[dict]
+
+    """
+    reports = []
+    reference = None
+    for name, backend in labelling_backends(workers, tile_size).items():
+        seconds, boxes = best_time(lambda: backend(mask), repeat)
+        reference = boxes if reference is None else reference
+        reports.append({
+            "backend": name,
+            "seconds": seconds,
+            "boxes": len(boxes),
+            "identical": boxes == reference,
+        })
+    return reports
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare the mask labelling backends.")
+    parser.add_argument("image", nargs="?", help="sheet to label, a synthetic sheet by default")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--tile-size", type=int, default=512)
+    args = parser.parse_args(argv)
+
+    if args.image is None:
+        image = synthetic_sheet()
+    else:
+        import PIL.Image
+
+        image = PIL.Image.open(args.image)
+    mask = Mask(image)
+    print(f"mask {mask.mask_array.shape[1]}x{mask.mask_array.shape[0]}")
+    if not ImageJit.AVAILABLE:
+        print("  numba is not installed, its backend is skipped")
+    for report in benchmark_labelling(mask, args.repeat, args.workers, args.tile_size):
+        print(
+            f"  {report['backend']:<18} {report['seconds'] * 1000:9.1f} ms"
+            f"  {report['boxes']:6d} boxes  identical={report['identical']}"
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
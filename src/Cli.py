@@ -0,0 +1,445 @@
+import argparse
+import os
+import sys
+import Startup
+from ImageManifest import ImageManifest
+from ImageEncoder import ImageEncoder
+from ImageArchive import ImageArchive
+from ImageDeduplicate import ImageDeduplicator
+from ImageAnimation import ImageAnimation
+import logging
+
+
+logger = logging.getLogger('cli')
+logger.setLevel(logging.DEBUG)
+
+OUTPUTS = ["sprites", *ImageManifest.STRATEGIES, *ImageArchive.STRATEGIES]
+
+# directories created by the asynchronous saves of this run, shared by every
+# composite (scales, frames, batch sheets) so each is created once
+DIRECTORIES = set()
+
+
+def region(text: str):
+    """
+
+    parse a region written as left,top,right,bottom.
+
+    :rtype: tuple[int, int, int, int]
+
+    """
+    values = text.split(',')
+    if len(values) != 4:
+        raise argparse.ArgumentTypeError(f"a region needs left,top,right,bottom, region={text}")
+    return tuple(int(value) for value in values)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+
+    build the parser of the command line, the same settings as the window.
+
+    :rtype: argparse.ArgumentParser
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="sprite-sheet-splitter",
+        description="Split a sprite sheet without opening the window."
+    )
+    parser.add_argument("image", nargs="?", help="sprite sheet to split")
+    parser.add_argument("-r", "--rows", type=int, default=1, help="row count")
+    parser.add_argument("-c", "--columns", type=int, default=1, help="column count")
+    parser.add_argument("--mode", choices=["auto", "grid"], default="auto",
+                        help="auto finds the sprites in the mask, grid cuts rows x columns cells after the margins")
+    parser.add_argument("--left", type=int, default=0, help="left margin, grid mode only")
+    parser.add_argument("--right", type=int, default=0, help="right margin, grid mode only")
+    parser.add_argument("--top", type=int, default=0, help="top margin, grid mode only")
+    parser.add_argument("--bottom", type=int, default=0, help="bottom margin, grid mode only")
+    parser.add_argument("-o", "--output-dir", default="sprites", help="output directory")
+    parser.add_argument("-n", "--name", default="sprite", help="sprite name prefix")
+    parser.add_argument("--output", choices=OUTPUTS, default="sprites", help="output mode")
+    parser.add_argument("--encoder", choices=list(ImageEncoder.PRESETS), help="encoder preset")
+    parser.add_argument("--trim", action="store_true",
+                        help="trim each sprite to its content, offsets are written in <name>.json")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="workers labelling the mask, 0 for the CPU count")
+    parser.add_argument("--region", dest="regions", action="append", type=region,
+                        help="only split this region as left,top,right,bottom, can be repeated")
+    parser.add_argument("--backend", choices=["serial", "tiles", "numba"],
+                        help="labelling backend, chosen from --workers by default, "
+                             "numba falls back to serial if it isn't installed")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="build the mask strip by strip, for the sheets too large for the memory")
+    parser.add_argument("--memory-budget", type=int, default=1024,
+                        help="MiB used at most when the image is a directory of images, "
+                             "the larger images go through the low memory path")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="images split at once when the image is a directory, 0 for the CPU count")
+    parser.add_argument("--dedup", choices=["none", *ImageDeduplicator.STRATEGIES], default="none",
+                        help="remove duplicate sprites")
+    parser.add_argument("--async", dest="asynchronous", action="store_true",
+                        help="overlap encoding and writes")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="max sprites in flight with --async")
+    parser.add_argument("--scales",
+                        help="comma separated scales written with a @<scale>x suffix, "
+                             "integers are nearest-neighbour upscales, 1/n (0.5, 0.25) downscales, "
+                             "1 is written without suffix, e.g. 1,2,4,0.5")
+    parser.add_argument("--animation", choices=["gif", "apng"],
+                        help="write the sprites as one animation <name>.gif or <name>.png instead")
+    parser.add_argument("--anchor", default="bottom", choices=list(ImageAnimation.ANCHORS),
+                        help="position of the sprites in the animation frames, bottom by default")
+    parser.add_argument("--duration", type=int, default=100,
+                        help="duration of each animation frame in milliseconds")
+    parser.add_argument("--row", type=int, help="animate only this row of sprites")
+    parser.add_argument("--uniform", action="store_true",
+                        help="write the sprites on one sheet of equal cells <name>.png, "
+                             "placed at the --anchor, with the cells in <name>cells.json")
+    parser.add_argument("--cells-per-row", type=int, default=0,
+                        help="cells per row of the --uniform sheet, 0 for a square grid")
+    parser.add_argument("--frames", action="store_true",
+                        help="split every frame of an animated image (GIF, APNG, TIFF), "
+                             "sprites are called <name><frame>_<sprite>")
+    parser.add_argument("--watch", action="store_true",
+                        help="watch the image (or the directory of images) and split it again on change")
+    parser.add_argument("--interval", type=float, default=0.5,
+                        help="seconds between two polls with --watch")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile each stage with cProfile and tracemalloc, "
+                             "the report is written as <name>profile.txt in the output directory")
+    parser.add_argument("--import-time", action="store_true",
+                        help="print the import time report and exit")
+    return parser
+
+
+def run(args, profiler=None) -> None:
+    """
+
+    split the image and write the output asked by the arguments.
+
+    :param args: parsed arguments
+    :param profiler: profiles the split stages of split_sheet, then the crop and save stages, if enabled
+
+    :type args: argparse.Namespace
+    :type profiler: StageProfiler | None
+
+    :rtype: None
+
+    """
+    from SpriteSheet import split_sheet
+    from ImageProfiler import StageProfiler
+
+    profiler = profiler if profiler is not None else StageProfiler(enabled=False)
+    result = split_sheet(args.image, split_options(args), profiler)
+    img_type = args.image.split('.')[-1]
+    image = os.path.basename(args.image)
+    if args.output in ImageManifest.STRATEGIES:
+        manifest = ImageManifest(image, result.size, result.boxes, args.name, img_type, result.sources)
+        with profiler.stage("manifest"):
+            manifest.save(args.output_dir, ImageManifest.STRATEGIES[args.output]())
+        return
+    with profiler.stage("crop"):
+        sprites = list(result.sprites)
+    with profiler.stage("save"):
+        composite = save_sprites(args, sprites, args.name, img_type)
+    if args.trim:
+        with profiler.stage("manifest"):
+            ImageManifest(
+                image, result.size, result.boxes, args.name, composite.extension(), result.sources
+            ).save(args.output_dir)
+
+
+def run_frames(args, profiler=None) -> None:
+    """
+
+    split each frame of the image and write the outputs of each frame,
+    called as the name followed by the frame index, then the sprite index.
+
+    The frames are decoded and split one after another, only one frame
+    is kept in memory.
+
+    :param args: parsed arguments
+    :param profiler: profiles the stages of every frame if enabled
+
+    :type args: argparse.Namespace
+    :type profiler: StageProfiler | None
+
+    :rtype: None
+
+    """
+    from SpriteSheet import split_frames
+    from ImageProfiler import StageProfiler
+
+    profiler = profiler if profiler is not None else StageProfiler(enabled=False)
+    img_type = args.image.split('.')[-1]
+    image = os.path.basename(args.image)
+    for index, result in split_frames(args.image, split_options(args), profiler):
+        name = f"{args.name}{index}_"
+        if args.output in ImageManifest.STRATEGIES:
+            manifest = ImageManifest(image, result.size, result.boxes, name, img_type, result.sources)
+            with profiler.stage("manifest"):
+                manifest.save(args.output_dir, ImageManifest.STRATEGIES[args.output]())
+            continue
+        with profiler.stage("save"):
+            composite = save_sprites(args, list(result.sprites), name, img_type)
+        if args.trim:
+            with profiler.stage("manifest"):
+                ImageManifest(
+                    image, result.size, result.boxes, name, composite.extension(), result.sources
+                ).save(args.output_dir)
+
+
+def run_animation(args, profiler=None) -> None:
+    """
+
+    split the image and write its sprites, or a row of them, as an animation.
+
+    :param args: parsed arguments
+    :param profiler: profiles the split and the animation stages if enabled
+
+    :type args: argparse.Namespace
+    :type profiler: StageProfiler | None
+
+    :rtype: None
+
+    """
+    from SpriteSheet import split_sheet
+    from ImageProfiler import StageProfiler
+
+    profiler = profiler if profiler is not None else StageProfiler(enabled=False)
+    result = split_sheet(args.image, split_options(args), profiler)
+    with profiler.stage("animation"):
+        animation = ImageAnimation.from_result(result, args.row, args.anchor)
+        animation.save(args.output_dir, args.name, args.animation, args.duration)
+
+
+def run_uniform(args, profiler=None) -> None:
+    """
+
+    split the image and write its sprites on one sheet of equal cells.
+
+    :param args: parsed arguments
+    :param profiler: profiles the split and the layout stages if enabled
+
+    :type args: argparse.Namespace
+    :type profiler: StageProfiler | None
+
+    :rtype: None
+
+    """
+    from SpriteSheet import split_sheet
+    from ImageUniform import UniformSheet
+    from ImageProfiler import StageProfiler
+
+    profiler = profiler if profiler is not None else StageProfiler(enabled=False)
+    result = split_sheet(args.image, split_options(args), profiler)
+    with profiler.stage("uniform"):
+        sheet = UniformSheet.from_result(result, args.cells_per_row or None, args.anchor)
+        sheet.save(args.output_dir, args.name, args.image.split('.')[-1])
+
+
+def save_sprites(args, sprites, name: str, img_type: str):
+    """
+
+    write the sprites as asked by the arguments, one file per sprite or an archive,
+    and with --scales, the sprites of each scale with its suffix (sprite0@2x.png).
+    The trim manifest names the 1x sprites, so with --trim they are always written.
+
+    :param args: parsed arguments
+    :param sprites: sprites to write
+    :param name: sprite name prefix
+    :param img_type: sprite type, used without encoder
+
+    :type args: argparse.Namespace
+    :type sprites: list[Image]
+    :type name: str
+    :type img_type: str
+
+    :return: the composite which wrote the 1x sprites, None if they aren't written
+    :rtype: ImageSaveComposite | None
+
+    """
+    from ImageSaveComposite import ImageSaveComposite
+
+    variants = {1: sprites}
+    if args.scales is not None:
+        from ImageScale import SpriteScaler
+
+        scaler = SpriteScaler(args.scales.split(','))
+        if args.trim and 1 not in scaler.scales:
+            scaler = SpriteScaler([1, *scaler.scales])
+        variants = scaler.variants(sprites)
+    composites = {}
+    for scale, images in variants.items():
+        composite = ImageSaveComposite.from_images_to_composite(
+            images,
+            args.output_dir,
+            name,
+            img_type
+        )
+        if scale != 1:
+            composite.suffix = SpriteScaler.suffix(scale)
+        composite.deduplicator = ImageDeduplicator.from_name(args.dedup)
+        composite.directories = DIRECTORIES
+        if args.encoder is not None:
+            composite.encoder = ImageEncoder(args.encoder)
+        if args.output != "sprites":
+            composite.save_archive(args.output)
+        elif args.asynchronous:
+            import asyncio
+
+            asyncio.run(composite.save_async(args.concurrency))
+        else:
+            composite.save()
+        composites[scale] = composite
+    return composites.get(1)
+
+
+def split_options(args):
+    """
+
+    get the library split options from the arguments.
+
+    :param args: parsed arguments
+    :type args: argparse.Namespace
+
+    :rtype: SplitOptions
+
+    """
+    from SpriteSheet import SplitOptions
+
+    return SplitOptions(
+        args.rows,
+        args.columns,
+        left=args.left,
+        right=args.right,
+        top=args.top,
+        bottom=args.bottom,
+        mode=args.mode,
+        trim=args.trim,
+        workers=args.workers or None,
+        low_memory=args.low_memory,
+        backend=args.backend,
+        regions=args.regions
+    )
+
+
+def batch(args) -> None:
+    """
+
+    split every image of the directory under the memory budget, the sprites
+    of each image are written in the directory named as the image.
+
+    :param args: parsed arguments
+    :type args: argparse.Namespace
+
+    :rtype: None
+
+    """
+    from ImageScheduler import MemoryScheduler
+    from ImageWatcher import SheetWatcher
+    from SpriteSheet import split_sheet
+
+    filenames = sorted(
+        os.path.join(args.image, name)
+        for name in os.listdir(args.image)
+        if name.lower().endswith(SheetWatcher.EXTENSIONS)
+    )
+
+    def split(plan) -> int:
+        options = split_options(args)
+        if plan["path"] == "low-memory":
+            options.low_memory = True
+        result = split_sheet(plan["filename"], options)
+        name = os.path.splitext(os.path.basename(plan["filename"]))[0]
+        image = os.path.basename(plan["filename"])
+        img_type = plan["filename"].split('.')[-1]
+        output = argparse.Namespace(**{**vars(args), "output_dir": os.path.join(args.output_dir, name)})
+        os.makedirs(output.output_dir, exist_ok=True)
+        if args.output in ImageManifest.STRATEGIES:
+            ImageManifest(image, result.size, result.boxes, args.name, img_type, result.sources).save(
+                output.output_dir, ImageManifest.STRATEGIES[args.output]()
+            )
+            return len(result.boxes)
+        composite = save_sprites(output, list(result.sprites), args.name, img_type)
+        if args.trim:
+            ImageManifest(
+                image, result.size, result.boxes, args.name, composite.extension(), result.sources
+            ).save(output.output_dir)
+        return len(result.boxes)
+
+    scheduler = MemoryScheduler(args.memory_budget * 2 ** 20, args.jobs or None)
+    counts = scheduler.run(filenames, split, split_options(args), args.output not in ImageManifest.STRATEGIES)
+    logger.info(f"{sum(counts)} sprites split from {len(filenames)} images")
+
+
+def watch(args) -> None:
+    """
+
+    split the image, or the images of the directory, each time they change.
+
+    :param args: parsed arguments
+    :type args: argparse.Namespace
+
+    :rtype: None
+
+    """
+    from ImageWatcher import SheetWatcher
+
+    watcher = SheetWatcher(
+        args.image,
+        args.output_dir,
+        split_options(args),
+        args.encoder,
+        args.interval,
+        dedup=args.dedup,
+        output=args.output
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
+
+
+def main(argv=None) -> int:
+    """
+
+    entry point of the command line.
+
+    :return: exit status
+    :rtype: int
+
+    """
+    args = build_parser().parse_args(argv)
+    if args.import_time:
+        Startup.print_import_report(Startup.CLI_MODULES)
+        return 0
+    if args.image is None:
+        build_parser().error("the image is required")
+    Startup.configure_logging()
+    logger.info("start command line on " + os.path.abspath(args.image))
+    profiler = None
+    if args.profile:
+        from ImageProfiler import StageProfiler
+
+        profiler = StageProfiler()
+    if args.watch:
+        watch(args)
+    elif os.path.isdir(args.image):
+        batch(args)
+    elif args.animation is not None:
+        run_animation(args, profiler)
+    elif args.uniform:
+        run_uniform(args, profiler)
+    elif args.frames:
+        run_frames(args, profiler)
+    else:
+        run(args, profiler)
+    if profiler is not None:
+        profiler.save(args.output_dir, args.name)
+    logger.info("end command line")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import threading
+import logging
+
+
+logger = logging.getLogger('debounce')
+logger.setLevel(logging.DEBUG)
+
+
+class Debouncer:
+    """
+
+    Debouncer class, calls a function once a burst of calls is over.
+
+    Each call restarts a timer, the function is only called when no call
+    happened during the delay, so a burst of calls runs the function once.
+
+    """
+
+    def __init__(self, function, delay: float = 0.3) -> None:
+        """
+
+        Debouncer's constructor, needs the function to call and the delay.
+
+        :param function: function called without argument
+        :param delay: delay in seconds without call before calling function
+        :type delay: float
+
+        :rtype: None
+
+        """
+        self.function = function
+        self.delay = delay
+        self.timer = None
+        self.lock = threading.Lock()
+
+    def __call__(self, *args) -> None:
+        """
+
+        restart the timer, the arguments are ignored so the debouncer can be
+        used directly as an event handler.
+
+        :rtype: None
+
+        """
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.delay, self.function)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def cancel(self) -> None:
+        """
+
+        cancel the pending call, if any.
+
+        :rtype: None
+
+        """
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
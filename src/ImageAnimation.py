@@ -0,0 +1,282 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import os
+import logging
+
+# PIL is imported at first use, the anchors are needed to build the CLI
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+logger = logging.getLogger('animation')
+logger.setLevel(logging.DEBUG)
+
+
+class AnimationStrategy:
+    """
+
+    AnimationStrategy class, encodes the frames of an animation in one file.
+
+    All the frames are written by one PIL save call with save_all, so the
+    frames are encoded in one pass, straight from memory.
+
+    """
+
+    EXTENSION = None
+    FORMAT = None
+
+    def options(self, duration: int, loop: int) -> dict:
+        return {"duration": duration, "loop": loop}
+
+    def prepare(self, frames):
+        return frames
+
+    def save(self, frames, filename: str, duration: int = 100, loop: int = 0) -> None:
+        """
+
+        encode the frames in filename.
+
+        :param frames: frames of the same size
+        :param filename: animation filename
+        :param duration: duration of each frame in milliseconds
+        :param loop: loop count, 0 to loop forever
+
+        :rtype: None
+
+        """
+        frames = self.prepare(frames)
+        frames[0].save(
+            filename,
+            format=self.FORMAT,
+            save_all=True,
+            append_images=frames[1:],
+            **self.options(duration, loop)
+        )
+
+
+class GifAnimationStrategy(AnimationStrategy):
+    """
+
+    GifAnimationStrategy class, subclass of AnimationStrategy,
+    encodes a GIF, each frame replaces the previous one.
+
+    """
+
+    EXTENSION = "gif"
+    FORMAT = "GIF"
+
+    def options(self, duration: int, loop: int) -> dict:
+        return {**super().options(duration, loop), "disposal": 2}
+
+
+class ApngAnimationStrategy(AnimationStrategy):
+    """
+
+    ApngAnimationStrategy class, subclass of AnimationStrategy,
+    encodes an APNG, lossless, with the full alpha channel.
+
+    """
+
+    EXTENSION = "png"
+    FORMAT = "PNG"
+
+    def options(self, duration: int, loop: int) -> dict:
+        return {**super().options(duration, loop), "disposal": 1, "blend": 0}
+
+
+class ImageAnimation:
+    """
+
+    ImageAnimation class, assembles split sprites in an animation.
+
+    The sprites have different sizes, so each one is pasted on a transparent
+    canvas of the largest sprite size, at the position given by the anchor:
+    bottom keeps the feet of a character on the same line, center keeps its
+    middle in place. With the offsets of trimmed sprites, each sprite goes
+    back to its place in its source box, so the animation doesn't wobble.
+
+    """
+
+    STRATEGIES = {
+        "gif": GifAnimationStrategy,
+        "apng": ApngAnimationStrategy,
+    }
+
+    ANCHORS = {
+        "top-left": (0.0, 0.0),
+        "top": (0.5, 0.0),
+        "top-right": (1.0, 0.0),
+        "left": (0.0, 0.5),
+        "center": (0.5, 0.5),
+        "right": (1.0, 0.5),
+        "bottom-left": (0.0, 1.0),
+        "bottom": (0.5, 1.0),
+        "bottom-right": (1.0, 1.0),
+    }
+
+    def __init__(self, sprites, anchor: str = "bottom", offsets=None, size=None) -> None:
+        """
+
+        ImageAnimation's constructor, needs the sprites, in the order of the frames.
+
+        :param sprites: sprites of the animation
+        :param anchor: position of the sprites in the canvas, a key of ANCHORS
+        :param offsets: position of each sprite in the canvas, replaces the anchor
+        :param size: canvas size, the largest sprite size (or the bounds of the offsets) by default
+
+        :type sprites: list[Image]
+        :type anchor: str
+        :type offsets: list[tuple[int, int]] | None
+        :type size: tuple[int, int] | None
+
+        :rtype: None
+
+        """
+        if anchor not in ImageAnimation.ANCHORS:
+            raise ValueError(f"unknown anchor {anchor}, expected one of {list(ImageAnimation.ANCHORS)}")
+        self.sprites = list(sprites)
+        if not self.sprites:
+            raise ValueError("an animation needs at least one sprite")
+        if offsets is not None and len(offsets) != len(self.sprites):
+            raise ValueError(f"{len(offsets)} offsets for {len(self.sprites)} sprites")
+        self.anchor = anchor
+        self.offsets = offsets
+        self.size = size if size is not None else self.canvas_size()
+
+    def canvas_size(self):
+        """
+
+        get the smallest canvas holding every sprite at its position.
+
+        :rtype: tuple[int, int]
+
+        """
+        if self.offsets is None:
+            return (
+                max(sprite.width for sprite in self.sprites),
+                max(sprite.height for sprite in self.sprites)
+            )
+        return (
+            max(x + sprite.width for sprite, (x, _) in zip(self.sprites, self.offsets)),
+            max(y + sprite.height for sprite, (_, y) in zip(self.sprites, self.offsets))
+        )
+
+    def position(self, index: int):
+        """
+
+        get the position of the sprite at index in the canvas.
+
+        :rtype: tuple[int, int]
+
+        """
+        if self.offsets is not None:
+            return tuple(self.offsets[index])
+        fx, fy = ImageAnimation.ANCHORS[self.anchor]
+        sprite = self.sprites[index]
+        return (
+            int((self.size[0] - sprite.width) * fx),
+            int((self.size[1] - sprite.height) * fy)
+        )
+
+    def frames(self):
+        """
+
+        get the sprites pasted on canvases of the same size.
+
+        :rtype: list[Image]
+
+        """
+        from PIL import Image
+
+        frames = []
+        for i, sprite in enumerate(self.sprites):
+            canvas = Image.new("RGBA", self.size, (0, 0, 0, 0))
+            canvas.paste(sprite.convert("RGBA"), self.position(i))
+            frames.append(canvas)
+        return frames
+
+    def save(self, path: str, name: str, animation_type: str = "gif", duration: int = 100, loop: int = 0) -> str:
+        """
+
+        encode the animation in path, called as name.
+
+        :param path: output directory
+        :param name: animation name
+        :param animation_type: gif or apng
+        :param duration: duration of each frame in milliseconds
+        :param loop: loop count, 0 to loop forever
+
+        :return: the animation filename
+        :rtype: str
+
+        """
+        strategy = ImageAnimation.STRATEGIES[animation_type]()
+        os.makedirs(path, exist_ok=True)
+        filename = os.path.join(path, name + '.' + strategy.EXTENSION)
+        logger.info(f"encode {len(self.sprites)} frames of {self.size} in {filename}")
+        strategy.save(self.frames(), filename, duration, loop)
+        return filename
+
+    @staticmethod
+    def rows(boxes):
+        """
+
+        group the boxes by row: a box starts a new row when it begins below
+        the bottom of all the boxes of the current row.
+
+        :param boxes: boxes as (left, top, right, bottom)
+        :type boxes: BoxSet
+
+        :return: the indexes of the boxes of each row, left to right
+        :rtype: list[list[int]]
+
+        """
+        order = sorted(range(len(boxes)), key=lambda i: (boxes[i][1], boxes[i][0]))
+        rows, bottom = [], None
+        for i in order:
+            if bottom is None or boxes[i][1] >= bottom:
+                rows.append([])
+                bottom = boxes[i][3]
+            rows[-1].append(i)
+            bottom = max(bottom, boxes[i][3])
+        return [sorted(row, key=lambda i: boxes[i][0]) for row in rows]
+
+    @staticmethod
+    def from_result(result, row: int = None, anchor: str = "bottom"):
+        """
+
+        construct an animation from a SplitResult, with all its sprites or only a row.
+
+        If the sprites are trimmed, they are placed at their offset in their
+        source box instead of at the anchor.
+
+        :param result: split result
+        :param row: index of the row of sprites, all the sprites if None
+        :param anchor: position of the sprites in the canvas
+
+        :type result: SplitResult
+        :type row: int | None
+        :type anchor: str
+
+        :rtype: ImageAnimation
+
+        """
+        indexes = list(range(len(result.boxes)))
+        if row is not None:
+            rows = ImageAnimation.rows(result.boxes)
+            if not 0 <= row < len(rows):
+                raise ValueError(f"row {row} out of range, the sheet has {len(rows)} rows")
+            indexes = rows[row]
+        sprites = [result.sprites[i] for i in indexes]
+        offsets = None
+        if result.sources is not None:
+            offsets = [
+                (result.boxes[i][0] - result.sources[i][0], result.boxes[i][1] - result.sources[i][1])
+                for i in indexes
+            ]
+            size = (
+                max(result.sources[i][2] - result.sources[i][0] for i in indexes),
+                max(result.sources[i][3] - result.sources[i][1] for i in indexes)
+            )
+            return ImageAnimation(sprites, anchor, offsets, size)
+        return ImageAnimation(sprites, anchor)
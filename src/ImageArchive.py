@@ -0,0 +1,275 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from abc import ABC, abstractmethod
+import io
+import struct
+import time
+import logging
+
+# PIL, tarfile and zipfile are imported at first use, the archive types are needed to build the CLI
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+logger = logging.getLogger('archive')
+logger.setLevel(logging.DEBUG)
+
+
+class ArchiveStrategy(ABC):
+    """
+
+    ArchiveStrategy class, writes all the sprites in one file.
+
+    The archive is written through only one buffered file handle, entries are
+    written one after another, so the filesystem only sees one file creation
+    instead of one per sprite. Subclasses choose the container format.
+
+    """
+
+    EXTENSION = None
+    BUFFER_SIZE = 1 << 20
+
+    def __init__(self, filename: str) -> None:
+        """
+
+        ArchiveStrategy's constructor, opens the archive file.
+
+        :param filename: archive filename
+        :type filename: str
+
+        :rtype: None
+
+        """
+        self.filename = filename
+        self.file = open(filename, 'wb', buffering=ArchiveStrategy.BUFFER_SIZE)
+
+    @abstractmethod
+    def add(self, name: str, data: bytes) -> None:
+        """
+
+        add an entry called name in the archive.
+
+        :rtype: None
+
+        """
+
+    def close(self) -> None:
+        """
+
+        close the archive file.
+
+        :rtype: None
+
+        """
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class TarArchiveStrategy(ArchiveStrategy):
+    """
+
+    TarArchiveStrategy class, subclass of ArchiveStrategy,
+    writes the sprites in an uncompressed tar archive.
+
+    """
+
+    EXTENSION = "tar"
+
+    def __init__(self, filename: str) -> None:
+        import tarfile
+
+        super().__init__(filename)
+        self.tar = tarfile.open(fileobj=self.file, mode='w')
+
+    def add(self, name: str, data: bytes) -> None:
+        import tarfile
+
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self.tar.addfile(info, io.BytesIO(data))
+
+    def close(self) -> None:
+        self.tar.close()
+        super().close()
+
+
+class ZipArchiveStrategy(ArchiveStrategy):
+    """
+
+    ZipArchiveStrategy class, subclass of ArchiveStrategy,
+    writes the sprites in a zip archive, stored without compression
+    because the sprites are already compressed by their encoder.
+
+    """
+
+    EXTENSION = "zip"
+
+    def __init__(self, filename: str) -> None:
+        import zipfile
+
+        super().__init__(filename)
+        self.zip = zipfile.ZipFile(self.file, mode='w', compression=zipfile.ZIP_STORED)
+
+    def add(self, name: str, data: bytes) -> None:
+        self.zip.writestr(name, data)
+
+    def close(self) -> None:
+        self.zip.close()
+        super().close()
+
+
+class PackArchiveStrategy(ArchiveStrategy):
+    """
+
+    PackArchiveStrategy class, subclass of ArchiveStrategy,
+    writes the sprites in a simple indexed binary pack.
+
+    layout: the entries data one after another, then the offset table
+    (entry count, and for each entry: name length, name, offset, size),
+    then a footer with the table offset and the magic. The footer is at
+    the end so the pack is written sequentially, without seeking back.
+
+    """
+
+    EXTENSION = "pack"
+    MAGIC = b"SSSP"
+    ENTRY = "<QQ"
+    FOOTER = "<Q4s"
+
+    def __init__(self, filename: str) -> None:
+        super().__init__(filename)
+        self.offset = 0
+        self.entries = []
+
+    def add(self, name: str, data: bytes) -> None:
+        self.file.write(data)
+        self.entries.append((name, self.offset, len(data)))
+        self.offset += len(data)
+
+    def close(self) -> None:
+        table = self.offset
+        self.file.write(struct.pack("<I", len(self.entries)))
+        for name, offset, size in self.entries:
+            encoded = name.encode()
+            self.file.write(struct.pack("<H", len(encoded)))
+            self.file.write(encoded)
+            self.file.write(struct.pack(PackArchiveStrategy.ENTRY, offset, size))
+        self.file.write(struct.pack(PackArchiveStrategy.FOOTER, table, PackArchiveStrategy.MAGIC))
+        super().close()
+
+
+class PackReader:
+    """
+
+    PackReader class, reads the entries of a pack with random access.
+
+    Only the offset table is read when the pack is opened, each entry is
+    read with one seek and one read when it is asked.
+
+    """
+
+    def __init__(self, filename: str) -> None:
+        """
+
+        PackReader's constructor, opens the pack and reads its offset table.
+
+        :param filename: pack filename
+        :type filename: str
+
+        :rtype: None
+
+        """
+        self.file = open(filename, 'rb')
+        footer = struct.calcsize(PackArchiveStrategy.FOOTER)
+        self.file.seek(-footer, io.SEEK_END)
+        table, magic = struct.unpack(PackArchiveStrategy.FOOTER, self.file.read(footer))
+        if magic != PackArchiveStrategy.MAGIC:
+            self.file.close()
+            raise ValueError(f"{filename} is not a sprite pack")
+        self.file.seek(table)
+        self.entries = {}
+        count, = struct.unpack("<I", self.file.read(4))
+        for _ in range(count):
+            length, = struct.unpack("<H", self.file.read(2))
+            name = self.file.read(length).decode()
+            self.entries[name] = struct.unpack(
+                PackArchiveStrategy.ENTRY,
+                self.file.read(struct.calcsize(PackArchiveStrategy.ENTRY))
+            )
+
+    def names(self):
+        """
+
+        get the entry names, in the order they were written.
+
+        :rtype: list[str]
+
+        """
+        return list(self.entries)
+
+    def read(self, name: str) -> bytes:
+        """
+
+        read the data of the entry called name.
+
+        :rtype: bytes
+
+        """
+        offset, size = self.entries[name]
+        self.file.seek(offset)
+        return self.file.read(size)
+
+    def open_image(self, name: str) -> Image:
+        """
+
+        read and decode the sprite called name.
+
+        :rtype: Image
+
+        """
+        from PIL import Image
+
+        return Image.open(io.BytesIO(self.read(name)))
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class ImageArchive:
+    """
+
+    ImageArchive class, gives the archive strategy from its name.
+
+    """
+
+    STRATEGIES = {
+        "tar": TarArchiveStrategy,
+        "zip": ZipArchiveStrategy,
+        "pack": PackArchiveStrategy,
+    }
+
+    @staticmethod
+    def open(filename: str, archive_type: str) -> ArchiveStrategy:
+        """
+
+        open an archive of archive_type (tar, zip, pack) to write in filename.
+
+        :rtype: ArchiveStrategy
+
+        """
+        if archive_type not in ImageArchive.STRATEGIES:
+            raise ValueError(f"unknown archive type {archive_type}")
+        logger.info("open archive " + filename)
+        return ImageArchive.STRATEGIES[archive_type](filename)
@@ -0,0 +1,302 @@
+import numpy as np
+import json
+import logging
+
+
+logger = logging.getLogger('boxes')
+logger.setLevel(logging.DEBUG)
+
+
+class BoxSet:
+    """
+
+    BoxSet class, a compact collection of sprite boxes.
+
+    The boxes are stored in one (N, 4) int32 array, each row is a box as
+    (left, top, right, bottom), right and bottom excluded like PIL crop boxes.
+    All operations are vectorized on the array, and iterating over a BoxSet
+    gives tuples, so the code written for a list of boxes keeps working.
+
+    """
+
+    LEFT, TOP, RIGHT, BOTTOM = range(4)
+
+    def __init__(self, boxes=None) -> None:
+        """
+
+        BoxSet's constructor, from an array or a list of boxes.
+
+        An int32 C contiguous (N, 4) array is used as is, without copy.
+
+        :param boxes: boxes as (left, top, right, bottom), empty by default
+        :type boxes: np.ndarray | list[tuple[int, int, int, int]]
+
+        :rtype: None
+
+        """
+        if boxes is None:
+            boxes = np.empty((0, 4), dtype=np.int32)
+        self.array = np.ascontiguousarray(boxes, dtype=np.int32).reshape(-1, 4)
+
+    @staticmethod
+    def from_contours(contours):
+        """
+
+        construct a BoxSet from Mask contours as (top, bottom, left, right), included.
+
+        :rtype: BoxSet
+
+        """
+        contours = np.asarray(contours, dtype=np.int32).reshape(-1, 4)
+        return BoxSet(np.stack([
+            contours[:, 2],
+            contours[:, 0],
+            contours[:, 3] + 1,
+            contours[:, 1] + 1
+        ], axis=1))
+
+    @staticmethod
+    def from_json(document):
+        """
+
+        construct a BoxSet from the list written by to_json.
+
+        :rtype: BoxSet
+
+        """
+        if isinstance(document, str):
+            document = json.loads(document)
+        return BoxSet([
+            (box["x"], box["y"], box["x"] + box["w"], box["y"] + box["h"])
+            for box in document
+        ])
+
+    @staticmethod
+    def concatenate(sets):
+        """
+
+        construct a BoxSet of the boxes of all the sets, one set after another.
+
+        :rtype: BoxSet
+
+        """
+        arrays = [np.asarray(boxes, dtype=np.int32).reshape(-1, 4) for boxes in sets]
+        return BoxSet(np.concatenate(arrays) if arrays else None)
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __iter__(self):
+        return iter(map(tuple, self.array.tolist()))
+
+    def __getitem__(self, index):
+        """
+
+        get a box as a tuple with an int index, else a BoxSet
+        with a slice, a boolean mask or an array of indexes.
+
+        """
+        if isinstance(index, (int, np.integer)):
+            return tuple(self.array[index].tolist())
+        return BoxSet(self.array[index])
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is not None and np.dtype(dtype) != self.array.dtype:
+            return self.array.astype(dtype)
+        return self.array.copy() if copy else self.array
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BoxSet):
+            return NotImplemented
+        return np.array_equal(self.array, other.array)
+
+    def __repr__(self) -> str:
+        return f"BoxSet({self.array.tolist()})"
+
+    def to_numpy(self) -> np.ndarray:
+        """
+
+        get the boxes as a (N, 4) int32 array, without copy.
+
+        :rtype: np.ndarray
+
+        """
+        return self.array
+
+    def to_list(self):
+        """
+
+        get the boxes as a list of tuples.
+
+        :rtype: list[tuple[int, int, int, int]]
+
+        """
+        return list(self)
+
+    def to_json(self):
+        """
+
+        get the boxes as a list of rectangles x, y, w, h, serializable in JSON.
+
+        :rtype: list[dict]
+
+        """
+        left, top, width, height = self.left, self.top, self.widths, self.heights
+        return [
+            {"x": x, "y": y, "w": w, "h": h}
+            for x, y, w, h in zip(left.tolist(), top.tolist(), width.tolist(), height.tolist())
+        ]
+
+    @property
+    def left(self) -> np.ndarray:
+        return self.array[:, BoxSet.LEFT]
+
+    @property
+    def top(self) -> np.ndarray:
+        return self.array[:, BoxSet.TOP]
+
+    @property
+    def right(self) -> np.ndarray:
+        return self.array[:, BoxSet.RIGHT]
+
+    @property
+    def bottom(self) -> np.ndarray:
+        return self.array[:, BoxSet.BOTTOM]
+
+    @property
+    def widths(self) -> np.ndarray:
+        return self.right - self.left
+
+    @property
+    def heights(self) -> np.ndarray:
+        return self.bottom - self.top
+
+    @property
+    def areas(self) -> np.ndarray:
+        """
+
+        get the area of each box, as int64 to avoid overflows.
+
+        :rtype: np.ndarray
+
+        """
+        return self.widths.astype(np.int64) * self.heights
+
+    def filter(self, keep):
+        """
+
+        keep the boxes where keep is True.
+
+        :param keep: boolean array of N values
+        :type keep: np.ndarray
+
+        :rtype: BoxSet
+
+        """
+        return BoxSet(self.array[np.asarray(keep, dtype=bool)])
+
+    def filter_area(self, minimum: int = 0, maximum: int = None):
+        """
+
+        keep the boxes with an area between minimum and maximum, included.
+
+        :rtype: BoxSet
+
+        """
+        areas = self.areas
+        keep = areas >= minimum
+        if maximum is not None:
+            keep &= areas <= maximum
+        return self.filter(keep)
+
+    def sort(self, key: str = "raster", reverse: bool = False):
+        """
+
+        sort the boxes by key: raster (top then left), column (left then top) or area.
+
+        :rtype: BoxSet
+
+        """
+        if key == "raster":
+            order = np.lexsort((self.left, self.top))
+        elif key == "column":
+            order = np.lexsort((self.top, self.left))
+        elif key == "area":
+            order = np.argsort(self.areas, kind="stable")
+        else:
+            raise ValueError(f"unknown sort key {key}")
+        if reverse:
+            order = order[::-1]
+        return BoxSet(self.array[order])
+
+    def union(self, other):
+        """
+
+        get the boxes of self and other, without duplicates, in order of appearance.
+
+        :rtype: BoxSet
+
+        """
+        boxes = np.concatenate([self.array, np.asarray(other, dtype=np.int32).reshape(-1, 4)])
+        _, first = np.unique(boxes, axis=0, return_index=True)
+        return BoxSet(boxes[np.sort(first)])
+
+    def bounds(self):
+        """
+
+        get the smallest box containing all the boxes, None if empty.
+
+        :rtype: tuple[int, int, int, int] | None
+
+        """
+        if not len(self):
+            return None
+        return (
+            int(self.left.min()),
+            int(self.top.min()),
+            int(self.right.max()),
+            int(self.bottom.max())
+        )
+
+    def translate(self, x: int, y: int):
+        """
+
+        move all boxes by x and y.
+
+        :rtype: BoxSet
+
+        """
+        return BoxSet(self.array + np.array([x, y, x, y], dtype=np.int32))
+
+    def scale(self, factor: float):
+        """
+
+        scale all boxes by factor, rounded to the nearest pixel.
+
+        :rtype: BoxSet
+
+        """
+        return BoxSet(np.rint(self.array * factor))
+
+    def iou(self, other) -> np.ndarray:
+        """
+
+        get the intersection over union of each box of self with each box of other.
+
+        :return: (N, M) float array
+        :rtype: np.ndarray
+
+        """
+        other = other if isinstance(other, BoxSet) else BoxSet(other)
+        a = self.array[:, None, :].astype(np.int64)
+        b = other.array[None, :, :].astype(np.int64)
+        width = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+        height = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+        intersection = width * height
+        union = self.areas[:, None] + other.areas[None, :] - intersection
+        return np.divide(
+            intersection,
+            union,
+            out=np.zeros(intersection.shape, dtype=np.float64),
+            where=union > 0
+        )
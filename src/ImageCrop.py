@@ -0,0 +1,76 @@
+from PIL import Image
+import logging
+
+
+logger = logging.getLogger('crop')
+logger.setLevel(logging.DEBUG)
+
+
+class SpriteCropper:
+    """
+
+    SpriteCropper class, crops all sprites from one decoded sheet.
+
+    The sheet is decoded once, when the cropper is created, then each sprite
+    is cropped directly from the decoded pixels with PIL, without converting
+    the sheet to an array. The crops keep the mode, the palette and the info
+    (transparency...) of the sheet, so indexed sprites stay indexed.
+
+    """
+
+    def __init__(self, image: Image) -> None:
+        """
+
+        SpriteCropper's constructor, decodes the sheet once.
+
+        :param image: sprite sheet
+        :type image: Image
+
+        :rtype: None
+
+        """
+        self.image = image
+        self.image.load()
+
+    def crop(self, box) -> Image:
+        """
+
+        crop one sprite.
+
+        :param box: box as (left, top, right, bottom)
+        :type box: tuple[int, int, int, int]
+
+        :return: the sprite
+        :rtype: Image
+
+        """
+        return self.image.crop(tuple(box))
+
+    def iter_crops(self, boxes):
+        """
+
+        crop the sprites one by one, only when they are asked.
+
+        :param boxes: boxes as (left, top, right, bottom)
+        :type boxes: BoxSet
+
+        :rtype: Iterator[Image]
+
+        """
+        for box in boxes:
+            yield self.crop(box)
+
+    def crop_all(self, boxes):
+        """
+
+        crop all the sprites.
+
+        :param boxes: boxes as (left, top, right, bottom)
+        :type boxes: BoxSet
+
+        :return: the sprites, in the order of the boxes
+        :rtype: list[Image]
+
+        """
+        logger.info(f"crop {len(boxes)} sprites from a {self.image.mode} sheet")
+        return list(self.iter_crops(boxes))
@@ -0,0 +1,219 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import hashlib
+import logging
+
+# PIL is imported at first use, the strategy names are needed to build the CLI
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+logger = logging.getLogger('deduplicate')
+logger.setLevel(logging.DEBUG)
+
+
+class DeduplicateStrategy:
+    """
+
+    DeduplicateStrategy class, hashes the exact pixels of a sprite.
+
+    Two sprites share the same key only if they have the same mode, the
+    same size, the same palette and the same pixels. Subclasses extend the
+    key to be invariant to some transformations (flip, rotation).
+
+    """
+
+    TRANSFORMS = {
+        "identity": None,
+    }
+
+    @staticmethod
+    def exact_key(image: Image) -> str:
+        """
+
+        hash the mode, the size, the palette and the pixels of the image.
+
+        :param image: sprite to hash
+        :type image: Image
+
+        :return: hexadecimal digest of the sprite
+        :rtype: str
+
+        """
+        digest = hashlib.sha1()
+        digest.update(image.mode.encode())
+        digest.update(str(image.size).encode())
+        if image.mode == 'P' and image.palette is not None:
+            digest.update(bytes(image.getpalette() or []))
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    @classmethod
+    def transform(cls, image: Image, name: str) -> Image:
+        """
+
+        apply the transformation called name on the image.
+
+        :param image: image to transform
+        :param name: transformation name, key of TRANSFORMS
+        :type image: Image
+        :type name: str
+
+        :return: the image transformed
+        :rtype: Image
+
+        """
+        from PIL import Image
+
+        operations = cls.TRANSFORMS[name]
+        if operations is None:
+            return image
+        for operation in operations:
+            image = image.transpose(Image.Transpose[operation])
+        return image
+
+    def key(self, image: Image) -> str:
+        """
+
+        get the key of the image, the smallest hash of all its variants.
+
+        :param image: sprite to hash
+        :type image: Image
+
+        :return: key shared by all the variants of the sprite
+        :rtype: str
+
+        """
+        return min(
+            self.exact_key(self.transform(image, name))
+            for name in self.TRANSFORMS
+        )
+
+    def find_transform(self, unique: Image, image: Image) -> str:
+        """
+
+        find the transformation to apply on unique to get image.
+
+        :param unique: sprite kept after deduplication
+        :param image: duplicate sprite
+        :type unique: Image
+        :type image: Image
+
+        :return: the transformation name
+        :rtype: str
+
+        """
+        expected = self.exact_key(image)
+        for name in self.TRANSFORMS:
+            if self.exact_key(self.transform(unique, name)) == expected:
+                return name
+        raise ValueError("image is not a variant of the unique sprite")
+
+
+class DeduplicateFlipStrategy(DeduplicateStrategy):
+    """
+
+    DeduplicateFlipStrategy class, subclass of DeduplicateStrategy,
+    considers a mirrored sprite as a duplicate of the original one.
+
+    """
+
+    TRANSFORMS = {
+        "identity": None,
+        "flip_horizontal": ("FLIP_LEFT_RIGHT",),
+        "flip_vertical": ("FLIP_TOP_BOTTOM",),
+        "rotate_180": ("ROTATE_180",),
+    }
+
+
+class DeduplicateRotateStrategy(DeduplicateStrategy):
+    """
+
+    DeduplicateRotateStrategy class, subclass of DeduplicateStrategy,
+    considers a rotated or mirrored sprite as a duplicate of the original one.
+
+    """
+
+    TRANSFORMS = {
+        **DeduplicateFlipStrategy.TRANSFORMS,
+        "rotate_90": ("ROTATE_90",),
+        "rotate_270": ("ROTATE_270",),
+        "transpose": ("TRANSPOSE",),
+        "transverse": ("TRANSVERSE",),
+    }
+
+
+class ImageDeduplicator:
+    """
+
+    ImageDeduplicator class, keeps only one copy of each sprite.
+
+    The deduplicator hashes each sprite with its strategy, the first sprite
+    found for a key is kept, and the others are mapped on it with the
+    transformation to apply on the kept sprite to get them back.
+
+    """
+
+    STRATEGIES = {
+        "exact": DeduplicateStrategy,
+        "flip": DeduplicateFlipStrategy,
+        "rotate": DeduplicateRotateStrategy,
+    }
+
+    def __init__(self, strategy: DeduplicateStrategy = None) -> None:
+        """
+
+        ImageDeduplicator's constructor, exact deduplication by default.
+
+        :param strategy: strategy used to hash the sprites
+        :type strategy: DeduplicateStrategy
+
+        :rtype: None
+
+        """
+        self.strategy = strategy if strategy is not None else DeduplicateStrategy()
+
+    @staticmethod
+    def from_name(name: str):
+        """
+
+        construct a deduplicator from a strategy name (exact, flip, rotate).
+
+        :return: the deduplicator, None if name is None or "none"
+        :rtype: ImageDeduplicator | None
+
+        """
+        if name is None or name == "none":
+            return None
+        if name not in ImageDeduplicator.STRATEGIES:
+            raise ValueError(f"unknown deduplication strategy {name}")
+        return ImageDeduplicator(ImageDeduplicator.STRATEGIES[name]())
+
+    def deduplicate(self, images):
+        """
+
+        keep only the unique sprites and map each frame on them.
+
+        :param images: all sprites split
+        :type images: list[Image]
+
+        :return: the unique sprites, and for each frame, the index of
+                 its unique sprite and the transformation to apply on it.
+        :rtype: tuple[list[Image], list[tuple[int, str]]]
+
+        """
+        logger.info("start deduplicate sprites")
+        uniques = []
+        indexes = {}
+        frames = []
+        for image in images:
+            key = self.strategy.key(image)
+            if key not in indexes:
+                indexes[key] = len(uniques)
+                uniques.append(image)
+                frames.append((indexes[key], "identity"))
+                continue
+            unique = indexes[key]
+            frames.append((unique, self.strategy.find_transform(uniques[unique], image)))
+        logger.info(f"end deduplicate sprites, {len(uniques)} unique on {len(images)}")
+        return uniques, frames
@@ -0,0 +1,297 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import io
+import struct
+import threading
+import time
+import logging
+
+# PIL is imported at first use, the presets are needed to start the window
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+logger = logging.getLogger('encoder')
+logger.setLevel(logging.DEBUG)
+
+
+class EncoderStrategy:
+    """
+
+    EncoderStrategy class, encodes sprites with the PIL defaults of a format.
+
+    Subclasses give their own options to PIL to trade compression for speed,
+    every strategy writes in a stream so the sprites can be encoded in memory.
+
+    """
+
+    FORMAT = "PNG"
+    EXTENSION = "png"
+    MODES = None
+
+    def options(self) -> dict:
+        """
+
+        get the options given to PIL Image.save.
+
+        :rtype: dict
+
+        """
+        return {}
+
+    def prepare(self, image: Image) -> Image:
+        """
+
+        convert the image in a mode supported by the format, if needed.
+
+        :rtype: Image
+
+        """
+        if self.MODES is None or image.mode in self.MODES:
+            return image
+        return image.convert("RGBA" if "RGBA" in self.MODES else self.MODES[0])
+
+    def encode(self, image: Image, stream) -> None:
+        """
+
+        encode the image in the stream.
+
+        :param image: sprite to encode
+        :param stream: binary file object
+        :type image: Image
+
+        :rtype: None
+
+        """
+        self.prepare(image).save(stream, format=self.FORMAT, **self.options())
+
+
+class PngEncoderStrategy(EncoderStrategy):
+    """
+
+    PngEncoderStrategy class, subclass of EncoderStrategy,
+    encodes sprites as PNG with a compress level, from 0 to 9.
+
+    """
+
+    def __init__(self, compress_level: int = 6, optimize: bool = False) -> None:
+        self.compress_level = compress_level
+        self.optimize = optimize
+
+    def options(self) -> dict:
+        return {"compress_level": self.compress_level, "optimize": self.optimize}
+
+
+class WebpEncoderStrategy(EncoderStrategy):
+    """
+
+    WebpEncoderStrategy class, subclass of EncoderStrategy,
+    encodes sprites as lossless or lossy WebP.
+
+    """
+
+    FORMAT = "WEBP"
+    EXTENSION = "webp"
+    MODES = ("RGB", "RGBA")
+
+    def __init__(self, lossless: bool = True, quality: int = 80, method: int = 4) -> None:
+        self.lossless = lossless
+        self.quality = quality
+        self.method = method
+
+    def options(self) -> dict:
+        return {"lossless": self.lossless, "quality": self.quality, "method": self.method}
+
+
+class QoiEncoderStrategy(EncoderStrategy):
+    """
+
+    QoiEncoderStrategy class, subclass of EncoderStrategy,
+    encodes sprites as QOI, a fast lossless format.
+
+    """
+
+    FORMAT = "QOI"
+    EXTENSION = "qoi"
+    MODES = ("RGB", "RGBA")
+
+    def encode(self, image: Image, stream) -> None:
+        from PIL import Image
+
+        Image.init()
+        if self.FORMAT not in Image.SAVE:
+            raise ValueError("this PIL version cannot write QOI images")
+        super().encode(image, stream)
+
+
+class RawEncoderStrategy(EncoderStrategy):
+    """
+
+    RawEncoderStrategy class, subclass of EncoderStrategy,
+    writes the raw pixels after a small header, without any compression.
+
+    header: magic (4 bytes), width and height (2 unsigned int, little endian)
+    the length of the mode name (1 unsigned byte) and the mode name.
+
+    The raw pixels have no palette, so indexed sprites (P, PA) are written
+    as RGBA, with their transparency, and decoded as RGBA.
+
+    """
+
+    FORMAT = None
+    EXTENSION = "raw"
+    MAGIC = b"SSSR"
+    INDEXED = ("P", "PA")
+
+    def prepare(self, image: Image) -> Image:
+        if image.mode in self.INDEXED:
+            return image.convert("RGBA")
+        return image
+
+    def encode(self, image: Image, stream) -> None:
+        image = self.prepare(image)
+        stream.write(self.MAGIC)
+        stream.write(struct.pack("<II", *image.size))
+        mode = image.mode.encode()
+        stream.write(struct.pack("<B", len(mode)))
+        stream.write(mode)
+        stream.write(image.tobytes())
+
+    @staticmethod
+    def decode(stream) -> Image:
+        """
+
+        read an image written by RawEncoderStrategy.encode.
+
+        :rtype: Image
+
+        """
+        from PIL import Image
+
+        if stream.read(4) != RawEncoderStrategy.MAGIC:
+            raise ValueError("stream is not a raw sprite")
+        size = struct.unpack("<II", stream.read(8))
+        length, = struct.unpack("<B", stream.read(1))
+        mode = stream.read(length).decode()
+        return Image.frombytes(mode, size, stream.read())
+
+
+class ImageEncoder:
+    """
+
+    ImageEncoder class, encodes the sprites with a named preset.
+
+    The encoder keeps statistics for each call (count, encoding time and
+    bytes written), so the presets can be compared on the same sprites.
+
+    """
+
+    PRESETS = {
+        "png-fast": lambda: PngEncoderStrategy(compress_level=1),
+        "png": lambda: PngEncoderStrategy(compress_level=6),
+        "png-release": lambda: PngEncoderStrategy(compress_level=9, optimize=True),
+        "webp-lossless": lambda: WebpEncoderStrategy(lossless=True, quality=100, method=6),
+        "webp-fast-lossless": lambda: WebpEncoderStrategy(lossless=True, quality=0, method=0),
+        "webp-lossy": lambda: WebpEncoderStrategy(lossless=False, quality=80),
+        "qoi": QoiEncoderStrategy,
+        "raw": RawEncoderStrategy,
+    }
+
+    def __init__(self, preset: str = "png") -> None:
+        """
+
+        ImageEncoder's constructor, chooses the strategy from the preset name.
+
+        :param preset: preset name, key of PRESETS
+        :type preset: str
+
+        :rtype: None
+
+        """
+        if preset not in ImageEncoder.PRESETS:
+            raise ValueError(f"unknown encoder preset {preset}")
+        self.preset = preset
+        self.strategy = ImageEncoder.PRESETS[preset]()
+        self.count = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    @property
+    def extension(self) -> str:
+        return self.strategy.EXTENSION
+
+    def encode(self, image: Image) -> bytes:
+        """
+
+        encode the image in memory and update the statistics.
+
+        :return: the encoded image
+        :rtype: bytes
+
+        """
+        stream = io.BytesIO()
+        start = time.perf_counter()
+        self.strategy.encode(image, stream)
+        seconds = time.perf_counter() - start
+        data = stream.getvalue()
+        with self.lock:
+            self.seconds += seconds
+            self.count += 1
+            self.bytes += len(data)
+        return data
+
+    def save(self, image: Image, filename: str) -> None:
+        """
+
+        encode the image and write it in filename.
+
+        :rtype: None
+
+        """
+        data = self.encode(image)
+        with open(filename, 'wb') as file:
+            file.write(data)
+
+    def report(self) -> dict:
+        """
+
+        get the statistics of the encoder.
+
+        :return: preset, count, seconds and bytes
+        :rtype: dict
+
+        """
+        return {
+            "preset": self.preset,
+            "count": self.count,
+            "seconds": self.seconds,
+            "bytes": self.bytes,
+        }
+
+    @staticmethod
+    def benchmark(images, presets=None):
+        """
+
+        encode all images in memory with each preset and report the statistics.
+
+        :param images: sprites to encode
+        :param presets: preset names, all presets by default
+        :type images: list[Image]
+        :type presets: list[str]
+
+        :return: the report of each preset
+        :rtype: list[dict]
+
+        """
+        reports = []
+        for preset in presets if presets is not None else ImageEncoder.PRESETS:
+            encoder = ImageEncoder(preset)
+            for image in images:
+                encoder.encode(image)
+            reports.append(encoder.report())
+            logger.info(
+                f"preset {preset}: {encoder.count} images, "
+                f"{encoder.seconds:.4f}s, {encoder.bytes} bytes"
+            )
+        return reports
@@ -0,0 +1,111 @@
+import numpy as np
+import logging
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+logger = logging.getLogger('jit')
+logger.setLevel(logging.DEBUG)
+
+AVAILABLE = numba is not None
+
+
+def jit(function):
+    """
+
+    compile function with numba in nopython mode if numba is installed,
+    else keep the Python function.
+
+    """
+    if numba is None:
+        return function
+    return numba.njit(cache=True, nogil=True)(function)
+
+
+@jit
+def flood_fill_contours(mask):
+    """
+    Finds the contours of the 4-connected sprites of the mask.
+
+    The same flood fill as Mask.find_contour, 4-connected and blind to
+    the colors like every backend, written with arrays only so numba
+    compiles it: the stack is a preallocated array of flat indexes,
+    each pixel is marked visited when it is pushed, so it holds each pixel
+    once at most, and the contours array doubles when it is full.
+
+    Parameters:
+        mask (np.ndarray): The mask as a 2D uint8 array, 1 for sprite pixels.
+
+    Returns:
+        np.ndarray: the top, bottom, left and right coordinates
+        of each sprite, in raster order, as a (N, 4) int64 array.
+
+    """
+    height, width = mask.shape
+    visited = np.zeros((height, width), dtype=np.bool_)
+    stack = np.empty(height * width, dtype=np.int64)
+    contours = np.empty((64, 4), dtype=np.int64)
+    count = 0
+    for row in range(height):
+        for col in range(width):
+            if mask[row, col] == 0 or visited[row, col]:
+                continue
+            top, bottom, left, right = row, row, col, col
+            visited[row, col] = True
+            stack[0] = row * width + col
+            size = 1
+            while size > 0:
+                size -= 1
+                r = stack[size] // width
+                c = stack[size] % width
+                top = min(top, r)
+                bottom = max(bottom, r)
+                left = min(left, c)
+                right = max(right, c)
+                if r > 0 and mask[r - 1, c] != 0 and not visited[r - 1, c]:
+                    visited[r - 1, c] = True
+                    stack[size] = (r - 1) * width + c
+                    size += 1
+                if r < height - 1 and mask[r + 1, c] != 0 and not visited[r + 1, c]:
+                    visited[r + 1, c] = True
+                    stack[size] = (r + 1) * width + c
+                    size += 1
+                if c > 0 and mask[r, c - 1] != 0 and not visited[r, c - 1]:
+                    visited[r, c - 1] = True
+                    stack[size] = r * width + c - 1
+                    size += 1
+                if c < width - 1 and mask[r, c + 1] != 0 and not visited[r, c + 1]:
+                    visited[r, c + 1] = True
+                    stack[size] = r * width + c + 1
+                    size += 1
+            if count == contours.shape[0]:
+                grown = np.empty((2 * count, 4), dtype=np.int64)
+                grown[:count] = contours
+                contours = grown
+            contours[count, 0] = top
+            contours[count, 1] = bottom
+            contours[count, 2] = left
+            contours[count, 3] = right
+            count += 1
+    return contours[:count]
+
+
+def label(mask):
+    """
+    Finds the contours of the sprites of the mask with the compiled flood fill.
+
+    Parameters:
+        mask (np.ndarray): The mask, 1 or True for sprite pixels.
+
+    Returns:
+        list[tuple[int, int, int, int]]: the top, bottom, left
+        and right coordinates of each sprite, in raster order.
+
+    """
+    if not AVAILABLE:
+        logger.warning("numba is not installed, the flood fill runs in Python")
+    mask = np.ascontiguousarray(np.asarray(mask) != 0, dtype=np.uint8)
+    return [tuple(contour) for contour in flood_fill_contours(mask).tolist()]
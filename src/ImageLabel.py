@@ -0,0 +1,233 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import os
+import logging
+
+
+logger = logging.getLogger('label')
+logger.setLevel(logging.DEBUG)
+
+
+def label_tile(mask):
+    """
+    Labels the 4-connected components of a tile of the mask.
+
+    Each sprite pixel starts with its own 1-based raster index as label,
+    then takes the smallest label of its sprite neighbours, and jumps to
+    the label of the pixel its label points to, until nothing changes.
+    All the work is done by NumPy array operations, which release the GIL.
+    At the end, each component is labelled with the index of its first
+    pixel in raster order.
+
+    Parameters:
+        mask (np.ndarray): The tile as a 2D boolean array.
+
+    Returns:
+        dict: the local labels of the tile borders (top, bottom, left,
+        right, 0 for background, else 1 to N), and for each component:
+        its first pixel raster index in the tile (first) and its contour
+        as top, bottom, left, right coordinates in the tile (contours).
+
+    """
+    height, width = mask.shape
+    background = height * width + 1
+    labels = np.where(mask, np.arange(1, height * width + 1).reshape(height, width), background)
+    flat_mask = mask.ravel()
+    while True:
+        update = labels.copy()
+        np.minimum(update[1:], labels[:-1], out=update[1:])
+        np.minimum(update[:-1], labels[1:], out=update[:-1])
+        np.minimum(update[:, 1:], labels[:, :-1], out=update[:, 1:])
+        np.minimum(update[:, :-1], labels[:, 1:], out=update[:, :-1])
+        update[~mask] = background
+        flat = update.ravel()
+        flat[flat_mask] = flat[flat[flat_mask] - 1]
+        if np.array_equal(update, labels):
+            break
+        labels = update
+
+    roots, inverse = np.unique(labels[mask], return_inverse=True)
+    local = np.zeros((height, width), dtype=np.int32)
+    local[mask] = inverse + 1
+    contours = np.empty((len(roots), 4), dtype=np.int64)
+    if len(roots):
+        rows, cols = np.nonzero(mask)
+        order = np.argsort(inverse, kind="stable")
+        starts = np.flatnonzero(np.r_[True, np.diff(inverse[order]) != 0])
+        rows, cols = rows[order], cols[order]
+        contours[:, 0] = np.minimum.reduceat(rows, starts)
+        contours[:, 1] = np.maximum.reduceat(rows, starts)
+        contours[:, 2] = np.minimum.reduceat(cols, starts)
+        contours[:, 3] = np.maximum.reduceat(cols, starts)
+    return {
+        "top": local[0].copy(),
+        "bottom": local[-1].copy(),
+        "left": local[:, 0].copy(),
+        "right": local[:, -1].copy(),
+        "first": roots - 1,
+        "contours": contours,
+    }
+
+
+class UnionFind:
+    """
+
+    UnionFind class, merges the components split by the tile seams.
+
+    """
+
+    def __init__(self, size: int) -> None:
+        self.parent = np.arange(size)
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, first: int, second: int) -> None:
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+    def roots(self) -> np.ndarray:
+        """
+
+        get the root of each item, with a vectorized path compression.
+
+        :rtype: np.ndarray
+
+        """
+        parent = self.parent
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                return parent
+            parent = grand
+
+
+class TileLabeller:
+    """
+
+    TileLabeller class, labels the components of a mask tile by tile, in parallel.
+
+    The mask is partitioned in tiles, each tile is labelled by label_tile in
+    a thread or a process pool, then the labels on both sides of each seam
+    are merged with a union-find. The contours are the same as the serial
+    Mask.find_sprite_contours ones, in the same order.
+
+    """
+
+    def __init__(self, tile_size: int = 512, workers: int = None, pool: str = "thread") -> None:
+        """
+
+        TileLabeller's constructor.
+
+        :param tile_size: tile width and height
+        :param workers: worker count, CPU count by default
+        :param pool: thread or process
+
+        :type tile_size: int
+        :type workers: int
+        :type pool: str
+
+        :rtype: None
+
+        """
+        if tile_size < 1:
+            raise ValueError(f"tile size must be at least 1, tile_size={tile_size}")
+        if pool not in ("thread", "process"):
+            raise ValueError(f"unknown pool {pool}")
+        self.tile_size = tile_size
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.pool = pool
+
+    def tiles(self, height: int, width: int):
+        """
+
+        get the tiles covering the mask as (top, left, bottom, right).
+
+        :rtype: list[tuple[int, int, int, int]]
+
+        """
+        return [
+            (top, left, min(top + self.tile_size, height), min(left + self.tile_size, width))
+            for top in range(0, height, self.tile_size)
+            for left in range(0, width, self.tile_size)
+        ]
+
+    def label(self, mask):
+        """
+        Finds the contours of the sprites in the mask.
+
+        Parameters:
+            mask (np.ndarray): The mask, 1 or True for sprite pixels.
+
+        Returns:
+            list[tuple[int, int, int, int]]: the top, bottom, left
+            and right coordinates of each sprite, in raster order.
+
+        """
+        mask = np.asarray(mask) != 0
+        height, width = mask.shape
+        tiles = self.tiles(height, width)
+        executor = ProcessPoolExecutor if self.pool == "process" else ThreadPoolExecutor
+        logger.info(f"label {len(tiles)} tiles with {self.workers} {self.pool} workers")
+        with executor(max_workers=self.workers) as pool:
+            results = list(pool.map(
+                label_tile,
+                (mask[top:bottom, left:right] for top, left, bottom, right in tiles)
+            ))
+
+        offsets = np.cumsum([0] + [len(result["first"]) for result in results])
+        union = UnionFind(int(offsets[-1]) + 1)
+        index = {(top, left): i for i, (top, left, _, _) in enumerate(tiles)}
+        for i, (top, left, bottom, right) in enumerate(tiles):
+            below = index.get((bottom, left))
+            if below is not None:
+                self.merge(union, results[i]["bottom"], offsets[i], results[below]["top"], offsets[below])
+            beside = index.get((top, right))
+            if beside is not None:
+                self.merge(union, results[i]["right"], offsets[i], results[beside]["left"], offsets[beside])
+
+        contours = [np.empty((0, 4), dtype=np.int64)]
+        firsts = [np.empty(0, dtype=np.int64)]
+        for result, (top, left, _, right) in zip(results, tiles):
+            rows, cols = np.divmod(result["first"], right - left)
+            contours.append(result["contours"] + (top, top, left, left))
+            firsts.append((top + rows) * width + left + cols)
+        contours = np.concatenate(contours)
+        firsts = np.concatenate(firsts)
+        roots = union.roots()[1:] - 1
+        groups, inverse = np.unique(roots, return_inverse=True)
+        merged = np.empty((len(groups), 4), dtype=np.int64)
+        merged[:, [0, 2]] = np.iinfo(np.int64).max
+        merged[:, [1, 3]] = -1
+        np.minimum.at(merged[:, 0], inverse, contours[:, 0])
+        np.maximum.at(merged[:, 1], inverse, contours[:, 1])
+        np.minimum.at(merged[:, 2], inverse, contours[:, 2])
+        np.maximum.at(merged[:, 3], inverse, contours[:, 3])
+        first = np.full(len(groups), np.iinfo(np.int64).max)
+        np.minimum.at(first, inverse, firsts)
+        return [tuple(contour) for contour in merged[np.argsort(first)].tolist()]
+
+    @staticmethod
+    def merge(union: UnionFind, side, side_offset: int, other, other_offset: int) -> None:
+        """
+
+        merge the components touching each other across a seam.
+
+        :param union: union-find of all the components
+        :param side: local labels along the seam in the first tile
+        :param side_offset: global id offset of the first tile
+        :param other: local labels along the seam in the second tile
+        :param other_offset: global id offset of the second tile
+
+        :rtype: None
+
+        """
+        touching = (side != 0) & (other != 0)
+        pairs = np.unique(np.stack([side[touching] + side_offset, other[touching] + other_offset], axis=1), axis=0)
+        for first, second in pairs.tolist():
+            union.union(first, second)
@@ -0,0 +1,263 @@
+import os
+import json
+import logging
+
+
+logger = logging.getLogger('manifest')
+logger.setLevel(logging.DEBUG)
+
+
+class ManifestStrategy:
+    """
+
+    ManifestStrategy class, describes the sprites of a sheet as plain JSON.
+
+    A manifest strategy only needs the boxes of the sprites and the sheet
+    size, the sprites are never cropped nor encoded, the engine is supposed
+    to slice the original sheet at runtime thanks to these boxes.
+
+    """
+
+    EXTENSION = "json"
+
+    @staticmethod
+    def frame(box) -> dict:
+        """
+
+        convert a box (left, top, right, bottom) into a frame rectangle.
+
+        :return: the frame as x, y, w, h
+        :rtype: dict
+
+        """
+        left, top, right, bottom = box
+        return {"x": left, "y": top, "w": right - left, "h": bottom - top}
+
+    @staticmethod
+    def source(manifest, index: int, frame: dict):
+        """
+
+        get the position of the frame in its source box and the source size.
+
+        Without source boxes the sprite isn't trimmed, so the frame is its
+        own source.
+
+        :return: the sprite source rectangle and the source size
+        :rtype: tuple[dict, dict]
+
+        """
+        if manifest.sources is None:
+            return (
+                {"x": 0, "y": 0, "w": frame["w"], "h": frame["h"]},
+                {"w": frame["w"], "h": frame["h"]}
+            )
+        left, top, right, bottom = manifest.sources[index]
+        return (
+            {"x": frame["x"] - left, "y": frame["y"] - top, "w": frame["w"], "h": frame["h"]},
+            {"w": right - left, "h": bottom - top}
+        )
+
+    def build(self, manifest) -> dict:
+        """
+
+        build the JSON document of the manifest.
+
+        :param manifest: manifest to describe
+        :type manifest: ImageManifest
+
+        :return: the JSON document
+        :rtype: dict
+
+        """
+        width, height = manifest.size
+        frames = []
+        for i, box in enumerate(manifest.boxes):
+            frame = {"name": manifest.frame_name(i), **self.frame(box)}
+            if manifest.sources is not None:
+                sprite_source, source_size = self.source(manifest, i, frame)
+                frame["offset"] = {"x": sprite_source["x"], "y": sprite_source["y"]}
+                frame["sourceSize"] = source_size
+            frames.append(frame)
+        return {
+            "image": manifest.image,
+            "size": {"w": width, "h": height},
+            "frames": frames
+        }
+
+
+class ManifestTexturePackerStrategy(ManifestStrategy):
+    """
+
+    ManifestTexturePackerStrategy class, subclass of ManifestStrategy,
+    describes the sprites as a TexturePacker JSON (hash) data file.
+
+    """
+
+    def build(self, manifest) -> dict:
+        width, height = manifest.size
+        frames = {}
+        for i, box in enumerate(manifest.boxes):
+            frame = self.frame(box)
+            sprite_source, source_size = self.source(manifest, i, frame)
+            frames[manifest.frame_name(i)] = {
+                "frame": frame,
+                "rotated": False,
+                "trimmed": manifest.sources is not None,
+                "spriteSourceSize": sprite_source,
+                "sourceSize": source_size
+            }
+        return {
+            "frames": frames,
+            "meta": {
+                "app": "Sprite Sheet Splitter",
+                "version": "2.0.0",
+                "image": manifest.image,
+                "format": "RGBA8888",
+                "size": {"w": width, "h": height},
+                "scale": "1"
+            }
+        }
+
+
+class ManifestAsepriteStrategy(ManifestStrategy):
+    """
+
+    ManifestAsepriteStrategy class, subclass of ManifestStrategy,
+    describes the sprites as an Aseprite JSON (array) data file.
+
+    """
+
+    DURATION = 100
+
+    def build(self, manifest) -> dict:
+        width, height = manifest.size
+        frames = []
+        for i, box in enumerate(manifest.boxes):
+            frame = self.frame(box)
+            sprite_source, source_size = self.source(manifest, i, frame)
+            frames.append({
+                "filename": manifest.frame_name(i),
+                "frame": frame,
+                "rotated": False,
+                "trimmed": manifest.sources is not None,
+                "spriteSourceSize": sprite_source,
+                "sourceSize": source_size,
+                "duration": self.DURATION
+            })
+        return {
+            "frames": frames,
+            "meta": {
+                "app": "Sprite Sheet Splitter",
+                "version": "2.0.0",
+                "image": manifest.image,
+                "format": "RGBA8888",
+                "size": {"w": width, "h": height},
+                "scale": "1",
+                "frameTags": [],
+                "layers": [],
+                "slices": []
+            }
+        }
+
+
+class ImageManifest:
+    """
+
+    ImageManifest class, used to export the sprite boxes without the pixels.
+
+    The manifest needs the sheet filename, its size, the boxes of the sprites
+    and the name used for each frame. The strategy chooses the file format.
+
+    """
+
+    STRATEGIES = {
+        "json": ManifestStrategy,
+        "texturepacker": ManifestTexturePackerStrategy,
+        "aseprite": ManifestAsepriteStrategy,
+    }
+
+    def __init__(self, image: str, size, boxes, name: str, type_img: str, sources=None) -> None:
+        """
+
+        ImageManifest constructor, needs the sheet, its size, the boxes and a name.
+
+        :param image: sheet filename
+        :param size: sheet size as (width, height)
+        :param boxes: sprite boxes as (left, top, right, bottom)
+        :param name: frame name prefix
+        :param type_img: frame extension
+        :param sources: boxes before trimming, None if the sprites aren't trimmed
+
+        :type image: str
+        :type size: tuple[int, int]
+        :type boxes: BoxSet
+        :type name: str
+        :type type_img: str
+        :type sources: BoxSet | None
+
+        :rtype: None
+
+        """
+        logger.info("init image manifest")
+        self.image = image
+        self.size = size
+        self.boxes = boxes
+        self.name = name
+        self.type = type_img
+        self.sources = sources
+
+    def frame_name(self, index: int) -> str:
+        """
+
+        get the frame name, the same name as the file ImageSaveComposite writes.
+
+        :rtype: str
+
+        """
+        return self.name + str(index) + '.' + self.type
+
+    def save(self, path: str, strategy: ManifestStrategy = None) -> str:
+        """
+
+        Save the manifest in the path directory.
+
+        if the path directory doesn't exist, the method create it.
+
+        :return: the manifest filename
+        :rtype: str
+
+        """
+        logger.info("start save manifest")
+        strategy = strategy if strategy is not None else ManifestStrategy()
+        if not os.path.exists(path):
+            os.mkdir(path)
+            logger.debug("path " + path + " created successfully.")
+        filename = os.path.join(path, self.name + '.' + strategy.EXTENSION)
+        with open(filename, 'w') as file:
+            json.dump(strategy.build(self), file, indent=4)
+        logger.info("end save manifest " + filename)
+        return filename
+
+    @staticmethod
+    def from_splitter(splitter, image: str, name: str, type_img: str, boxes=None):
+        """
+
+        construct a manifest from a splitter, without cropping any sprite.
+
+        The boxes are asked to the splitter, unless they are given because
+        the splitter already found them.
+
+        :return: the manifest
+        :rtype: ImageManifest
+
+        """
+        if boxes is None:
+            boxes = splitter.boxes()
+        return ImageManifest(
+            os.path.basename(image),
+            splitter.decore.size,
+            boxes,
+            name,
+            type_img,
+            splitter.sources
+        )
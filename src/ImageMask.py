@@ -1,51 +1,171 @@
 import numpy as np
+from ImageBoxes import BoxSet
 import logging
 
 
-logging.basicConfig(filename="window.log",
-                    format='[%(levelname)s] %(message)s',
-                    filemode='w')
-
 logger = logging.getLogger('mask')
 logger.setLevel(logging.DEBUG)
 
 
 class Mask:
 
-    def __init__(self, image):
+    STRIP_HEIGHT = 256
+    BACKENDS = ("serial", "tiles", "numba")
+    MODE_BYTES = {"I": 4, "F": 4, "I;16": 2, "I;16B": 2, "I;16L": 2}
+
+    def __init__(self, image, low_memory=False, strip_height=STRIP_HEIGHT, bg=None):
         """
         Initializes a Mask object with the given image.
 
         Parameters:
-            image (np.ndarray): The input image as a NumPy array.
+            image (PIL.Image | np.ndarray): The input image.
+            low_memory (bool): Build the mask strip by strip as a
+                uint8 array, without the Python lists.
+            strip_height (int): The row count of each strip.
+            bg (int | tuple | list | None): The background color (or index),
+                the first pixel of the image if None.
 
         Returns:
             None
         """
         self.image = image
+        self.low_memory = low_memory
+        self.strip_height = strip_height
+        self.bg = bg
         self.mask, self.bg = self.get_mask()
-        self.mask_array = np.array(self.mask)
+        self.mask_array = np.asarray(self.mask)
 
     def get_mask(self):
         """
         Extracts the mask and background color from the input image.
 
+        Indexed (mode P) images use get_index_mask instead,
+        and get_striped_mask is used in low memory.
+
         Returns:
             tuple[list[list[int]], int]: A tuple containing
             the mask as a 2D list of integers (0 or 1)
             and the background color as an integer.
 
         """
+        if getattr(self.image, "mode", None) == "P":
+            return self.get_index_mask()
+        if self.low_memory:
+            return self.get_striped_mask()
 
         im = np.array(self.image)
         image = im.tolist()
-        bg = image[0][0]
+        bg = list(self.bg) if isinstance(self.bg, tuple) else self.bg
+        bg = image[0][0] if bg is None else bg
 
         return (
             [[int(i != bg) for i in line] for line in image],
             bg
         )
 
+    def get_index_mask(self):
+        """
+        Extracts the mask and background index from an indexed image.
+
+        The mask is built straight from the 8-bit index plane, without
+        converting the palette to colors. The background is the transparent
+        index of the image if it has one, else the given background index,
+        or the index of the first pixel.
+        If the image has an alpha value per index, each index with a zero
+        alpha is background.
+
+        Returns:
+            tuple[np.ndarray, int]: A tuple containing
+            the mask as a 2D uint8 array (0 or 1)
+            and the background index as an integer.
+
+        """
+        plane = np.asarray(self.image)
+        transparency = self.image.info.get("transparency")
+        if isinstance(transparency, int):
+            bg = transparency
+            return (plane != bg).astype(np.uint8), bg
+        bg = int(plane[0, 0]) if self.bg is None else int(self.bg)
+        if isinstance(transparency, bytes):
+            opaque = np.ones(256, dtype=np.uint8)
+            alphas = np.frombuffer(transparency, dtype=np.uint8)[:256]
+            opaque[:len(alphas)] = alphas != 0
+            if not opaque[bg]:
+                return opaque[plane], bg
+        return (plane != bg).astype(np.uint8), bg
+
+    def get_striped_mask(self):
+        """
+        Extracts the mask and background color strip by strip.
+
+        Only one strip of rows is converted to an array at once, and
+        the mask is written in a preallocated uint8 array, so the peak
+        memory is the decoded image plus one byte per pixel, instead of
+        the Python lists of get_mask.
+
+        Returns:
+            tuple[np.ndarray, int | list[int]]: A tuple containing
+            the mask as a 2D uint8 array (0 or 1)
+            and the background color, as get_mask gives it.
+
+        """
+        if isinstance(self.image, np.ndarray):
+            width, height = self.image.shape[1], self.image.shape[0]
+        else:
+            width, height = self.image.size
+        mask = np.empty((height, width), dtype=np.uint8)
+        bg = None if self.bg is None else np.asarray(self.bg)
+        for top in range(0, height, self.strip_height):
+            bottom = min(top + self.strip_height, height)
+            if isinstance(self.image, np.ndarray):
+                strip = self.image[top:bottom]
+            else:
+                strip = np.asarray(self.image.crop((0, top, width, bottom)))
+            if bg is None:
+                bg = strip[0, 0].copy()
+            different = strip != bg
+            if different.ndim == 3:
+                different = different.any(axis=2)
+            mask[top:bottom] = different
+        return mask, bg.tolist() if bg is not None else 0
+
+    @staticmethod
+    def estimate(size, mode, low_memory=False, strip_height=STRIP_HEIGHT):
+        """
+        Estimates the peak memory of a mask without decoding the image.
+
+        The standard path holds the decoded image, its array, the
+        array as Python lists (one list per pixel for multi-band
+        modes) and the mask as lists, then as an array. The indexed
+        path holds the decoded image, its index plane, the mask and
+        the visited array of the search. The low memory path holds
+        the decoded image, the mask, the visited array, and one strip
+        of rows as an array and as the comparison of each band.
+
+        Parameters:
+            size (tuple[int, int]): The width and height of the image.
+            mode (str): The PIL mode of the image.
+            low_memory (bool): Estimate the low memory path.
+            strip_height (int): The row count of each strip in low memory.
+
+        Returns:
+            int: the estimated peak in bytes.
+
+        """
+        from PIL import Image
+
+        width, height = size
+        pixels = width * height
+        bands = Image.getmodebands(mode)
+        decoded = Mask.MODE_BYTES.get(mode, bands)
+        if mode == "P":
+            return pixels * (decoded + 3)
+        if low_memory:
+            strip = min(strip_height, height) * width * (decoded + bands + 1)
+            return pixels * (decoded + 2) + strip
+        pixel_list = 64 + 8 * bands if bands > 1 else 8
+        return pixels * (2 * decoded + pixel_list + 8 + 8 + 1)
+
     def find_sprite_contours(self):
         """
         Finds the contours of the sprite in the mask.
@@ -68,6 +188,46 @@ class Mask:
 
         return contours
 
+    def find_sprite_boxes(self, workers: int = 1, tile_size: int = 512, pool: str = "thread", backend: str = None):
+        """
+        Finds the boxes of the sprites in the mask.
+
+        With more than one worker, the mask is labelled tile by tile in
+        parallel by a TileLabeller, the boxes are the same as the serial ones.
+        The backend can also be chosen: serial, tiles, or numba for the flood
+        fill compiled by numba, which falls back to serial without numba.
+
+        Parameters:
+            workers (int): The worker count, 1 for the serial search,
+                None for the CPU count.
+            tile_size (int): The tile width and height in parallel.
+            pool (str): thread or process, the pool used in parallel.
+            backend (str): serial, tiles or numba, None to choose
+                serial or tiles from the worker count.
+
+        Returns:
+            BoxSet: the boxes as (left, top, right, bottom),
+            right and bottom excluded, like PIL crop boxes.
+
+        """
+        if backend is None:
+            backend = "serial" if workers == 1 else "tiles"
+        if backend not in Mask.BACKENDS:
+            raise ValueError(f"unknown backend {backend}, expected one of {Mask.BACKENDS}")
+        if backend == "numba":
+            import ImageJit
+
+            if ImageJit.AVAILABLE:
+                return BoxSet.from_contours(ImageJit.label(self.mask_array))
+            logger.warning("numba is not installed, fall back to the serial backend")
+            backend = "serial"
+        if backend == "serial":
+            return BoxSet.from_contours(self.find_sprite_contours())
+        from ImageLabel import TileLabeller
+
+        labeller = TileLabeller(tile_size, workers, pool)
+        return BoxSet.from_contours(labeller.label(self.mask_array))
+
     @staticmethod
     def is_valid_pixel(row, col, height, width):
         """
@@ -104,7 +264,7 @@ class Mask:
         """
         return Mask.is_valid_pixel(row, col, height, width) and self.mask_array[row, col] == 1
 
-    def find_contour(self, start_row, start_col, visited, width, height):
+    def find_contour(self, start_row, start_col, visited, height, width):
         """
         Finds the contour of the sprite
         starting from the given coordinates.
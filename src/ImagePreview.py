@@ -0,0 +1,258 @@
+from PIL import Image, ImageDraw
+import hashlib
+import os
+import tempfile
+import logging
+
+
+logger = logging.getLogger('preview')
+logger.setLevel(logging.DEBUG)
+
+
+class ImagePreview:
+    """
+
+    ImagePreview class, generates a bounded size thumbnail of a sprite sheet.
+
+    The window shows this thumbnail instead of the full resolution sheet, the
+    full resolution image is only decoded when the sheet is split. JPEG sheets
+    are decoded at a lower scale thanks to draft, and all sheets are reduced
+    by an integer factor before the last resampling. Thumbnails are cached on
+    disk, the cache key is made with the sheet path, its modification time and
+    size, and the bounds.
+
+    """
+
+    WIDTH = 1000
+    HEIGHT = 700
+    CACHE_DIR = os.path.join(tempfile.gettempdir(), "sprite-sheet-splitter")
+
+    def __init__(self, filename: str, width: int = WIDTH, height: int = HEIGHT, cache_dir: str = None) -> None:
+        """
+
+        ImagePreview's constructor, needs the sheet filename and the preview bounds.
+
+        :param filename: sprite sheet filename
+        :param width: max preview width
+        :param height: max preview height
+        :param cache_dir: thumbnail directory, CACHE_DIR by default
+
+        :type filename: str
+        :type width: int
+        :type height: int
+        :type cache_dir: str
+
+        :rtype: None
+
+        """
+        self.filename = filename
+        self.width = width
+        self.height = height
+        self.cache_dir = cache_dir if cache_dir is not None else ImagePreview.CACHE_DIR
+        self.size = None
+        self.source_size = None
+        self.mask = None
+        self.boxes = None
+        self.overlay = None
+
+    @property
+    def scale(self) -> float:
+        """
+
+        get the ratio between the preview width and the sheet width.
+
+        :rtype: float
+
+        """
+        return self.size[0] / self.source_size[0]
+
+    def cache_path(self) -> str:
+        """
+
+        get the thumbnail filename in the cache directory.
+
+        :rtype: str
+
+        """
+        stat = os.stat(self.filename)
+        key = f"{os.path.abspath(self.filename)}:{stat.st_mtime_ns}:{stat.st_size}:{self.width}x{self.height}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".png")
+
+    def generate(self) -> str:
+        """
+
+        generate the thumbnail if it isn't in the cache and return its filename.
+
+        :return: the thumbnail filename
+        :rtype: str
+
+        """
+        path = self.cache_path()
+        with Image.open(self.filename) as image:
+            self.source_size = image.size
+            if os.path.exists(path):
+                logger.debug("preview found in cache " + path)
+                with Image.open(path) as preview:
+                    self.size = preview.size
+                return path
+            logger.info("start generate preview")
+            if image.format == "JPEG":
+                image.draft("RGB", (self.width, self.height))
+            if image.mode not in ("RGB", "RGBA", "L", "LA"):
+                image = image.convert("RGBA")
+            # reduce by an integer factor first, then resample the small image
+            image.thumbnail((self.width, self.height), reducing_gap=2.0)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            image.save(path, format="PNG", compress_level=1)
+            self.size = image.size
+        logger.info(f"end generate preview {self.source_size} -> {self.size}")
+        return path
+
+    def get_mask(self):
+        """
+
+        get the mask of the thumbnail, computed once, then cached.
+
+        :rtype: Mask
+
+        """
+        if self.mask is None:
+            from ImageMask import Mask
+
+            with Image.open(self.generate()) as preview:
+                self.mask = Mask(preview)
+        return self.mask
+
+    def sprite_boxes(self):
+        """
+
+        get the boxes of the sprites found in the mask of the thumbnail.
+
+        The mask and its contours are computed once, then cached, because
+        they don't depend on the splitter settings.
+
+        :return: all boxes as (left, top, right, bottom), in thumbnail pixels
+        :rtype: BoxSet
+
+        """
+        if self.boxes is None:
+            self.boxes = self.get_mask().find_sprite_boxes()
+        return self.boxes
+
+    def overlay_boxes(self, options):
+        """
+
+        get the boxes a split with these options would give, in thumbnail
+        pixels, without decoding the sheet.
+
+        The auto mode keeps the cached boxes of the thumbnail mask, only the
+        ones inside a region if there are regions. The grid mode cuts the grid
+        from the sheet size (in each region if there are regions), scales it,
+        and trims it in the thumbnail mask if asked. Raise ValueError if a
+        region is outside the sheet.
+
+        :param options: split options
+        :type options: SplitOptions
+
+        :return: all boxes as (left, top, right, bottom), in thumbnail pixels
+        :rtype: BoxSet
+
+        """
+        from ImageBoxes import BoxSet
+        from ImageSplitter import SplitterStrategy
+
+        if self.size is None:
+            self.generate()
+        regions = [SplitterStrategy.check_region(self.source_size, region) for region in options.regions or ()]
+        if options.mode == "auto":
+            boxes = self.sprite_boxes()
+            if regions:
+                boxes = ImagePreview.inside_regions(boxes, self.scale_boxes(regions))
+            return boxes
+        strategy = options.strategy()
+        if regions:
+            boxes = BoxSet.concatenate([
+                strategy.grid_boxes((right - left, bottom - top)).translate(left, top)
+                for left, top, right, bottom in regions
+            ])
+        else:
+            boxes = strategy.grid_boxes(self.source_size)
+        boxes = self.scale_boxes(boxes)
+        if options.trim:
+            boxes = strategy.trim(None, boxes, self.get_mask().mask_array)
+        return boxes
+
+    @staticmethod
+    def inside_regions(boxes, regions):
+        """
+
+        keep the boxes inside one of the regions.
+
+        :rtype: BoxSet
+
+        """
+        inside = (
+            (boxes.left[:, None] >= regions.left[None, :])
+            & (boxes.top[:, None] >= regions.top[None, :])
+            & (boxes.right[:, None] <= regions.right[None, :])
+            & (boxes.bottom[:, None] <= regions.bottom[None, :])
+        )
+        return boxes.filter(inside.any(axis=1))
+
+    def scale_boxes(self, boxes):
+        """
+
+        scale boxes from sheet pixels to thumbnail pixels.
+
+        :rtype: BoxSet
+
+        """
+        from ImageBoxes import BoxSet
+
+        return BoxSet(boxes).scale(self.scale)
+
+    def draw_overlay(self, boxes, color=(255, 0, 0, 255)) -> str:
+        """
+
+        draw the boxes on a transparent image of the thumbnail size.
+
+        The overlay filename depends on the boxes, so the window loads
+        the new overlay each time the boxes change. Only the last overlay
+        is kept, the previous one is removed once the new one is written.
+
+        :param boxes: boxes as (left, top, right, bottom), in thumbnail pixels
+        :param color: outline color as RGBA
+        :type boxes: BoxSet
+
+        :return: the overlay filename
+        :rtype: str
+
+        """
+        digest = hashlib.sha1(self.cache_path().encode())
+        digest.update(boxes.to_numpy().tobytes())
+        digest = digest.hexdigest()
+        path = os.path.join(self.cache_dir, digest + ".overlay.png")
+        if path == self.overlay and os.path.exists(path):
+            return path
+        overlay = Image.new("RGBA", self.size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(overlay)
+        for left, top, right, bottom in boxes:
+            draw.rectangle((left, top, max(left, right - 1), max(top, bottom - 1)), outline=color)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        overlay.save(path, format="PNG", compress_level=1)
+        logger.debug(f"overlay of {len(boxes)} boxes drawn in {path}")
+        self.remove_overlay()
+        self.overlay = path
+        return path
+
+    def remove_overlay(self) -> None:
+        """
+
+        remove the last overlay drawn, if any.
+
+        :rtype: None
+
+        """
+        if self.overlay is not None and os.path.exists(self.overlay):
+            os.remove(self.overlay)
+        self.overlay = None
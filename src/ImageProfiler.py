@@ -0,0 +1,126 @@
+from contextlib import contextmanager
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+import logging
+
+
+logger = logging.getLogger('profiler')
+logger.setLevel(logging.DEBUG)
+
+
+class StageProfiler:
+    """
+
+    StageProfiler class, profiles the stages of a split one after another.
+
+    Each stage runs under its own cProfile profiler and tracemalloc snapshot,
+    the report gives for each stage its time, its memory peak, its functions
+    sorted by cumulative time and its top allocations. A disabled profiler
+    runs the stages without any overhead, so the code can always use it.
+
+    """
+
+    def __init__(self, enabled: bool = True, top: int = 15) -> None:
+        """
+
+        StageProfiler's constructor.
+
+        :param enabled: profile the stages, else only run them
+        :param top: functions and allocations kept per stage
+
+        :type enabled: bool
+        :type top: int
+
+        :rtype: None
+
+        """
+        self.enabled = enabled
+        self.top = top
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+
+        profile the code of the with block as the stage name.
+
+        Stages cannot be nested, cProfile only runs one profiler at once.
+
+        :param name: stage name
+        :type name: str
+
+        """
+        if not self.enabled:
+            yield
+            return
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        base = tracemalloc.get_traced_memory()[0]
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            seconds = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            if started:
+                tracemalloc.stop()
+            self.stages.append({
+                "name": name,
+                "seconds": seconds,
+                "peak": peak - base,
+                "retained": current - base,
+                "profile": profile,
+                "allocations": after.compare_to(before, "lineno")[:self.top],
+            })
+            logger.info(f"stage {name}: {seconds:.4f}s, peak {(peak - base) / 2 ** 20:.1f} MiB")
+
+    def report(self) -> str:
+        """
+
+        get the report of all the stages as text.
+
+        :rtype: str
+
+        """
+        lines = ["stage                 seconds    peak MiB  retained MiB"]
+        for stage in self.stages:
+            lines.append(
+                f"{stage['name']:<20} {stage['seconds']:8.4f} {stage['peak'] / 2 ** 20:11.2f}"
+                f" {stage['retained'] / 2 ** 20:13.2f}"
+            )
+        for stage in self.stages:
+            lines += ["", "=" * 72, f"stage {stage['name']}", "=" * 72, "", "top allocations:"]
+            lines += [f"  {statistic}" for statistic in stage["allocations"]]
+            stream = io.StringIO()
+            pstats.Stats(stage["profile"], stream=stream).sort_stats("cumulative").print_stats(self.top)
+            lines += ["", stream.getvalue().strip()]
+        return "\n".join(lines) + "\n"
+
+    def save(self, path: str, name: str) -> str:
+        """
+
+        write the report in path, as <name>profile.txt, next to the outputs.
+
+        :return: the report filename, None if the profiler is disabled
+        :rtype: str | None
+
+        """
+        if not self.enabled:
+            return None
+        os.makedirs(path, exist_ok=True)
+        filename = os.path.join(path, name + 'profile.txt')
+        with open(filename, 'w') as file:
+            file.write(self.report())
+        logger.info("profile report " + filename + " saved successfully.")
+        return filename
@@ -1,12 +1,12 @@
 from PIL import Image
+from ImageArchive import ImageArchive
+import io
 import os
+import json
+import asyncio
 import logging
 import traceback
 
-logging.basicConfig(filename="window.log",
-                    format='[%(levelname)s] %(message)s',
-                    filemode='w')
-
 logger = logging.getLogger('saver')
 logger.setLevel(logging.DEBUG)
 
@@ -37,6 +37,10 @@ class ImageSaveComposite:
         self.path = path + '/'
         self.name = name
         self.type = type_img
+        self.deduplicator = None
+        self.encoder = None
+        self.directories = set()
+        self.suffix = ''
 
     def save(self) -> None:
         """
@@ -45,6 +49,10 @@ class ImageSaveComposite:
 
         if the path directory doesn't exist, the method
         create it, and save the image in filename location.
+        If a deduplicator is set, each unique image is saved
+        only once and a mapping file links frames to files.
+        If an encoder is set, it encodes the images with its
+        preset instead of the PIL defaults of the image type.
 
         :return: nothing
         :rtype: None
@@ -54,12 +62,207 @@ class ImageSaveComposite:
         if not os.path.exists(self.path):
             os.mkdir(self.path)
             logger.debug("path " + self.path + " created successfully.")
-        for i in range(len(self.images)):
-            name = self.path + self.name + str(i) + '.' + self.type
-            self.images[i].save(name)
+        images, frames = self.images, None
+        if self.deduplicator is not None:
+            images, frames = self.deduplicator.deduplicate(self.images)
+        for i in range(len(images)):
+            name = self.path + self.filename(i)
+            if self.encoder is None:
+                images[i].save(name)
+            else:
+                self.encoder.save(images[i], name)
             logger.debug("image " + name + " saved successfully.")
+        if frames is not None:
+            self.save_mapping(frames)
+        if self.encoder is not None:
+            logger.info("encoder report: " + str(self.encoder.report()))
         logger.info("end save recursively")
 
+    async def save_async(self, concurrency: int = 8, executor=None) -> None:
+        """
+
+        Save img in the computer without waiting each write one after another.
+
+        Each image is encoded then written in the executor (the default one
+        if None), at most concurrency images are in flight at the same time,
+        so the encoding of an image overlaps with the writes of the others.
+        The directories created are remembered in the directories set, a
+        caller writing many composites in the same directories can give
+        them one set, so each directory is created once.
+
+        :param concurrency: max count of images encoded or written at once
+        :param executor: executor used for encoding and writing
+        :type concurrency: int
+        :type executor: concurrent.futures.Executor
+
+        :return: nothing
+        :rtype: None
+
+        """
+        logger.info("start save asynchronously")
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, concurrency={concurrency}")
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+        await self.make_directory(self.path, executor)
+        images, frames = self.images, None
+        if self.deduplicator is not None:
+            images, frames = self.deduplicator.deduplicate(self.images)
+
+        async def save_image(index: int, image) -> None:
+            async with semaphore:
+                name = self.path + self.filename(index)
+                data = await loop.run_in_executor(executor, self.encode, image)
+                await loop.run_in_executor(executor, ImageSaveComposite.write, name, data)
+                logger.debug("image " + name + " saved successfully.")
+
+        await asyncio.gather(*(save_image(i, images[i]) for i in range(len(images))))
+        if frames is not None:
+            await loop.run_in_executor(executor, self.save_mapping, frames)
+        logger.info("end save asynchronously")
+
+    async def make_directory(self, path: str, executor=None) -> None:
+        """
+
+        create the path directory if it is not already in the directories
+        set, shared by the composites given the same set.
+
+        :return: nothing
+        :rtype: None
+
+        """
+        if path in self.directories:
+            return
+        await asyncio.get_running_loop().run_in_executor(
+            executor, lambda: os.makedirs(path, exist_ok=True)
+        )
+        self.directories.add(path)
+        logger.debug("path " + path + " created successfully.")
+
+    @staticmethod
+    def write(filename: str, data: bytes) -> None:
+        """
+
+        write the encoded data in filename.
+
+        :return: nothing
+        :rtype: None
+
+        """
+        with open(filename, 'wb') as file:
+            file.write(data)
+
+    def filename(self, index: int) -> str:
+        """
+
+        get the filename of the image at index, without the path,
+        followed by the suffix (a scale like @2x) if it is set.
+
+        :rtype: str
+
+        """
+        return self.name + str(index) + self.suffix + '.' + self.extension()
+
+    def extension(self) -> str:
+        """
+
+        get the extension of the images, the encoder one if an encoder
+        is set, else the image type.
+
+        :rtype: str
+
+        """
+        return self.type if self.encoder is None else self.encoder.extension
+
+    def save_mapping(self, frames) -> None:
+        """
+
+        Save the mapping from frame index to unique file as JSON.
+
+        :param frames: for each frame, the unique index and the transformation
+        :type frames: list[tuple[int, str]]
+
+        :return: nothing
+        :rtype: None
+
+        """
+        name = self.path + self.name + self.suffix + 'mapping.json'
+        with open(name, 'w') as file:
+            json.dump(self.mapping(frames), file, indent=4)
+        logger.debug("mapping " + name + " saved successfully.")
+
+    def mapping(self, frames) -> dict:
+        """
+
+        get the mapping from frame index to unique file.
+
+        :param frames: for each frame, the unique index and the transformation
+        :type frames: list[tuple[int, str]]
+
+        :return: the mapping as a JSON document
+        :rtype: dict
+
+        """
+        return {
+            "frames": [
+                {
+                    "frame": i,
+                    "file": self.filename(unique),
+                    "transform": transform
+                }
+                for i, (unique, transform) in enumerate(frames)
+            ]
+        }
+
+    def encode(self, image) -> bytes:
+        """
+
+        encode the image in memory, with the encoder if it is set,
+        else with the PIL defaults of the image type.
+
+        :return: the encoded image
+        :rtype: bytes
+
+        """
+        if self.encoder is not None:
+            return self.encoder.encode(image)
+        stream = io.BytesIO()
+        Image.init()
+        image.save(stream, format=Image.EXTENSION['.' + self.type.lower()])
+        return stream.getvalue()
+
+    def save_archive(self, archive_type: str) -> str:
+        """
+
+        Save all images in one archive (tar, zip or pack) in the path directory.
+
+        The archive is called as the composite name, the images are encoded
+        in memory and written one after another through one file handle.
+        Raise ValueError if archive_type isn't a key of ImageArchive.STRATEGIES.
+
+        :return: the archive filename
+        :rtype: str
+
+        """
+        if archive_type not in ImageArchive.STRATEGIES:
+            raise ValueError(f"unknown archive type {archive_type}, expected one of {tuple(ImageArchive.STRATEGIES)}")
+        logger.info("start save archive")
+        if not os.path.exists(self.path):
+            os.mkdir(self.path)
+            logger.debug("path " + self.path + " created successfully.")
+        images, frames = self.images, None
+        if self.deduplicator is not None:
+            images, frames = self.deduplicator.deduplicate(self.images)
+        strategy = ImageArchive.STRATEGIES[archive_type]
+        filename = self.path + self.name + self.suffix + '.' + strategy.EXTENSION
+        with ImageArchive.open(filename, archive_type) as archive:
+            for i in range(len(images)):
+                archive.add(self.filename(i), self.encode(images[i]))
+            if frames is not None:
+                archive.add(self.name + self.suffix + 'mapping.json', json.dumps(self.mapping(frames)).encode())
+        logger.info("end save archive " + filename)
+        return filename
+
     def append(self, image) -> None:
         """
 
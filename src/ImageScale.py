@@ -0,0 +1,152 @@
+from PIL import Image
+import numpy as np
+import logging
+
+
+logger = logging.getLogger('scale')
+logger.setLevel(logging.DEBUG)
+
+
+class ScaleStrategy:
+    """
+
+    ScaleStrategy class, scales a decoded sprite by a factor.
+
+    """
+
+    def __init__(self, factor: int) -> None:
+        if factor < 1:
+            raise ValueError(f"scale factor must be at least 1, factor={factor}")
+        self.factor = factor
+
+    def scale(self, sprite: Image, array: np.ndarray = None) -> Image:
+        return sprite
+
+
+class UpscaleStrategy(ScaleStrategy):
+    """
+
+    UpscaleStrategy class, subclass of ScaleStrategy,
+    nearest-neighbour upscale by an integer factor for pixel art.
+
+    Each pixel is repeated factor times along both axes of the array of the
+    sprite, which keeps the hard edges and the exact colors (or indexes of an
+    indexed sprite), and costs one array copy per axis.
+
+    """
+
+    MODES = ("L", "P", "LA", "PA", "RGB", "RGBA", "RGBX", "CMYK")
+
+    def scale(self, sprite: Image, array: np.ndarray = None) -> Image:
+        if self.factor == 1:
+            return sprite
+        if sprite.mode not in UpscaleStrategy.MODES:
+            return sprite.resize((sprite.width * self.factor, sprite.height * self.factor), Image.NEAREST)
+        array = np.asarray(sprite) if array is None else array
+        array = np.repeat(np.repeat(array, self.factor, axis=0), self.factor, axis=1)
+        scaled = Image.frombytes(sprite.mode, (array.shape[1], array.shape[0]), array.tobytes())
+        if sprite.mode in ("P", "PA"):
+            scaled.putpalette(sprite.getpalette())
+        scaled.info = dict(sprite.info)
+        return scaled
+
+
+class DownscaleStrategy(ScaleStrategy):
+    """
+
+    DownscaleStrategy class, subclass of ScaleStrategy,
+    downscale by an integer factor with PIL reduce, each pixel is
+    the mean of a factor x factor block.
+
+    """
+
+    def scale(self, sprite: Image, array: np.ndarray = None) -> Image:
+        if self.factor == 1:
+            return sprite
+        if sprite.mode in ("P", "PA", "1"):
+            sprite = sprite.convert("RGBA")
+        return sprite.reduce(self.factor)
+
+
+class SpriteScaler:
+    """
+
+    SpriteScaler class, scales all the sprites in several resolutions in one pass.
+
+    The scales are written as 2 (@2x), 4 (@4x) or 0.5 (@0.5x): integer scales
+    are nearest-neighbour upscales, scales 1 / n are reduced by n. Each sprite
+    is converted to an array once, and all its upscaled variants are built from
+    this same array.
+
+    """
+
+    def __init__(self, scales=(1, 2)) -> None:
+        """
+
+        SpriteScaler's constructor, raise ValueError if a scale is not an integer or 1 / n.
+
+        :param scales: scales of the variants
+        :type scales: list[float]
+
+        :rtype: None
+
+        """
+        self.scales = [SpriteScaler.parse(scale) for scale in scales]
+        self.strategies = {scale: SpriteScaler.strategy(scale) for scale in self.scales}
+
+    @staticmethod
+    def parse(scale) -> float:
+        """
+
+        get a scale from a number or a text like 2, 2x, @2x or 0.5.
+
+        :rtype: float
+
+        """
+        if isinstance(scale, str):
+            scale = float(scale.strip().lstrip('@').rstrip('xX'))
+        if scale <= 0:
+            raise ValueError(f"scale must be positive, scale={scale}")
+        if scale >= 1 and scale != int(scale):
+            raise ValueError(f"upscale must be an integer, scale={scale}")
+        if scale < 1 and abs(round(1 / scale) * scale - 1) > 1e-6:
+            raise ValueError(f"downscale must be 1 / n, scale={scale}")
+        return int(scale) if scale >= 1 else scale
+
+    @staticmethod
+    def strategy(scale: float) -> ScaleStrategy:
+        if scale >= 1:
+            return UpscaleStrategy(int(scale))
+        return DownscaleStrategy(round(1 / scale))
+
+    @staticmethod
+    def suffix(scale: float) -> str:
+        """
+
+        get the filename suffix of a scale, @2x or @0.5x.
+
+        :rtype: str
+
+        """
+        return f"@{scale:g}x"
+
+    def variants(self, sprites):
+        """
+
+        scale all the sprites in every scale.
+
+        :param sprites: sprites to scale
+        :type sprites: list[Image]
+
+        :return: the sprites of each scale, in the order of the sprites
+        :rtype: dict[float, list[Image]]
+
+        """
+        logger.info(f"scale {len(sprites)} sprites in {self.scales}")
+        variants = {scale: [] for scale in self.scales}
+        for sprite in sprites:
+            sprite.load()
+            array = np.asarray(sprite) if sprite.mode in UpscaleStrategy.MODES else None
+            for scale, strategy in self.strategies.items():
+                variants[scale].append(strategy.scale(sprite, array))
+        return variants
@@ -0,0 +1,200 @@
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from ImageMask import Mask
+import copy
+import os
+import threading
+import logging
+
+
+logger = logging.getLogger('scheduler')
+logger.setLevel(logging.DEBUG)
+
+
+class MemoryBudget:
+    """
+
+    MemoryBudget class, a semaphore counting bytes instead of slots.
+
+    A job waits until its bytes fit in what is left of the budget. A job
+    larger than the whole budget is admitted alone, once nothing else runs.
+    The jobs are admitted in their arrival order: a waiting job blocks the
+    jobs arrived after it, even if they would fit, so the smaller jobs
+    cannot keep a large one waiting forever.
+
+    """
+
+    def __init__(self, budget: int) -> None:
+        if budget < 1:
+            raise ValueError(f"memory budget must be positive, budget={budget}")
+        self.budget = budget
+        self.used = 0
+        self.waiting = deque()
+        self.condition = threading.Condition()
+
+    def acquire(self, size: int) -> None:
+        with self.condition:
+            ticket = object()
+            self.waiting.append(ticket)
+            self.condition.wait_for(
+                lambda: self.waiting[0] is ticket and (self.used == 0 or self.used + size <= self.budget)
+            )
+            self.waiting.popleft()
+            self.used += size
+            # the next job in line may fit in what is left
+            self.condition.notify_all()
+
+    def release(self, size: int) -> None:
+        with self.condition:
+            self.used -= size
+            self.condition.notify_all()
+
+
+class MemoryScheduler:
+    """
+
+    MemoryScheduler class, splits a batch of sheets under a memory budget.
+
+    The peak memory of each sheet is estimated from its size and mode, read in
+    its header, without decoding it, for the path its split options will run:
+    the grid only holds the decoded sheet (and the striped trim mask with trim),
+    the auto mode holds the mask estimated by Mask.estimate. An auto sheet whose
+    standard estimate is larger than the budget is routed to the low memory path,
+    which builds its mask strip by strip. Then the sheets run in a pool of workers,
+    but a sheet only starts when its estimate fits in what is left of the budget,
+    in the order of the sheets.
+
+    """
+
+    def __init__(self, budget: int, workers: int = None) -> None:
+        """
+
+        MemoryScheduler's constructor.
+
+        :param budget: memory budget in bytes
+        :param workers: sheets split at once at most, the CPU count by default
+
+        :type budget: int
+        :type workers: int | None
+
+        :rtype: None
+
+        """
+        self.budget = MemoryBudget(budget)
+        self.workers = workers if workers is not None else os.cpu_count()
+
+    @staticmethod
+    def header(filename: str):
+        """
+
+        get the size and the mode of a sheet, only its header is read.
+
+        :rtype: tuple[tuple[int, int], str]
+
+        """
+        import PIL.Image
+
+        with PIL.Image.open(filename) as image:
+            return image.size, image.mode
+
+    def plan(self, filename: str, options=None, sprites: bool = False) -> dict:
+        """
+
+        estimate the peak memory of a sheet and choose its path.
+
+        The mask is freed before the sprites are cropped, so with sprites the
+        peak is the largest of the mask estimate and of the decoded sheet with
+        its sprites, at most as large as the sheet.
+
+        :param filename: sheet to split
+        :param options: split options, SplitOptions() by default
+        :param sprites: the sprites are cropped and held until they are saved
+
+        :type options: SplitOptions
+        :type sprites: bool
+
+        :return: the filename, the size, the mode, the path (grid, standard or
+            low-memory) and the estimated bytes of this path
+        :rtype: dict
+
+        """
+        from PIL import Image
+
+        size, mode = MemoryScheduler.header(filename)
+        decoded = size[0] * size[1] * Mask.MODE_BYTES.get(mode, Image.getmodebands(mode))
+        if options is not None and options.mode == "grid":
+            path = "grid"
+            estimate = Mask.estimate(size, mode, low_memory=True) if options.trim else decoded
+        else:
+            path = "low-memory" if options is not None and options.low_memory else "standard"
+            estimate = Mask.estimate(size, mode, low_memory=path == "low-memory")
+            if estimate > self.budget.budget and path == "standard":
+                path = "low-memory"
+                estimate = Mask.estimate(size, mode, low_memory=True)
+        if sprites:
+            estimate = max(estimate, 2 * decoded)
+        if estimate > self.budget.budget:
+            logger.warning(f"{filename} needs {estimate} bytes in the {path} path, it will run alone")
+        return {"filename": filename, "size": size, "mode": mode, "path": path, "bytes": estimate}
+
+    def run(self, filenames, function, options=None, sprites: bool = False):
+        """
+
+        call function on each sheet, under the memory budget.
+
+        :param filenames: sheets to split
+        :param function: called as function(plan) for each sheet, plan from the plan method
+        :param options: split options the sheets are planned for, SplitOptions() by default
+        :param sprites: function crops the sprites and holds them until they are saved
+
+        :type filenames: list[str]
+        :type function: Callable[[dict], object]
+        :type options: SplitOptions
+        :type sprites: bool
+
+        :return: the result of function for each sheet, in order
+        :rtype: list
+
+        """
+        plans = [self.plan(filename, options, sprites) for filename in filenames]
+
+        def job(plan):
+            self.budget.acquire(plan["bytes"])
+            try:
+                logger.info(f"split {plan['filename']} ({plan['path']}, {plan['bytes'] / 2 ** 20:.1f} MiB)")
+                return function(plan)
+            finally:
+                self.budget.release(plan["bytes"])
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(job, plans))
+
+    def split(self, filenames, options=None):
+        """
+
+        split each sheet with split_sheet, the low memory sheets with low_memory options.
+
+        The results keep their decoded sheet, to write the sprites of a large
+        batch as soon as each sheet is split, use run with a function which
+        splits and writes.
+
+        :param filenames: sheets to split
+        :param options: split options, SplitOptions() by default
+
+        :type filenames: list[str]
+        :type options: SplitOptions
+
+        :return: the split result of each sheet, in order
+        :rtype: list[SplitResult]
+
+        """
+        from SpriteSheet import SplitOptions, split_sheet
+
+        options = options if options is not None else SplitOptions()
+        low_memory = copy.copy(options)
+        low_memory.low_memory = True
+        return self.run(
+            filenames,
+            lambda plan: split_sheet(plan["filename"], low_memory if plan["path"] == "low-memory" else options),
+            options
+        )
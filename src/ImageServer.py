@@ -0,0 +1,480 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import Future
+from collections import OrderedDict, deque
+from urllib.parse import urlparse, parse_qsl, urlencode
+from urllib.request import Request, urlopen
+import argparse
+import hashlib
+import io
+import json
+import queue
+import sys
+import threading
+import time
+import zipfile
+import logging
+import Startup
+
+
+logger = logging.getLogger('server')
+logger.setLevel(logging.DEBUG)
+
+
+class SplitCache:
+    """
+
+    SplitCache class, keeps the last results by sheet hash and options.
+
+    The least recently used result is dropped when the cache is full.
+
+    """
+
+    def __init__(self, size: int = 32) -> None:
+        self.size = size
+        self.results = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(data: bytes, options: dict) -> str:
+        """
+
+        get the key of a request, the sha1 of the sheet and of its sorted options.
+
+        The encoder only changes the zip output, so it is left out of the key
+        of the boxes output, and the same boxes are found whatever the encoder.
+
+        :rtype: str
+
+        """
+        if options.get("output") == "boxes":
+            options = {name: value for name, value in options.items() if name != "encoder"}
+        digest = hashlib.sha1(data)
+        digest.update(json.dumps(options, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        with self.lock:
+            if key not in self.results:
+                return None
+            self.results.move_to_end(key)
+            return self.results[key]
+
+    def put(self, key: str, result) -> None:
+        if self.size < 1:
+            return
+        with self.lock:
+            self.results[key] = result
+            self.results.move_to_end(key)
+            while len(self.results) > self.size:
+                self.results.popitem(last=False)
+
+
+class ServerMetrics:
+    """
+
+    ServerMetrics class, counts the requests and measures their latency.
+
+    The latency percentiles are computed on the last WINDOW requests,
+    the throughput on all the requests completed since the start.
+
+    """
+
+    WINDOW = 1000
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.counters = {
+            "requests": 0,
+            "rejected": 0,
+            "cache_hits": 0,
+            "completed": 0,
+            "failed": 0,
+        }
+        self.latencies = deque(maxlen=ServerMetrics.WINDOW)
+        self.lock = threading.Lock()
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.counters[name] += 1
+
+    def observe(self, seconds: float) -> None:
+        with self.lock:
+            self.counters["completed"] += 1
+            self.latencies.append(seconds)
+
+    def snapshot(self, queued: int = 0) -> dict:
+        """
+
+        get the counters, the throughput and the latency percentiles in milliseconds.
+
+        :rtype: dict
+
+        """
+        with self.lock:
+            latencies = sorted(self.latencies)
+            snapshot = dict(self.counters)
+        uptime = time.perf_counter() - self.start
+        snapshot["queued"] = queued
+        snapshot["uptime"] = uptime
+        snapshot["throughput"] = snapshot["completed"] / uptime if uptime else 0.0
+        for name, percentile in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            snapshot[f"latency_{name}_ms"] = (
+                latencies[min(len(latencies) - 1, int(percentile * len(latencies)))] * 1000
+                if latencies else 0.0
+            )
+        return snapshot
+
+
+class SplitService:
+    """
+
+    SplitService class, splits the sheets in a bounded pool of worker threads.
+
+    The requests wait in a bounded queue: when it is full, submit raises
+    queue.Full at once instead of blocking, so the caller can ask the client
+    to retry later. The results are cached by sheet hash and options, a sheet
+    already split is answered without going through the queue.
+
+    """
+
+    OUTPUTS = ("boxes", "zip")
+    OPTIONS = {
+        "rows": int,
+        "columns": int,
+        "left": int,
+        "right": int,
+        "top": int,
+        "bottom": int,
+        "mode": str,
+        "trim": lambda value: str(value).lower() in ("1", "true", "yes"),
+        "output": str,
+        "encoder": str,
+    }
+
+    def __init__(self, workers: int = 2, queue_size: int = 8, cache_size: int = 32) -> None:
+        """
+
+        SplitService's constructor, starts the worker threads.
+
+        :param workers: worker thread count
+        :param queue_size: requests waiting at most, the backpressure limit
+        :param cache_size: results kept in the cache
+
+        :rtype: None
+
+        """
+        if workers < 1 or queue_size < 1:
+            raise ValueError(f"workers and queue size must be at least 1, ({workers}, {queue_size})")
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.cache = SplitCache(cache_size)
+        self.metrics = ServerMetrics()
+        self.threads = [
+            threading.Thread(target=self.work, name=f"split-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    @staticmethod
+    def parse_options(query: dict) -> dict:
+        """
+
+        get the split options from the query parameters, raise ValueError if one is invalid.
+
+        :rtype: dict
+
+        """
+        from SpriteSheet import SplitOptions
+        from ImageEncoder import ImageEncoder
+
+        options = {"rows": 1, "columns": 1, "left": 0, "right": 0, "top": 0, "bottom": 0,
+                   "mode": "auto", "trim": False, "output": "boxes", "encoder": "png"}
+        for name, value in query.items():
+            if name not in SplitService.OPTIONS:
+                raise ValueError(f"unknown option {name}")
+            options[name] = SplitService.OPTIONS[name](value)
+        if options["mode"] not in SplitOptions.MODES:
+            raise ValueError(f"unknown mode {options['mode']}, expected one of {SplitOptions.MODES}")
+        if options["output"] not in SplitService.OUTPUTS:
+            raise ValueError(f"unknown output {options['output']}, expected one of {SplitService.OUTPUTS}")
+        if options["encoder"] not in ImageEncoder.PRESETS:
+            raise ValueError(f"unknown encoder {options['encoder']}, expected one of {tuple(ImageEncoder.PRESETS)}")
+        return options
+
+    def submit(self, data: bytes, options: dict) -> Future:
+        """
+
+        submit a sheet to split, raise queue.Full if the queue is full.
+
+        :param data: encoded sheet
+        :param options: split options, from parse_options
+
+        :return: future of the result, a dict for boxes, bytes for zip
+        :rtype: Future
+
+        """
+        self.metrics.count("requests")
+        key = SplitCache.key(data, options)
+        future = Future()
+        result = self.cache.get(key)
+        if result is not None:
+            self.metrics.count("cache_hits")
+            self.metrics.observe(0.0)
+            future.set_result(result)
+            return future
+        try:
+            self.queue.put_nowait((key, data, options, future, time.perf_counter()))
+        except queue.Full:
+            self.metrics.count("rejected")
+            raise
+        return future
+
+    def work(self) -> None:
+        """
+
+        worker loop, splits the queued sheets until a None job is read.
+
+        :rtype: None
+
+        """
+        while True:
+            job = self.queue.get()
+            if job is None:
+                self.queue.task_done()
+                return
+            key, data, options, future, start = job
+            try:
+                result = SplitService.split(data, options)
+            except Exception as exception:
+                logger.exception("split failed")
+                self.metrics.count("failed")
+                future.set_exception(exception)
+            else:
+                self.cache.put(key, result)
+                self.metrics.observe(time.perf_counter() - start)
+                future.set_result(result)
+            finally:
+                self.queue.task_done()
+
+    @staticmethod
+    def split(data: bytes, options: dict):
+        """
+
+        split an encoded sheet with the ImageSplitterDecorator.
+
+        :return: the boxes as a dict, or the sprites in a stored zip
+        :rtype: dict | bytes
+
+        """
+        import PIL.Image
+        from ImageSplitter import ImageSplitterDecorator
+        from ImageEncoder import ImageEncoder
+
+        image = PIL.Image.open(io.BytesIO(data))
+        splitter = ImageSplitterDecorator(
+            image,
+            options["rows"],
+            options["columns"],
+            left=options["left"],
+            right=options["right"],
+            bottom=options["bottom"],
+            top=options["top"],
+            mode=options["mode"],
+            trim=options["trim"]
+        )
+        if options["output"] == "boxes":
+            boxes = splitter.boxes()
+            return {
+                "size": list(image.size),
+                "boxes": boxes.to_json(),
+                "sources": splitter.sources.to_json() if splitter.sources is not None else None,
+            }
+        encoder = ImageEncoder(options["encoder"])
+        stream = io.BytesIO()
+        with zipfile.ZipFile(stream, mode='w', compression=zipfile.ZIP_STORED) as archive:
+            for i, sprite in enumerate(splitter.split()):
+                archive.writestr(f"sprite{i}.{encoder.extension}", encoder.encode(sprite))
+        return stream.getvalue()
+
+    def close(self) -> None:
+        """
+
+        stop the workers once the queued sheets are split.
+
+        :rtype: None
+
+        """
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+
+
+class SplitRequestHandler(BaseHTTPRequestHandler):
+    """
+
+    SplitRequestHandler class, the HTTP routes of the service.
+
+    POST /split?rows=4&columns=4&output=boxes with the sheet as body,
+    GET /metrics for the metrics, GET /health to check the server is up.
+
+    """
+
+    service = None
+    timeout_seconds = 60
+
+    def do_GET(self) -> None:
+        path = urlparse(self.path).path
+        if path == "/metrics":
+            self.send_json(200, self.service.metrics.snapshot(self.service.queue.qsize()))
+        elif path == "/health":
+            self.send_json(200, {"status": "ok"})
+        else:
+            self.send_json(404, {"error": f"unknown path {path}"})
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path != "/split":
+            self.send_json(404, {"error": f"unknown path {url.path}"})
+            return
+        try:
+            options = SplitService.parse_options(dict(parse_qsl(url.query)))
+        except ValueError as error:
+            self.send_json(400, {"error": str(error)})
+            return
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self.send_json(411, {"error": "the Content-Length header is required"})
+            return
+        try:
+            length = int(length)
+            if length < 0:
+                raise ValueError(f"negative length {length}")
+        except ValueError:
+            self.send_json(400, {"error": f"invalid Content-Length {self.headers.get('Content-Length')}"})
+            return
+        data = self.rfile.read(length)
+        if not data:
+            self.send_json(400, {"error": "the sheet is required as request body"})
+            return
+        try:
+            future = self.service.submit(data, options)
+        except queue.Full:
+            self.send_json(503, {"error": "too many requests"}, {"Retry-After": "1"})
+            return
+        try:
+            result = future.result(timeout=self.timeout_seconds)
+        except TimeoutError:
+            self.send_json(504, {"error": "split timed out"})
+            return
+        except Exception as exception:
+            self.send_json(422, {"error": str(exception)})
+            return
+        if isinstance(result, bytes):
+            self.send(200, result, "application/zip")
+        else:
+            self.send_json(200, result)
+
+    def send_json(self, status: int, document, headers=None) -> None:
+        self.send(status, json.dumps(document).encode(), "application/json", headers)
+
+    def send(self, status: int, body: bytes, content_type: str, headers=None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        logger.debug(format % args)
+
+
+class SplitServer(ThreadingHTTPServer):
+    """
+
+    SplitServer class, the HTTP server of a SplitService.
+
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, service: SplitService) -> None:
+        handler = type("Handler", (SplitRequestHandler,), {"service": service})
+        super().__init__(address, handler)
+        self.service = service
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.service.close()
+
+
+class SplitClient:
+    """
+
+    SplitClient class, a small client of the service, for the tools and the tests.
+
+    """
+
+    def __init__(self, url: str, timeout: float = 60) -> None:
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def split(self, sheet, output: str = "boxes", **options):
+        """
+
+        split a sheet on the server.
+
+        :param sheet: sheet filename or encoded sheet
+        :param output: boxes or zip
+        :param options: split options (rows, columns, margins, trim, encoder)
+
+        :return: the boxes as a dict, or the zip as bytes
+        :rtype: dict | bytes
+
+        """
+        if isinstance(sheet, str):
+            with open(sheet, 'rb') as file:
+                sheet = file.read()
+        query = urlencode(dict(options, output=output))
+        request = Request(f"{self.url}/split?{query}", data=sheet, method="POST")
+        with urlopen(request, timeout=self.timeout) as response:
+            body = response.read()
+            if response.headers.get("Content-Type") == "application/json":
+                return json.loads(body)
+            return body
+
+    def metrics(self) -> dict:
+        with urlopen(f"{self.url}/metrics", timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the sprite sheet splitter over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="split worker threads")
+    parser.add_argument("--queue-size", type=int, default=8, help="requests waiting at most")
+    parser.add_argument("--cache-size", type=int, default=32, help="results kept in the cache")
+    args = parser.parse_args(argv)
+
+    Startup.configure_logging()
+    server = SplitServer((args.host, args.port), SplitService(args.workers, args.queue_size, args.cache_size))
+    logger.info(f"serve on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,13 +2,11 @@ from PIL import Image
 import numpy as np
 from deprecated import deprecated
 from ImageMask import Mask
+from ImageBoxes import BoxSet
+from ImageCrop import SpriteCropper
 import logging
 
 
-logging.basicConfig(filename="window.log",
-                    format='[%(levelname)s] %(message)s',
-                    filemode='w')
-
 logger = logging.getLogger('splitter')
 logger.setLevel(logging.DEBUG)
 
@@ -24,6 +22,7 @@ class ImageSplitterDecorator:
     it's impossible to split an image if there's no row or if there's no column.
 
     """
+
     def __init__(self,
                  decore: Image,
                  rows: int,
@@ -31,11 +30,20 @@ class ImageSplitterDecorator:
                  left: int = 0,
                  right: int = 0,
                  bottom: int = 0,
-                 top: int = 0) -> None:
+                 top: int = 0,
+                 mode: str = "auto",
+                 trim: bool = False,
+                 workers: int = 1,
+                 low_memory: bool = False,
+                 backend: str = None,
+                 regions=None) -> None:
         """
 
         ImageSplitterDecorator's constructor, init rows, columns but also the margins
         and the decore element (PIL Image), raise exception if 0 in (rows, columns).
+        If trim is True, the empty border of each sprite is removed, the boxes
+        before trimming are kept in the sources attribute and the trimmed ones
+        in the trimmed attribute.
 
         :param decore: Image to split
         :param rows: row count, cannot be 0
@@ -44,6 +52,12 @@ class ImageSplitterDecorator:
         :param right: right margin, 0 by default
         :param bottom: bottom margin, 0 by default
         :param top: top margin, 0 by default
+        :param mode: auto finds the sprites in the mask, grid cuts rows x columns cells after the margins
+        :param trim: trim each sprite to its content, False by default
+        :param workers: workers labelling the mask, 1 (serial) by default
+        :param low_memory: build the mask strip by strip, False by default
+        :param backend: labelling backend (serial, tiles, numba), chosen from workers by default
+        :param regions: only split these regions as (left, top, right, bottom), all the image by default
 
         :type decore: Image
         :type rows: int
@@ -52,6 +66,12 @@ class ImageSplitterDecorator:
         :type right: int = 0
         :type bottom: int = 0
         :type top: int = 0
+        :type mode: str = "auto"
+        :type trim: bool = False
+        :type workers: int = 1
+        :type low_memory: bool = False
+        :type backend: str = None
+        :type regions: list[tuple[int, int, int, int]] = None
 
         :rtype: None
 
@@ -67,24 +87,43 @@ class ImageSplitterDecorator:
         self.right = right
         self.top = top
         self.bottom = bottom
-        self.strategy = SplitterAutoStrategy(self.rows, self.columns)
+        self.mode = mode
+        self.trim = trim
+        self.regions = regions
+        self.sources = None
+        self.trimmed = None
+        self.strategy = self.choose_strategy(workers, low_memory, backend)
         logger.info("init a splitter ends correctly")
 
-    def choose_strategy(self) -> object:
+    def choose_strategy(self, workers: int = 1, low_memory: bool = False, backend: str = None) -> object:
         """
 
-        Choose a strategy thanks to margin parameters.
+        Choose a strategy thanks to the mode, with SplitOptions.strategy.
 
-        If all margins are equal to 0, then we choose SplitterAutoStrategy,
-        otherwise the SplitterStrategy is chosen to do the same task.
+        In grid mode, the SplitterStrategy cuts the image after the margins,
+        otherwise the SplitterAutoStrategy finds the sprites in the mask.
+        Raise ValueError if the mode is unknown.
+
+        :rtype: SplitterStrategy
 
         """
-        logger.info("choose a strategy")
-        if not (self.left == self.right == self.top == self.bottom == 0):
-            logger.info("auto cut strategy")
-            return SplitterStrategy(self.rows, self.columns, self.left, self.right, self.top, self.bottom)
-        logger.info("manual cut strategy")
-        return SplitterAutoStrategy(self.rows, self.columns)
+        from SpriteSheet import SplitOptions
+
+        logger.info("choose a " + self.mode + " strategy")
+        return SplitOptions(
+            self.rows,
+            self.columns,
+            self.left,
+            self.right,
+            self.top,
+            self.bottom,
+            self.mode,
+            self.trim,
+            workers,
+            low_memory,
+            backend,
+            self.regions
+        ).strategy()
 
     def split(self):
         """
@@ -100,10 +139,43 @@ class ImageSplitterDecorator:
 
         """
         logger.info("split the image")
-        split = self.strategy.split(self.decore)
+        if self.trim or self.regions:
+            split = SpriteCropper(self.decore).crop_all(self.boxes())
+        else:
+            split = self.strategy.split(self.decore)
         logger.info("end of split")
         return split
 
+    def boxes(self):
+        """
+
+        get the boxes of the sprites without cropping them.
+
+        If trim is set, the boxes are trimmed to the content of each sprite,
+        the boxes before trimming are stored in the sources attribute and the
+        trimmed ones in the trimmed attribute. If regions are set, only the
+        sprites of the regions are found.
+
+        :return: all boxes as (left, top, right, bottom)
+        :rtype: BoxSet
+
+        """
+        logger.info("find the boxes of the image")
+        if self.regions:
+            boxes, sources = self.strategy.region_boxes(self.decore, self.regions, self.trim)
+            if self.trim:
+                self.sources, self.trimmed = sources, boxes
+        else:
+            boxes = self.strategy.boxes(self.decore)
+            if self.trim:
+                self.sources = boxes
+                mask = getattr(self.strategy, "mask", None)
+                boxes = self.trimmed = self.strategy.trim(
+                    self.decore, boxes, mask.mask_array if mask is not None else None
+                )
+        logger.info("end of find boxes")
+        return boxes
+
     @deprecated(
         version="2.0.0",
         reason="not useless anymore since we use flet instead of tkinter"
@@ -190,33 +262,187 @@ class SplitterStrategy:
             array = array[:len(array) - self.bottom]
         return array
 
+    def boxes(self, image):
+        """
+
+        get the boxes of the grid cells, resized by margin.
+
+        Only the image size is read, so the image is never decoded.
+
+        :return: all boxes as (left, top, right, bottom)
+        :rtype: BoxSet
+
+        """
+        return self.grid_boxes(image.size)
+
+    def grid_boxes(self, size):
+        """
+
+        get the boxes of the grid cells of an image of this size, resized by margin.
+
+        :param size: image width and height
+        :type size: tuple[int, int]
+
+        :return: all boxes as (left, top, right, bottom)
+        :rtype: BoxSet
+
+        """
+        width, height = size
+        width -= self.left + self.right
+        height -= self.top + self.bottom
+        row_size = int(height / self.rows)
+        col_size = (width / self.columns)
+        rows = self.top + np.arange(self.rows + 1) * row_size
+        columns = self.left + (np.arange(self.columns + 1) * col_size).astype(np.int64)
+        row_start, col_start = np.meshgrid(rows[:-1], columns[:-1], indexing="ij")
+        row_end, col_end = np.meshgrid(rows[1:], columns[1:], indexing="ij")
+        return BoxSet(np.stack([col_start, row_start, col_end, row_end], axis=-1))
+
+    def build_mask(self, image, bg=None):
+        """
+
+        build the mask the boxes are found in, the grid doesn't need any.
+
+        :return: the mask, None for the grid
+        :rtype: Mask | None
+
+        """
+        return None
+
+    def label(self, image):
+        """
+
+        find the boxes once build_mask was called, the grid cells only need the image size.
+
+        :return: all boxes as (left, top, right, bottom)
+        :rtype: BoxSet
+
+        """
+        return self.boxes(image)
+
+    def trim(self, image, boxes, mask=None, bg=None):
+        """
+
+        trim each box to the content of the sprite it contains.
+
+        The mask of the image is built once strip by strip, unless it is given,
+        then the content of each box is found with content_box. A box without content
+        is kept as is.
+
+        :param image: image split
+        :param boxes: boxes to trim as (left, top, right, bottom)
+        :param mask: mask of the image, built from the image if None
+        :param bg: background of the mask built, the first pixel of the image if None
+        :type boxes: BoxSet
+        :type mask: np.ndarray
+
+        :return: the trimmed boxes, in the same order
+        :rtype: BoxSet
+
+        """
+        logger.info("start trim boxes")
+        if mask is None:
+            # the striped mask is a uint8 array, without the Python lists of the standard mask
+            mask = Mask(image, low_memory=True, bg=bg).mask_array
+        trimmed = np.array(boxes, dtype=np.int32, copy=True)
+        for i, (left, top, right, bottom) in enumerate(boxes):
+            content = SplitterStrategy.content_box(mask[top:bottom, left:right])
+            if content is not None:
+                trimmed[i] = (
+                    left + content[0],
+                    top + content[1],
+                    left + content[2],
+                    top + content[3]
+                )
+        logger.info("end trim boxes")
+        return BoxSet(trimmed)
+
+    @staticmethod
+    def content_box(mask):
+        """
+
+        find the smallest box containing all the sprite pixels of the mask.
+
+        The rows and the columns containing a sprite pixel are found at
+        once with any, instead of checking each line one after another.
+
+        :param mask: mask of a sprite, 1 for sprite pixels
+        :type mask: np.ndarray
+
+        :return: the box as (left, top, right, bottom), None if the mask is empty
+        :rtype: tuple[int, int, int, int] | None
+
+        """
+        rows = np.flatnonzero(mask.any(axis=1))
+        if not len(rows):
+            return None
+        columns = np.flatnonzero(mask.any(axis=0))
+        return int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1
+
+    def region_boxes(self, image, regions, trim: bool = False):
+        """
+
+        get the boxes of the sprites of some regions of the image only.
+
+        Each region is cropped from the image, then its boxes are found (and
+        trimmed) in the region alone, so the mask and the labelling cost
+        scale with the regions, not with the image. The background is read
+        once from the first pixel of the image, so a region starting on a
+        sprite still masks the sprite. The boxes are moved back to the image
+        coordinates, region after region.
+
+        :param image: image split
+        :param regions: regions as (left, top, right, bottom), right and bottom excluded
+        :param trim: trim each box to the content of its sprite
+
+        :type regions: list[tuple[int, int, int, int]]
+        :type trim: bool
+
+        :return: the boxes, and the boxes before trimming (None without trim)
+        :rtype: tuple[BoxSet, BoxSet | None]
+
+        """
+        boxes, sources = [], []
+        bg = image.getpixel((0, 0))
+        for region in regions:
+            left, top, right, bottom = SplitterStrategy.check_region(image.size, region)
+            part = image.crop((left, top, right, bottom))
+            mask = self.build_mask(part, bg)
+            found = self.label(part)
+            if trim:
+                sources.append(found.translate(left, top))
+                found = self.trim(part, found, mask.mask_array if mask is not None else None, bg)
+            boxes.append(found.translate(left, top))
+        return BoxSet.concatenate(boxes), BoxSet.concatenate(sources) if trim else None
+
+    @staticmethod
+    def check_region(size, region):
+        """
+
+        check a region is a non empty box inside an image of this size, raise ValueError if not.
+
+        :rtype: tuple[int, int, int, int]
+
+        """
+        left, top, right, bottom = (int(value) for value in region)
+        if not (0 <= left < right <= size[0] and 0 <= top < bottom <= size[1]):
+            raise ValueError(f"region {(left, top, right, bottom)} is empty or outside the image {size}")
+        return left, top, right, bottom
+
     def split(self, image: ImageSplitterDecorator):
         """
 
-        get the current image as array, resized by margin and split it.
+        get the current image, resized by margin and split it.
 
-        To split the image, the row size and column size is calculated.
-        from these results, it's possible to split image, row by row and
-        column by column, split is stored as image in a List returned.
+        The boxes of the grid cells are computed from the image size, then
+        each cell is cropped from the decoded image, the mode and the palette
+        of the image are kept by the sprites.
 
         :return: all images stored in a list
         :rtype: list[PIL.Image]
 
         """
-        array = self.resize(image)
-        row_size = int(len(array) / self.rows)
-        col_size = (len(array[0]) / self.columns)
-        pictures = []
-        for i in range(self.rows):
-            row_start = int(i * row_size)
-            row_end = int((i + 1) * row_size)
-            picture = array[row_start:row_end]
-            for j in range(self.columns):
-                col_start = int(col_size * j)
-                col_end = int(col_size * (j + 1))
-                pic = np.array([L[col_start:col_end] for L in picture])
-                pictures.append(Image.fromarray(pic))
-        return pictures
+        return SpriteCropper(image).crop_all(self.boxes(image))
 
 
 class SplitterAutoStrategy(SplitterStrategy):
@@ -227,7 +453,12 @@ class SplitterAutoStrategy(SplitterStrategy):
     SplitterStrategy class doesn't need all margin asked before.
 
     """
-    def __init__(self, rows: int, columns: int) -> None:
+    def __init__(self,
+                 rows: int,
+                 columns: int,
+                 workers: int = 1,
+                 low_memory: bool = False,
+                 backend: str = None) -> None:
         """
 
         SplitterStrategy class' constructor,
@@ -235,12 +466,22 @@ class SplitterAutoStrategy(SplitterStrategy):
 
         :param rows: row count
         :param columns: column count
+        :param workers: workers labelling the mask, 1 for the serial search
+        :param low_memory: build the mask strip by strip, for the sheets too large for the memory
+        :param backend: labelling backend of Mask.find_sprite_boxes, chosen from workers if None
 
         :type rows: int
         :type columns: int
+        :type workers: int
+        :type low_memory: bool
+        :type backend: str
         """
         logger.info("init super auto")
         super().__init__(rows, columns)
+        self.workers = workers
+        self.low_memory = low_memory
+        self.backend = backend
+        self.mask = None
         logger.info("end of init super auto")
 
     def split(self, img):
@@ -252,21 +493,47 @@ class SplitterAutoStrategy(SplitterStrategy):
         :rtype: list[Image]
         :return: the lists of sprites
         """
-        contours = Mask(img).find_sprite_contours()
-        sprites = []
-        for contour in contours:
-            top_row, bottom_row, left_col, right_col = contour
-            sprite = img.crop(
-                (
-                    left_col,
-                    top_row,
-                    right_col + 1,
-                    bottom_row + 1
-                )
-            )
-            sprites.append(sprite)
+        return SpriteCropper(img).crop_all(self.boxes(img))
+
+    def boxes(self, img):
+        """
+        Take the mask of the spritesheet and get
+        the box of each sprite found in this mask.
+
+        The mask is kept in the mask attribute, so the
+        background and the mask can be reused after.
 
-        return sprites
+        :param img: image to split
+        :rtype: BoxSet
+        :return: all boxes as (left, top, right, bottom)
+        """
+        self.build_mask(img)
+        return self.label(img)
+
+    def build_mask(self, img, bg=None):
+        """
+        Build the mask of the spritesheet and keep it in the mask attribute.
+
+        :param img: image to split
+        :param bg: background color, the first pixel of img if None
+        :rtype: Mask
+        :return: the mask
+        """
+        self.mask = Mask(img, self.low_memory, bg=bg)
+        return self.mask
+
+    def label(self, img):
+        """
+        Get the box of each sprite found in the mask, the mask
+        is built first if it isn't the mask of this image.
+
+        :param img: image to split
+        :rtype: BoxSet
+        :return: all boxes as (left, top, right, bottom)
+        """
+        if self.mask is None or self.mask.image is not img:
+            self.build_mask(img)
+        return self.mask.find_sprite_boxes(workers=self.workers, backend=self.backend)
 
     @staticmethod
     def cut(image):
@@ -0,0 +1,167 @@
+from PIL import Image
+from ImageAnimation import ImageAnimation
+import numpy as np
+import json
+import math
+import os
+import logging
+
+
+logger = logging.getLogger('uniform')
+logger.setLevel(logging.DEBUG)
+
+
+class UniformSheet:
+    """
+
+    UniformSheet class, lays out irregular sprites on a grid of equal cells.
+
+    The cell size is the largest sprite size, each sprite is placed in its
+    cell at the anchor, or at its trim offset, exactly as the frames of an
+    ImageAnimation. The sheet is one array allocated once, the sprites are
+    copied in it one after another, then it is encoded once, with a JSON file
+    describing each cell.
+
+    """
+
+    MODES = ("L", "LA", "RGB", "RGBA")
+    OPAQUE_FORMATS = ("JPEG",)
+
+    def __init__(self, sprites, columns: int = None, anchor: str = "bottom", offsets=None, size=None) -> None:
+        """
+
+        UniformSheet's constructor.
+
+        :param sprites: sprites to lay out, in the order of the cells
+        :param columns: cells per row, a square grid if None
+        :param anchor: position of the sprites in the cells, a key of ImageAnimation.ANCHORS
+        :param offsets: position of each sprite in its cell, replaces the anchor
+        :param size: cell size, the largest sprite size (or the bounds of the offsets) by default
+
+        :type sprites: list[Image]
+        :type columns: int | None
+        :type anchor: str
+        :type offsets: list[tuple[int, int]] | None
+        :type size: tuple[int, int] | None
+
+        :rtype: None
+
+        """
+        self.layout = ImageAnimation(sprites, anchor, offsets, size)
+        self.sprites = self.layout.sprites
+        self.columns = columns if columns else math.ceil(math.sqrt(len(self.sprites)))
+        if self.columns < 1:
+            raise ValueError(f"columns must be at least 1, columns={self.columns}")
+        self.rows = math.ceil(len(self.sprites) / self.columns)
+        self.cell = self.layout.size
+
+    def mode(self) -> str:
+        """
+
+        get the mode of the sheet, the mode of the sprites if they all share
+        one of MODES, else RGBA.
+
+        :rtype: str
+
+        """
+        modes = {sprite.mode for sprite in self.sprites}
+        if len(modes) == 1 and next(iter(modes)) in UniformSheet.MODES:
+            return modes.pop()
+        return "RGBA"
+
+    def position(self, index: int):
+        """
+
+        get the top left corner of the sprite at index in the sheet.
+
+        :rtype: tuple[int, int]
+
+        """
+        row, column = divmod(index, self.columns)
+        x, y = self.layout.position(index)
+        return column * self.cell[0] + x, row * self.cell[1] + y
+
+    def build(self) -> Image:
+        """
+
+        copy all the sprites in their cell of one preallocated array.
+
+        :return: the normalized sheet
+        :rtype: Image
+
+        """
+        mode = self.mode()
+        bands = len(Image.new(mode, (1, 1)).getbands())
+        width, height = self.columns * self.cell[0], self.rows * self.cell[1]
+        logger.info(f"lay out {len(self.sprites)} sprites in {self.columns}x{self.rows} cells of {self.cell}")
+        sheet = np.zeros((height, width, bands) if bands > 1 else (height, width), dtype=np.uint8)
+        for i, sprite in enumerate(self.sprites):
+            x, y = self.position(i)
+            sheet[y:y + sprite.height, x:x + sprite.width] = np.asarray(
+                sprite if sprite.mode == mode else sprite.convert(mode)
+            )
+        return Image.fromarray(sheet)
+
+    def metadata(self, name: str, type_img: str) -> dict:
+        """
+
+        get the cell metadata: the grid, and for each sprite its cell,
+        its box in the sheet and its offset in its cell.
+
+        :rtype: dict
+
+        """
+        frames = []
+        for i, sprite in enumerate(self.sprites):
+            x, y = self.position(i)
+            row, column = divmod(i, self.columns)
+            frames.append({
+                "index": i,
+                "cell": {"column": column, "row": row},
+                "frame": {"x": x, "y": y, "w": sprite.width, "h": sprite.height},
+                "offset": {"x": x - column * self.cell[0], "y": y - row * self.cell[1]},
+            })
+        return {
+            "image": name + '.' + type_img,
+            "cell": {"w": self.cell[0], "h": self.cell[1]},
+            "columns": self.columns,
+            "rows": self.rows,
+            "anchor": self.layout.anchor if self.layout.offsets is None else "offsets",
+            "frames": frames,
+        }
+
+    def save(self, path: str, name: str, type_img: str = "png") -> str:
+        """
+
+        write the normalized sheet as <name>.<type_img> and its cells as <name>cells.json,
+        without its alpha channel if the format has none (JPEG).
+
+        :return: the sheet filename
+        :rtype: str
+
+        """
+        os.makedirs(path, exist_ok=True)
+        filename = os.path.join(path, name + '.' + type_img)
+        sheet = self.build()
+        if Image.registered_extensions().get('.' + type_img.lower()) in UniformSheet.OPAQUE_FORMATS \
+                and sheet.mode in ("LA", "RGBA"):
+            # the format has no alpha, the empty cells stay black
+            sheet = sheet.convert(sheet.mode[:-1])
+        sheet.save(filename)
+        with open(os.path.join(path, name + 'cells.json'), 'w') as file:
+            json.dump(self.metadata(name, type_img), file, indent=4)
+        logger.info("uniform sheet " + filename + " saved successfully.")
+        return filename
+
+    @staticmethod
+    def from_result(result, columns: int = None, anchor: str = "bottom"):
+        """
+
+        construct a uniform sheet from all the sprites of a SplitResult,
+        trimmed sprites are placed at their offset in their source box.
+
+        :rtype: UniformSheet
+
+        """
+        layout = ImageAnimation.from_result(result, None, anchor)
+        return UniformSheet(layout.sprites, columns, anchor, layout.offsets, layout.size)
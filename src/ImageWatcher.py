@@ -0,0 +1,276 @@
+from Debounce import Debouncer
+from SpriteSheet import SplitOptions
+from ImageManifest import ImageManifest
+from ImageArchive import ImageArchive
+import hashlib
+import io
+import os
+import threading
+import logging
+
+
+logger = logging.getLogger('watcher')
+logger.setLevel(logging.DEBUG)
+
+
+class SheetWatcher:
+    """
+
+    SheetWatcher class, re-splits the sheets of a directory when they change.
+
+    The directory is polled every interval: a sheet whose modification time
+    or size changed restarts its Debouncer, so a burst of writes re-splits it
+    only once. Then the sheet is split again only if the hash of its content
+    changed, and the boxes are reused from the cache if the sheet already had
+    this content. The sprites of a sheet are written in place, in the
+    directory named as the sheet in the output directory, and the sprites
+    left from a previous split with more sprites are removed. The output can
+    also be a manifest or an archive, as in the command line.
+
+    """
+
+    EXTENSIONS = (".png", ".gif", ".bmp", ".jpg", ".jpeg", ".webp", ".tga", ".tif", ".tiff", ".qoi")
+    CACHE_SIZE = 64
+
+    def __init__(self,
+                 directory: str,
+                 output_dir: str,
+                 options: SplitOptions = None,
+                 encoder: str = None,
+                 interval: float = 0.5,
+                 delay: float = 0.3,
+                 dedup: str = None,
+                 output: str = "sprites") -> None:
+        """
+
+        SheetWatcher's constructor.
+
+        :param directory: directory of the sheets, or one sheet
+        :param output_dir: directory of the outputs, one sub directory per sheet
+        :param options: split options, SplitOptions() by default
+        :param encoder: ImageEncoder preset, the sheet type by default
+        :param interval: seconds between two polls
+        :param delay: seconds without write before a sheet is split
+        :param dedup: ImageDeduplicator strategy name, None or "none" to keep all the sprites
+        :param output: sprites, a manifest (ImageManifest.STRATEGIES) or an archive (ImageArchive.STRATEGIES)
+
+        :rtype: None
+
+        """
+        if output != "sprites" and output not in ImageManifest.STRATEGIES and output not in ImageArchive.STRATEGIES:
+            raise ValueError(f"unknown output {output}")
+        self.directory = directory
+        self.output_dir = output_dir
+        self.options = options if options is not None else SplitOptions()
+        self.encoder = encoder
+        self.interval = interval
+        self.delay = delay
+        self.dedup = dedup
+        self.output_type = output
+        self.stats = {}
+        self.hashes = {}
+        self.counts = {}
+        self.cache = {}
+        self.debouncers = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def sheets(self):
+        """
+
+        get the sheets to watch.
+
+        :rtype: list[str]
+
+        """
+        if os.path.isfile(self.directory):
+            return [self.directory]
+        return sorted(
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.lower().endswith(SheetWatcher.EXTENSIONS)
+        )
+
+    def scan(self):
+        """
+
+        poll the sheets once, and restart the debouncer of each changed sheet.
+
+        :return: the changed sheets
+        :rtype: list[str]
+
+        """
+        changed = []
+        sheets = self.sheets()
+        for path in sheets:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self.stats.get(path) != signature:
+                self.stats[path] = signature
+                changed.append(path)
+                if path not in self.debouncers:
+                    self.debouncers[path] = Debouncer(lambda path=path: self.resplit(path), self.delay)
+                self.debouncers[path]()
+        for path in set(self.stats) - set(sheets):
+            logger.info(f"stop watching {path}")
+            self.forget(path)
+        return changed
+
+    def forget(self, path: str) -> None:
+        """
+
+        stop watching a sheet and drop everything kept about it: its pending
+        split, its signature, its hash, its sprite count and its cached boxes,
+        unless another sheet has the same content.
+
+        :rtype: None
+
+        """
+        debouncer = self.debouncers.pop(path, None)
+        if debouncer is not None:
+            debouncer.cancel()
+        with self.lock:
+            self.stats.pop(path, None)
+            self.counts.pop(path, None)
+            digest = self.hashes.pop(path, None)
+            if digest is not None and digest not in self.hashes.values():
+                self.cache.pop(digest, None)
+
+    def resplit(self, path: str) -> bool:
+        """
+
+        split the sheet again if its content changed, and update its outputs.
+
+        :return: True if the outputs were updated
+        :rtype: bool
+
+        """
+        import PIL.Image
+
+        with self.lock:
+            try:
+                with open(path, 'rb') as file:
+                    data = file.read()
+            except FileNotFoundError:
+                return False
+            digest = hashlib.sha1(data).hexdigest()
+            if self.hashes.get(path) == digest:
+                logger.info(f"{path} content unchanged, skip")
+                return False
+            try:
+                image = PIL.Image.open(io.BytesIO(data))
+                boxes, sources = self.boxes(image, digest)
+                self.write(path, image, boxes, sources)
+            except Exception:
+                logger.exception(f"split of {path} failed, wait for the next change")
+                return False
+            self.hashes[path] = digest
+            return True
+
+    def boxes(self, image, digest: str):
+        """
+
+        get the boxes of the sheet, from the cache if the content was already split.
+
+        :return: the boxes and the boxes before trimming
+        :rtype: tuple[BoxSet, BoxSet | None]
+
+        """
+        from SpriteSheet import split_sheet
+
+        if digest in self.cache:
+            logger.info(f"reuse the boxes of {digest}")
+            return self.cache[digest]
+        result = split_sheet(image, self.options)
+        logger.info(f"split in {result.stats['total']:.4f}s")
+        if len(self.cache) >= SheetWatcher.CACHE_SIZE:
+            self.cache.pop(next(iter(self.cache)))
+        self.cache[digest] = (result.boxes, result.sources)
+        return self.cache[digest]
+
+    def output(self, path: str) -> str:
+        """
+
+        get the output directory of a sheet.
+
+        :rtype: str
+
+        """
+        return os.path.join(self.output_dir, os.path.splitext(os.path.basename(path))[0])
+
+    def write(self, path: str, image, boxes, sources) -> None:
+        """
+
+        write the outputs of the sheet in place, and remove the stale sprites.
+
+        A manifest output only writes the boxes, an archive output rewrites
+        the archive, the sprites output writes the (unique) sprites and
+        removes the ones left from a previous split with more sprites.
+
+        :rtype: None
+
+        """
+        from ImageCrop import SpriteCropper
+        from ImageSaveComposite import ImageSaveComposite
+        from ImageEncoder import ImageEncoder
+        from ImageDeduplicate import ImageDeduplicator
+
+        output = self.output(path)
+        os.makedirs(output, exist_ok=True)
+        name = os.path.splitext(os.path.basename(path))[0]
+        img_type = path.split('.')[-1]
+        if self.output_type in ImageManifest.STRATEGIES:
+            ImageManifest(os.path.basename(path), image.size, boxes, name, img_type, sources).save(
+                output, ImageManifest.STRATEGIES[self.output_type]()
+            )
+            logger.info(f"{len(boxes)} boxes of {path} written in {output}")
+            return
+        composite = ImageSaveComposite.from_images_to_composite(
+            SpriteCropper(image).crop_all(boxes),
+            output,
+            name,
+            img_type
+        )
+        composite.deduplicator = ImageDeduplicator.from_name(self.dedup)
+        if self.encoder is not None:
+            composite.encoder = ImageEncoder(self.encoder)
+        if self.output_type in ImageArchive.STRATEGIES:
+            composite.save_archive(self.output_type)
+        else:
+            frames = None
+            if composite.deduplicator is not None:
+                composite.images, frames = composite.deduplicator.deduplicate(composite.images)
+                composite.deduplicator = None
+            composite.save()
+            if frames is not None:
+                composite.save_mapping(frames)
+            for i in range(len(composite.images), self.counts.get(path, 0)):
+                stale = os.path.join(output, composite.filename(i))
+                if os.path.exists(stale):
+                    os.remove(stale)
+            self.counts[path] = len(composite.images)
+        if sources is not None:
+            ImageManifest(os.path.basename(path), image.size, boxes, name, composite.extension(), sources).save(output)
+        logger.info(f"{len(boxes)} sprites of {path} written in {output}")
+
+    def run(self) -> None:
+        """
+
+        poll the sheets until stop is called.
+
+        :rtype: None
+
+        """
+        logger.info(f"watch {self.directory} every {self.interval}s")
+        while not self.stopped.is_set():
+            self.scan()
+            self.stopped.wait(self.interval)
+        for debouncer in self.debouncers.values():
+            debouncer.cancel()
+        logger.info(f"stop watching {self.directory}")
+
+    def stop(self) -> None:
+        self.stopped.set()
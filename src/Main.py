@@ -1,8 +1,19 @@
-import Window
-import flet as ft
+import sys
+import Startup
+
+
+def main(page):
+    import Window
+    Window.main(page)
+
 
 if __name__ == '__main__':
-    ft.app(
-        target=Window.main,
-        assets_dir="assets"
-    )
+    if "--import-time" in sys.argv:
+        Startup.print_import_report(Startup.APP_MODULES)
+    else:
+        import flet as ft
+        Startup.configure_logging()
+        ft.app(
+            target=main,
+            assets_dir="assets"
+        )
@@ -0,0 +1,260 @@
+from PIL import Image, ImageSequence
+from ImageSplitter import SplitterStrategy, SplitterAutoStrategy
+from ImageCrop import SpriteCropper
+from ImageProfiler import StageProfiler
+import os
+import time
+import logging
+
+
+logger = logging.getLogger('sprite sheet')
+logger.setLevel(logging.DEBUG)
+
+
+class SplitOptions:
+    """
+
+    SplitOptions class, the settings of a split, without any UI.
+
+    The mode chooses the strategy: auto finds the sprites in the mask of the
+    sheet, grid cuts the sheet in rows x columns cells after the margins.
+
+    """
+
+    MODES = ("auto", "grid")
+
+    def __init__(self,
+                 rows: int = 1,
+                 columns: int = 1,
+                 left: int = 0,
+                 right: int = 0,
+                 top: int = 0,
+                 bottom: int = 0,
+                 mode: str = "auto",
+                 trim: bool = False,
+                 workers: int = 1,
+                 low_memory: bool = False,
+                 backend: str = None,
+                 regions=None) -> None:
+        """
+
+        SplitOptions' constructor, raise ValueError if an option isn't valid.
+
+        :param rows: row count, cannot be 0
+        :param columns: column count, cannot be 0
+        :param left: left margin, grid mode only
+        :param right: right margin, grid mode only
+        :param top: top margin, grid mode only
+        :param bottom: bottom margin, grid mode only
+        :param mode: auto or grid
+        :param trim: trim each sprite to its content
+        :param workers: workers labelling the mask, 1 for the serial search, None for the CPU count
+        :param low_memory: build the mask strip by strip, auto mode only
+        :param backend: labelling backend (serial, tiles, numba), auto mode only, chosen from workers if None
+        :param regions: only split these regions as (left, top, right, bottom), all the sheet if None
+
+        :rtype: None
+
+        """
+        if rows < 1 or columns < 1:
+            raise ValueError(f"row or column must be at least 1, (row, col)=({rows}, {columns})")
+        if mode not in SplitOptions.MODES:
+            raise ValueError(f"unknown mode {mode}, expected one of {SplitOptions.MODES}")
+        self.rows = rows
+        self.columns = columns
+        self.left = left
+        self.right = right
+        self.top = top
+        self.bottom = bottom
+        self.mode = mode
+        self.trim = trim
+        self.workers = workers
+        self.low_memory = low_memory
+        self.backend = backend
+        self.regions = [tuple(region) for region in regions] if regions else None
+
+    def strategy(self) -> SplitterStrategy:
+        """
+
+        get the splitter strategy of the mode.
+
+        :rtype: SplitterStrategy
+
+        """
+        if self.mode == "grid":
+            return SplitterStrategy(self.rows, self.columns, self.left, self.right, self.top, self.bottom)
+        return SplitterAutoStrategy(self.rows, self.columns, self.workers, self.low_memory, self.backend)
+
+
+class LazySprites:
+    """
+
+    LazySprites class, a sequence of sprites cropped only when they are read.
+
+    """
+
+    def __init__(self, image: Image, boxes) -> None:
+        self.image = image
+        self.boxes = boxes
+        self.cropper = None
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def __getitem__(self, index: int) -> Image:
+        if self.cropper is None:
+            self.cropper = SpriteCropper(self.image)
+        return self.cropper.crop(self.boxes[index])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class SplitResult:
+    """
+
+    SplitResult class, everything a split found about a sheet.
+
+    boxes are the boxes of the sprites as a BoxSet, sources the boxes before
+    trimming (None without trim), sprites the sprites cropped lazily, and
+    stats the time spent in each stage, in seconds.
+
+    """
+
+    def __init__(self, image: Image, boxes, sources=None, background=None, stats=None) -> None:
+        self.image = image
+        self.boxes = boxes
+        self.sources = sources
+        self._background = tuple(background) if isinstance(background, list) else background
+        self.stats = stats if stats is not None else {}
+        self.sprites = LazySprites(image, boxes)
+
+    @property
+    def size(self):
+        return self.image.size
+
+    @property
+    def background(self):
+        """
+
+        get the background color of the sheet, as a tuple for color sheets
+        and as an index for indexed ones. It comes from the mask in auto mode,
+        else it is read from the first pixel of the sheet.
+
+        """
+        if self._background is None:
+            self._background = self.image.getpixel((0, 0))
+        return self._background
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+
+def split_sheet(source, options: SplitOptions = None, profiler: StageProfiler = None, **kwargs) -> SplitResult:
+    """
+
+    split a sprite sheet, without any UI.
+
+    :param source: sheet filename or PIL image
+    :param options: split options, built from kwargs if None
+    :param profiler: profiles the open, decode, mask, label (or regions) and trim stages if enabled
+    :param kwargs: SplitOptions arguments, used if options is None
+
+    :type source: str | os.PathLike | Image
+    :type options: SplitOptions
+    :type profiler: StageProfiler | None
+
+    :return: the boxes, the lazy sprites, the background and the timing stats
+    :rtype: SplitResult
+
+    """
+    options = options if options is not None else SplitOptions(**kwargs)
+    profiler = profiler if profiler is not None else StageProfiler(enabled=False)
+    logger.info("start split sheet")
+    stats = {}
+    start = time.perf_counter()
+    with profiler.stage("open"):
+        image = Image.open(source) if isinstance(source, (str, os.PathLike)) else source
+    with profiler.stage("decode"):
+        image.load()
+    stats["open"] = time.perf_counter() - start
+
+    strategy = options.strategy()
+    step = time.perf_counter()
+    sources = None
+    if options.regions:
+        # each region builds its own mask then labels it, so they share one stage
+        with profiler.stage("regions"):
+            boxes, sources = strategy.region_boxes(image, options.regions, options.trim)
+    else:
+        with profiler.stage("mask"):
+            strategy.build_mask(image)
+        stats["mask"] = time.perf_counter() - step
+        with profiler.stage("label"):
+            boxes = strategy.label(image)
+        stats["label"] = time.perf_counter() - step - stats["mask"]
+    stats["boxes"] = time.perf_counter() - step
+
+    mask = getattr(strategy, "mask", None)
+    if options.trim and not options.regions:
+        step = time.perf_counter()
+        sources = boxes
+        with profiler.stage("trim"):
+            boxes = strategy.trim(image, boxes, mask.mask_array if mask is not None else None)
+        stats["trim"] = time.perf_counter() - step
+    stats["total"] = time.perf_counter() - start
+
+    logger.info(f"end split sheet, {len(boxes)} sprites in {stats['total']:.4f}s")
+    return SplitResult(
+        image,
+        boxes,
+        sources,
+        mask.bg if mask is not None else None,
+        stats
+    )
+
+
+def iter_frames(source):
+    """
+
+    iterate over the frames of a sheet lazily, GIF, APNG and multi-page TIFF
+    have many, the other formats only one.
+
+    Only the current frame is decoded: each frame is copied from the file
+    when it is reached, so the frames already read can be freed. A file
+    opened from a filename is closed once the frames are read, or when
+    the iterator is closed.
+
+    :param source: sheet filename or PIL image
+    :type source: str | os.PathLike | Image
+
+    :rtype: Iterator[Image]
+
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with Image.open(source) as image:
+            yield from iter_frames(image)
+        return
+    for frame in ImageSequence.Iterator(source):
+        yield frame.copy()
+
+
+def split_frames(source, options: SplitOptions = None, profiler: StageProfiler = None, **kwargs):
+    """
+
+    split each frame of a sheet, one frame after another.
+
+    :param source: sheet filename or PIL image
+    :param options: split options, built from kwargs if None
+    :param profiler: profiles the stages of every frame if enabled
+    :param kwargs: SplitOptions arguments, used if options is None
+
+    :return: the frame index and its split result, for each frame
+    :rtype: Iterator[tuple[int, SplitResult]]
+
+    """
+    options = options if options is not None else SplitOptions(**kwargs)
+    for index, frame in enumerate(iter_frames(source)):
+        logger.info(f"split frame {index}")
+        yield index, split_sheet(frame, options, profiler)
@@ -0,0 +1,118 @@
+import logging
+import os
+import sys
+
+
+# modules loaded before the window or the command line is ready
+APP_MODULES = ["flet", "Window"]
+CLI_MODULES = ["argparse", "Cli"]
+
+# heavy modules only loaded when an image is split or saved
+DEFERRED_MODULES = [
+    "numpy",
+    "PIL.Image",
+    "ImageBoxes",
+    "ImageMask",
+    "ImageLabel",
+    "ImageCrop",
+    "ImageSplitter",
+    "ImageSaveComposite",
+    "ImagePreview",
+    "SpriteSheet",
+]
+
+
+def configure_logging(filename: str = "window.log") -> None:
+    """
+
+    configure the logging of the application, once, from its entry point.
+
+    The modules only get their logger, so importing them doesn't truncate
+    the log file: it's done here, when the application or the CLI starts.
+
+    :param filename: log filename
+    :type filename: str
+
+    :rtype: None
+
+    """
+    logging.basicConfig(filename=filename,
+                        format='[%(levelname)s] %(message)s',
+                        filemode='w')
+
+
+# run by import_times in a fresh interpreter, importlib and time are already loaded there
+IMPORT_TIMER = """
+import importlib
+import time
+
+for name in {modules!r}:
+    start = time.perf_counter()
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        print("import-time", name, "missing")
+        continue
+    print("import-time", name, time.perf_counter() - start)
+"""
+
+
+def import_times(modules):
+    """
+
+    import each module in order in a fresh interpreter and measure the time spent.
+
+    The modules are imported in a subprocess, so the modules already
+    loaded by this process don't hide their cost. A module already imported
+    by a previous one costs nothing, so the times are the extra cost of
+    each module when imported in this order, from a cold start.
+
+    :param modules: module names
+    :type modules: list[str]
+
+    :return: the module name and the import time in seconds, None if missing
+    :rtype: list[tuple[str, float | None]]
+
+    """
+    import subprocess
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (os.path.dirname(os.path.abspath(__file__)), env.get("PYTHONPATH")) if path
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_TIMER.format(modules=list(modules))],
+        capture_output=True, text=True, env=env, check=True
+    ).stdout
+    times = []
+    for line in output.splitlines():
+        words = line.split()
+        if len(words) == 3 and words[0] == "import-time":
+            times.append((words[1], None if words[2] == "missing" else float(words[2])))
+    return times
+
+
+def print_import_report(startup, deferred=DEFERRED_MODULES, stream=sys.stdout) -> None:
+    """
+
+    print the import time of the startup modules, then of the deferred ones,
+    all imported in one fresh interpreter, the deferred ones after the startup ones.
+
+    :param startup: modules imported before the application is ready
+    :param deferred: modules imported at the first split or save
+    :param stream: text stream to print in
+
+    :rtype: None
+
+    """
+    times = import_times([*startup, *deferred])
+    for title, group in (("startup", times[:len(startup)]), ("deferred", times[len(startup):])):
+        total = 0.0
+        print(f"{title} imports:", file=stream)
+        for name, seconds in group:
+            if seconds is None:
+                print(f"  {name:<24} not installed", file=stream)
+                continue
+            total += seconds
+            print(f"  {name:<24} {seconds * 1000:8.1f} ms", file=stream)
+        print(f"  {'total':<24} {total * 1000:8.1f} ms", file=stream)
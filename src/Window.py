@@ -1,15 +1,20 @@
 from __future__ import annotations
-import PIL.Image
-from ImageSplitter import ImageSplitterDecorator
-from ImageSaveComposite import ImageSaveComposite
+from typing import TYPE_CHECKING
+from ImageManifest import ImageManifest
+from ImageEncoder import ImageEncoder
+from Debounce import Debouncer
 import traceback
+import asyncio
 import flet as ft
 import logging
 
+# PIL, numpy and the splitter engines are imported at first use, to start fast
+if TYPE_CHECKING:
+    from ImageSplitter import ImageSplitterDecorator
+    from ImagePreview import ImagePreview
+    from ImageBoxes import BoxSet
+    from SpriteSheet import SplitOptions
 
-logging.basicConfig(filename="window.log",
-                    format='[%(levelname)s] %(message)s',
-                    filemode='w')
 
 logger = logging.getLogger('window')
 logger.setLevel(logging.DEBUG)
@@ -75,6 +80,13 @@ class Window(Singleton):
     bottom_margin_field: ft.TextField
 
     name_field: ft.TextField = None
+    mode_dropdown: ft.Dropdown
+    duplicate_dropdown: ft.Dropdown
+    output_dropdown: ft.Dropdown
+    encoder_dropdown: ft.Dropdown
+    async_checkbox: ft.Checkbox
+    trim_checkbox: ft.Checkbox
+    region_field: ft.TextField
 
     cut_button: ft.ElevatedButton
     save_button: ft.ElevatedButton
@@ -85,6 +97,10 @@ class Window(Singleton):
     image_container: ft.Container
     form_container: ft.Row
     image: ft.Image
+    preview: ImagePreview = None
+    overlay: ft.Image
+    overlay_boxes: BoxSet = None
+    overlay_debouncer: Debouncer = None
     file_picker: ft.FilePicker
     dir_picker: ft.FilePicker
 
@@ -143,7 +159,8 @@ class Window(Singleton):
 
         the file name is given by the Window.filename attribute, from this attribute, we have
         access to an image by the absolute path. Thanks to this absolute path and PIL library,
-        it's possible to get an Image compatible with Tkinter and show it in the application.
+        a cached thumbnail bounded by the image size is generated and shown in the application,
+        the full resolution image is only opened to split it.
 
         :rtype: None
 
@@ -151,10 +168,120 @@ class Window(Singleton):
         logger.info("start open image")
         Window.filename = filename
         logger.debug("filename is " + filename)
-        Window.image.src = filename
+        from ImagePreview import ImagePreview
+
+        if Window.preview is not None:
+            Window.preview.remove_overlay()
+        Window.preview = ImagePreview(filename, Window.image.width, Window.image.height)
+        Window.image.src = Window.preview.generate()
         Window.page.update()
+        Window.overlay_debouncer()
         logger.debug("end open image")
 
+    @staticmethod
+    def update_overlay() -> None:
+        """
+
+        draw the boxes of the sprites that would be split on the preview.
+
+        The overlay follows the mode dropdown: the auto strategy uses the
+        cached mask of the preview, the grid strategy scales the grid boxes
+        computed from the sheet size and the margins. The boxes only come
+        from the preview and the split options, so the full sheet is never
+        decoded and no splitter is built: Window.splitter is only set by a
+        split. The overlay is hidden if a field isn't valid.
+
+        :rtype: None
+
+        """
+        if Window.preview is None:
+            return
+        logger.info("start update overlay")
+        try:
+            Window.overlay_boxes = Window.preview.overlay_boxes(Window.split_options())
+            Window.overlay.src = Window.preview.draw_overlay(Window.overlay_boxes)
+            Window.overlay.visible = True
+        except ValueError:
+            logger.debug("fields are not valid, overlay hidden")
+            Window.overlay.visible = False
+        Window.page.update()
+        logger.info("end update overlay")
+
+    @staticmethod
+    def split_options() -> SplitOptions:
+        """
+
+        get the split options of the field values, an empty row or column
+        field counts as 1 and an empty margin field as 0. Raise ValueError
+        if a field isn't valid.
+
+        :rtype: SplitOptions
+
+        """
+        from SpriteSheet import SplitOptions
+
+        return SplitOptions(
+            int(Window.row_field.value or 1),
+            int(Window.column_field.value or 1),
+            left=int(Window.left_margin_field.value or 0),
+            right=int(Window.right_margin_field.value or 0),
+            top=int(Window.top_margin_field.value or 0),
+            bottom=int(Window.bottom_margin_field.value or 0),
+            mode=Window.mode_dropdown.value,
+            trim=bool(Window.trim_checkbox.value),
+            regions=Window.parse_regions(Window.region_field.value)
+        )
+
+    @staticmethod
+    def create_splitter() -> ImageSplitterDecorator:
+        """
+
+        instance a splitter from the current image and the field values,
+        the full resolution sheet is only opened here, to split it.
+
+        :return: the splitter, also stored in Window.splitter
+        :rtype: ImageSplitterDecorator
+
+        """
+        import PIL.Image
+        from ImageSplitter import ImageSplitterDecorator
+
+        options = Window.split_options()
+        Window.splitter = ImageSplitterDecorator(
+            PIL.Image.open(Window.filename),
+            options.rows,
+            options.columns,
+            left=options.left,
+            right=options.right,
+            top=options.top,
+            bottom=options.bottom,
+            mode=options.mode,
+            trim=options.trim,
+            regions=options.regions
+        )
+        return Window.splitter
+
+    @staticmethod
+    def parse_regions(text: str):
+        """
+
+        get the regions written in the region field, as "left,top,right,bottom"
+        separated by ";", raise ValueError if a region isn't valid.
+
+        :return: the regions, None if the field is empty
+        :rtype: list[tuple[int, int, int, int]] | None
+
+        """
+        regions = []
+        for region in (text or "").split(';'):
+            if not region.strip():
+                continue
+            values = [int(value) for value in region.split(',')]
+            if len(values) != 4:
+                raise ValueError(f"a region needs left,top,right,bottom, region={region}")
+            regions.append(tuple(values))
+        return regions or None
+
     @staticmethod
     def cut_image():
         """
@@ -171,17 +298,7 @@ class Window(Singleton):
         """
         logger.info("start cutting image")
         try:
-            Window.splitter = ImageSplitterDecorator(
-                PIL.Image.open(Window.filename),
-                int(Window.row_field.value),
-                int(Window.column_field.value),
-                int(Window.left_margin_field.value),
-                int(Window.right_margin_field.value),
-                int(Window.top_margin_field.value),
-                int(Window.bottom_margin_field.value)
-            )
-
-            return Window.splitter.split()
+            return Window.create_splitter().split()
         except ValueError:
             logger.error("cut image function gives errors")
             print(traceback.format_exc())
@@ -203,8 +320,14 @@ class Window(Singleton):
         """
         logger.info("start saving image")
 
-        if e.path:
+        if e.path and Window.output_dropdown.value in ImageManifest.STRATEGIES:
             logger.debug("found a path")
+            Window.export_manifest(e.path, Window.filename.split('.')[-1])
+        elif e.path:
+            logger.debug("found a path")
+            from ImageSaveComposite import ImageSaveComposite
+            from ImageDeduplicate import ImageDeduplicator
+            from ImageArchive import ImageArchive
             try:
                 images = Window.cut_image()
                 img_type = Window.filename.split('.')[-1]
@@ -214,11 +337,55 @@ class Window(Singleton):
                     Window.name_field.value,
                     img_type
                 )
-                composite.save()
+                composite.deduplicator = ImageDeduplicator.from_name(Window.duplicate_dropdown.value)
+                if Window.encoder_dropdown.value in ImageEncoder.PRESETS:
+                    composite.encoder = ImageEncoder(Window.encoder_dropdown.value)
+                if Window.output_dropdown.value in ImageArchive.STRATEGIES:
+                    composite.save_archive(Window.output_dropdown.value)
+                elif Window.async_checkbox.value:
+                    asyncio.run(composite.save_async())
+                else:
+                    composite.save()
+                if Window.splitter.trim:
+                    ImageManifest.from_splitter(
+                        Window.splitter,
+                        Window.filename,
+                        Window.name_field.value,
+                        composite.extension(),
+                        Window.splitter.trimmed
+                    ).save(e.path)
             except FileNotFoundError:
                 pass
         logger.info("end saving image")
 
+    @staticmethod
+    def export_manifest(path: str, img_type: str) -> None:
+        """
+
+        export the sprite boxes as a manifest, without cropping any sprite.
+
+        The format is chosen with the output dropdown, the manifest is
+        written in the path directory with the name field as filename.
+
+        :return: nothing
+        :rtype: None
+
+        """
+        logger.info("start exporting manifest")
+        try:
+            manifest = ImageManifest.from_splitter(
+                Window.create_splitter(),
+                Window.filename,
+                Window.name_field.value,
+                img_type
+            )
+            manifest.save(path, ImageManifest.STRATEGIES[Window.output_dropdown.value]())
+        except ValueError:
+            logger.error("export manifest function gives errors")
+            print(traceback.format_exc())
+        finally:
+            logger.info("end exporting manifest")
+
     @staticmethod
     def change_theme():
         logger.info("Change window theme")
@@ -283,20 +450,89 @@ class Window(Singleton):
         )
         logger.debug("initialization of main image")
 
-        Window.row_field = ft.TextField(label="Rows", width=300)
+        # boxes drawn on top of the preview, recomputed once the user stops typing
+        Window.overlay = ft.Image(
+            width=1000,
+            height=700,
+            fit=ft.ImageFit.CONTAIN,
+            visible=False
+        )
+        Window.overlay_debouncer = Debouncer(Window.update_overlay)
+        logger.debug("initialization of overlay")
+
+        on_change = Window.overlay_debouncer
+        Window.row_field = ft.TextField(label="Rows", width=300, on_change=on_change)
         logger.debug("initialization of row field")
-        Window.column_field = ft.TextField(label="Columns", width=300)
+        Window.column_field = ft.TextField(label="Columns", width=300, on_change=on_change)
         logger.debug("initialization of column field")
-        Window.left_margin_field = ft.TextField(label="Margin left", value="0", width=300)
+        Window.left_margin_field = ft.TextField(label="Margin left", value="0", width=300, on_change=on_change)
         logger.debug("initialization of margin left field")
-        Window.right_margin_field = ft.TextField(label="Margin Right", value="0", width=300)
+        Window.right_margin_field = ft.TextField(label="Margin Right", value="0", width=300, on_change=on_change)
         logger.debug("initialization of right field")
-        Window.top_margin_field = ft.TextField(label="Margin Top", value="0", width=300)
+        Window.top_margin_field = ft.TextField(label="Margin Top", value="0", width=300, on_change=on_change)
         logger.debug("initialization of top field")
-        Window.bottom_margin_field = ft.TextField(label="Margin Bottom", value="0", width=300)
+        Window.bottom_margin_field = ft.TextField(label="Margin Bottom", value="0", width=300, on_change=on_change)
         logger.debug("initialization of bottom field")
         Window.name_field = ft.TextField(label="Name", width=300)
         logger.debug("initialization of name field")
+        Window.mode_dropdown = ft.Dropdown(
+            label="Mode",
+            value="auto",
+            width=300,
+            options=[
+                ft.dropdown.Option("auto", "Find the sprites"),
+                ft.dropdown.Option("grid", "Cut a grid after the margins"),
+            ],
+            on_change=on_change
+        )
+        logger.debug("initialization of mode dropdown")
+        Window.duplicate_dropdown = ft.Dropdown(
+            label="Duplicates",
+            value="none",
+            width=300,
+            options=[
+                ft.dropdown.Option("none", "Keep all"),
+                ft.dropdown.Option("exact", "Remove exact duplicates"),
+                ft.dropdown.Option("flip", "Remove flipped duplicates"),
+                ft.dropdown.Option("rotate", "Remove rotated duplicates"),
+            ]
+        )
+        logger.debug("initialization of duplicate dropdown")
+        Window.output_dropdown = ft.Dropdown(
+            label="Output",
+            value="sprites",
+            width=300,
+            options=[
+                ft.dropdown.Option("sprites", "Sprite files"),
+                ft.dropdown.Option("json", "JSON boxes"),
+                ft.dropdown.Option("texturepacker", "TexturePacker data"),
+                ft.dropdown.Option("aseprite", "Aseprite data"),
+                ft.dropdown.Option("tar", "Tar archive"),
+                ft.dropdown.Option("zip", "Zip archive"),
+                ft.dropdown.Option("pack", "Indexed pack"),
+            ]
+        )
+        logger.debug("initialization of output dropdown")
+        Window.encoder_dropdown = ft.Dropdown(
+            label="Encoder",
+            value="default",
+            width=300,
+            options=[ft.dropdown.Option("default", "Same as input")] + [
+                ft.dropdown.Option(preset) for preset in ImageEncoder.PRESETS
+            ]
+        )
+        logger.debug("initialization of encoder dropdown")
+        Window.async_checkbox = ft.Checkbox(label="Asynchronous writes", value=False)
+        logger.debug("initialization of async checkbox")
+        Window.trim_checkbox = ft.Checkbox(label="Trim sprites", value=False, on_change=on_change)
+        logger.debug("initialization of trim checkbox")
+        Window.region_field = ft.TextField(
+            label="Regions (left,top,right,bottom; ...)",
+            value="",
+            width=300,
+            on_change=on_change
+        )
+        logger.debug("initialization of region field")
         Window.cut_button = ft.ElevatedButton(
             text="Cut your image",
             icon="cut",
@@ -316,7 +552,7 @@ class Window(Singleton):
         logger.debug("initialization of import button")
 
         Window.image_container = ft.Container(
-            content=Window.image,
+            content=ft.Stack([Window.image, Window.overlay]),
         )
         logger.debug("initialization of image container")
 
@@ -330,6 +566,7 @@ class Window(Singleton):
         Window.form_container = ft.Row([
             ft.Column([
                 Window.import_button,
+                Window.mode_dropdown,
                 Window.row_field,
                 Window.column_field,
                 Window.left_margin_field,
@@ -337,6 +574,12 @@ class Window(Singleton):
                 Window.top_margin_field,
                 Window.bottom_margin_field,
                 Window.name_field,
+                Window.duplicate_dropdown,
+                Window.output_dropdown,
+                Window.encoder_dropdown,
+                Window.async_checkbox,
+                Window.trim_checkbox,
+                Window.region_field,
                 Window.cut_button,
             ],
                 alignment=ft.MainAxisAlignment.CENTER
@@ -0,0 +1,73 @@
+from PIL import Image
+from ImageAnimation import ImageAnimation
+from ImageBoxes import BoxSet
+from SpriteSheet import split_sheet
+import pytest
+
+
+def sprites():
+    return [Image.new("RGBA", (4, 8), (255, 0, 0, 255)), Image.new("RGBA", (6, 4), (0, 255, 0, 255))]
+
+
+def test_canvas_is_largest_sprite():
+    assert ImageAnimation(sprites()).size == (6, 8)
+
+
+@pytest.mark.parametrize("anchor, positions", [
+    ("bottom", [(1, 0), (0, 4)]),
+    ("center", [(1, 0), (0, 2)]),
+    ("top-left", [(0, 0), (0, 0)]),
+    ("bottom-right", [(2, 0), (0, 4)]),
+])
+def test_anchor_positions(anchor, positions):
+    animation = ImageAnimation(sprites(), anchor)
+    assert [animation.position(i) for i in range(2)] == positions
+
+
+def test_offsets_replace_anchor():
+    animation = ImageAnimation(sprites(), offsets=[(2, 0), (0, 5)])
+    assert animation.size == (6, 9)
+    assert animation.position(1) == (0, 5)
+
+
+def test_unknown_anchor():
+    with pytest.raises(ValueError):
+        ImageAnimation(sprites(), "middle")
+
+
+def test_rows():
+    boxes = BoxSet([(10, 0, 14, 8), (0, 2, 4, 6), (0, 10, 4, 14), (6, 9, 8, 12)])
+    assert ImageAnimation.rows(boxes) == [[1, 0], [2, 3]]
+
+
+@pytest.mark.parametrize("animation_type, extension", [("gif", "gif"), ("apng", "png")])
+def test_save_round_trip(tmp_path, animation_type, extension):
+    filename = ImageAnimation(sprites()).save(str(tmp_path), "walk", animation_type, duration=80)
+    assert filename.endswith("walk." + extension)
+    with Image.open(filename) as animation:
+        assert animation.n_frames == 2
+        assert animation.size == (6, 8)
+        animation.seek(1)
+        assert animation.convert("RGBA").getpixel((0, 7))[:3] == (0, 255, 0)
+
+
+def test_from_result_row():
+    sheet = Image.new("RGBA", (30, 30), (0, 0, 0, 0))
+    sheet.paste((255, 0, 0, 255), (2, 2, 6, 10))
+    sheet.paste((255, 0, 0, 255), (10, 2, 16, 6))
+    sheet.paste((0, 0, 255, 255), (2, 20, 8, 28))
+    result = split_sheet(sheet)
+    animation = ImageAnimation.from_result(result, row=0)
+    assert len(animation.sprites) == 2
+    assert animation.size == (6, 8)
+    with pytest.raises(ValueError):
+        ImageAnimation.from_result(result, row=2)
+
+
+def test_from_trimmed_result_uses_offsets():
+    sheet = Image.new("RGBA", (40, 20), (0, 0, 0, 0))
+    sheet.paste((255, 0, 0, 255), (2, 3, 8, 9))
+    sheet.paste((0, 255, 0, 255), (24, 10, 30, 18))
+    animation = ImageAnimation.from_result(split_sheet(sheet, columns=2, mode="grid", trim=True))
+    assert animation.offsets == [(2, 3), (4, 10)]
+    assert animation.size == (20, 20)
@@ -0,0 +1,75 @@
+from PIL import Image
+from ImageArchive import ImageArchive, ArchiveStrategy, PackReader
+import io
+import tarfile
+import zipfile
+import pytest
+
+
+ENTRIES = {
+    "sprite0.png": b"first sprite",
+    "sprite1.png": b"",
+    "dossier/sprite2.png": bytes(range(256)) * 4,
+}
+
+
+def write(filename, archive_type):
+    with ImageArchive.open(filename, archive_type) as archive:
+        for name, data in ENTRIES.items():
+            archive.add(name, data)
+
+
+def test_tar_round_trip(tmp_path):
+    filename = str(tmp_path / "sprites.tar")
+    write(filename, "tar")
+    with tarfile.open(filename) as tar:
+        assert tar.getnames() == list(ENTRIES)
+        for name, data in ENTRIES.items():
+            assert tar.extractfile(name).read() == data
+
+
+def test_zip_round_trip(tmp_path):
+    filename = str(tmp_path / "sprites.zip")
+    write(filename, "zip")
+    with zipfile.ZipFile(filename) as archive:
+        assert archive.namelist() == list(ENTRIES)
+        assert all(info.compress_type == zipfile.ZIP_STORED for info in archive.infolist())
+        for name, data in ENTRIES.items():
+            assert archive.read(name) == data
+
+
+def test_pack_round_trip(tmp_path):
+    filename = str(tmp_path / "sprites.pack")
+    write(filename, "pack")
+    with PackReader(filename) as pack:
+        assert pack.names() == list(ENTRIES)
+        for name in reversed(list(ENTRIES)):
+            assert pack.read(name) == ENTRIES[name]
+
+
+def test_pack_open_image(tmp_path):
+    image = Image.new("RGBA", (3, 2), (1, 2, 3, 4))
+    stream = io.BytesIO()
+    image.save(stream, format="PNG")
+    filename = str(tmp_path / "sprites.pack")
+    with ImageArchive.open(filename, "pack") as archive:
+        archive.add("sprite0.png", stream.getvalue())
+    with PackReader(filename) as pack:
+        assert pack.open_image("sprite0.png").tobytes() == image.tobytes()
+
+
+def test_pack_reader_rejects_other_file(tmp_path):
+    filename = tmp_path / "sprites.pack"
+    filename.write_bytes(b"not a pack at all")
+    with pytest.raises(ValueError):
+        PackReader(str(filename))
+
+
+def test_unknown_archive_type(tmp_path):
+    with pytest.raises(ValueError):
+        ImageArchive.open(str(tmp_path / "sprites.rar"), "rar")
+
+
+def test_strategy_is_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        ArchiveStrategy(str(tmp_path / "sprites"))
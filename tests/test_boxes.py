@@ -0,0 +1,79 @@
+from ImageBoxes import BoxSet
+import json
+import numpy as np
+import pytest
+
+
+BOXES = BoxSet([(10, 0, 20, 5), (0, 0, 4, 4), (0, 8, 6, 10)])
+
+
+def test_array_is_compact():
+    assert BOXES.to_numpy().dtype == np.int32
+    assert BOXES.to_numpy().shape == (3, 4)
+    assert len(BoxSet()) == 0
+
+
+def test_iteration_gives_tuples():
+    assert BOXES.to_list() == [(10, 0, 20, 5), (0, 0, 4, 4), (0, 8, 6, 10)]
+    assert BOXES[1] == (0, 0, 4, 4)
+    assert isinstance(BOXES[1:], BoxSet)
+    assert BOXES[np.array([True, False, True])].to_list() == [(10, 0, 20, 5), (0, 8, 6, 10)]
+
+
+def test_from_contours():
+    contours = [(0, 4, 10, 19), (8, 9, 0, 5)]
+    assert BoxSet.from_contours(contours).to_list() == [(10, 0, 20, 5), (0, 8, 6, 10)]
+
+
+def test_json_round_trip():
+    document = json.dumps(BOXES.to_json())
+    assert json.loads(document)[0] == {"x": 10, "y": 0, "w": 10, "h": 5}
+    assert BoxSet.from_json(document) == BOXES
+
+
+def test_sizes_and_areas():
+    assert BOXES.widths.tolist() == [10, 4, 6]
+    assert BOXES.heights.tolist() == [5, 4, 2]
+    assert BOXES.areas.tolist() == [50, 16, 12]
+    assert BoxSet([(0, 0, 70000, 70000)]).areas.tolist() == [70000 * 70000]
+
+
+def test_filter_area():
+    assert BOXES.filter_area(13).to_list() == [(10, 0, 20, 5), (0, 0, 4, 4)]
+    assert BOXES.filter_area(13, 20).to_list() == [(0, 0, 4, 4)]
+
+
+def test_sort():
+    assert BOXES.sort().to_list() == [(0, 0, 4, 4), (10, 0, 20, 5), (0, 8, 6, 10)]
+    assert BOXES.sort("column").to_list() == [(0, 0, 4, 4), (0, 8, 6, 10), (10, 0, 20, 5)]
+    assert BOXES.sort("area", reverse=True)[0] == (10, 0, 20, 5)
+    with pytest.raises(ValueError):
+        BOXES.sort("size")
+
+
+def test_union_keeps_order_without_duplicates():
+    union = BOXES.union([(0, 0, 4, 4), (1, 1, 2, 2)])
+    assert union.to_list() == BOXES.to_list() + [(1, 1, 2, 2)]
+
+
+def test_concatenate():
+    assert BoxSet.concatenate([BOXES[:1], BoxSet(), BOXES[1:]]) == BOXES
+    assert len(BoxSet.concatenate([])) == 0
+
+
+def test_bounds_translate_scale():
+    assert BOXES.bounds() == (0, 0, 20, 10)
+    assert BoxSet().bounds() is None
+    assert BOXES.translate(1, 2)[0] == (11, 2, 21, 7)
+    assert BOXES.scale(0.5)[0] == (5, 0, 10, 2)
+
+
+def test_iou():
+    iou = BoxSet([(0, 0, 4, 4)]).iou([(0, 0, 4, 4), (2, 0, 6, 4), (8, 8, 9, 9), (0, 0, 0, 0)])
+    assert iou.tolist() == [[1.0, pytest.approx(1 / 3), 0.0, 0.0]]
+
+
+def test_array_protocol():
+    assert np.asarray(BOXES) is BOXES.to_numpy()
+    assert np.array(BOXES, copy=True) is not BOXES.to_numpy()
+    assert np.asarray(BOXES, dtype=np.int64).dtype == np.int64
@@ -0,0 +1,84 @@
+from ImageArchive import ImageArchive
+from ImageDeduplicate import ImageDeduplicator
+from ImageManifest import ImageManifest
+import Cli
+import pytest
+
+
+def test_outputs_follow_strategies():
+    assert Cli.OUTPUTS == ["sprites", *ImageManifest.STRATEGIES, *ImageArchive.STRATEGIES]
+
+
+@pytest.mark.parametrize("output", Cli.OUTPUTS)
+def test_parser_accepts_every_output(output):
+    assert Cli.build_parser().parse_args(["sheet.png", "--output", output]).output == output
+
+
+@pytest.mark.parametrize("dedup", ["none", *ImageDeduplicator.STRATEGIES])
+def test_parser_accepts_every_dedup(dedup):
+    assert Cli.build_parser().parse_args(["sheet.png", "--dedup", dedup]).dedup == dedup
+
+
+def test_parser_rejects_unknown_output():
+    with pytest.raises(SystemExit):
+        Cli.build_parser().parse_args(["sheet.png", "--output", "rar"])
+
+
+def test_grid_trim_from_command_line(tmp_path, monkeypatch):
+    from PIL import Image
+    import json
+
+    monkeypatch.chdir(tmp_path)
+    image = Image.new("RGBA", (40, 20), (0, 0, 0, 0))
+    image.paste((255, 0, 0, 255), (2, 3, 8, 9))
+    image.paste((0, 255, 0, 255), (24, 10, 30, 18))
+    image.save(tmp_path / "sheet.png")
+    assert Cli.main(["sheet.png", "--mode", "grid", "-c", "2", "--trim", "-o", "out"]) in (0, None)
+    with Image.open(tmp_path / "out" / "sprite0.png") as sprite:
+        assert sprite.size == (6, 6)
+    with open(tmp_path / "out" / "sprite.json") as file:
+        frames = json.load(file)["frames"]
+    assert frames[1]["offset"] == {"x": 4, "y": 10}
+    assert frames[1]["sourceSize"] == {"w": 20, "h": 20}
+
+
+def test_trim_manifest_with_scales_names_written_sprites(tmp_path, monkeypatch):
+    from PIL import Image
+    import json
+
+    monkeypatch.chdir(tmp_path)
+    image = Image.new("RGBA", (40, 20), (0, 0, 0, 0))
+    image.paste((255, 0, 0, 255), (2, 3, 8, 9))
+    image.save(tmp_path / "sheet.png")
+    Cli.main(["sheet.png", "--scales", "2", "--trim", "-o", "out"])
+    with open(tmp_path / "out" / "sprite.json") as file:
+        names = [frame["name"] for frame in json.load(file)["frames"]]
+    assert names == ["sprite0.png"]
+    assert sorted(path.name for path in (tmp_path / "out").iterdir()) == ["sprite.json", "sprite0.png", "sprite0@2x.png"]
+
+
+def test_scales_without_trim_write_only_those_scales(tmp_path, monkeypatch):
+    from PIL import Image
+
+    monkeypatch.chdir(tmp_path)
+    image = Image.new("RGBA", (40, 20), (0, 0, 0, 0))
+    image.paste((255, 0, 0, 255), (2, 3, 8, 9))
+    image.save(tmp_path / "sheet.png")
+    Cli.main(["sheet.png", "--scales", "2", "-o", "out"])
+    assert [path.name for path in (tmp_path / "out").iterdir()] == ["sprite0@2x.png"]
+
+
+def test_batch_manifest_output(tmp_path, monkeypatch):
+    from PIL import Image
+    import json
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "sheets").mkdir()
+    for name in ("hero", "enemy"):
+        image = Image.new("RGBA", (20, 10), (0, 0, 0, 0))
+        image.paste((255, 0, 0, 255), (2, 2, 6, 6))
+        image.save(tmp_path / "sheets" / f"{name}.png")
+    Cli.main(["sheets", "--output", "aseprite", "-o", "out", "--jobs", "2"])
+    for name in ("hero", "enemy"):
+        with open(tmp_path / "out" / name / "sprite.json") as file:
+            assert json.load(file)["meta"]["image"] == f"{name}.png"
@@ -0,0 +1,36 @@
+from PIL import Image
+from ImageCrop import SpriteCropper
+from ImageBoxes import BoxSet
+
+
+def indexed_sheet():
+    image = Image.new("P", (8, 4), 0)
+    image.putpalette([0, 0, 0, 255, 0, 0, 0, 255, 0] + [0] * (256 - 3) * 3)
+    image.paste(1, (0, 0, 4, 4))
+    image.paste(2, (4, 0, 8, 4))
+    image.info["transparency"] = 0
+    return image
+
+
+BOXES = BoxSet([(0, 0, 4, 4), (4, 0, 8, 4)])
+
+
+def test_crops_keep_mode_and_palette():
+    sprites = SpriteCropper(indexed_sheet()).crop_all(BOXES)
+    assert [sprite.mode for sprite in sprites] == ["P", "P"]
+    assert [sprite.size for sprite in sprites] == [(4, 4), (4, 4)]
+    assert sprites[0].getpixel((0, 0)) == 1
+    assert sprites[1].getpixel((0, 0)) == 2
+    assert sprites[1].getpalette()[6:9] == [0, 255, 0]
+    assert sprites[0].info.get("transparency") == 0
+
+
+def test_iter_crops_matches_crop_all():
+    cropper = SpriteCropper(indexed_sheet())
+    lazy = [sprite.tobytes() for sprite in cropper.iter_crops(BOXES)]
+    assert lazy == [sprite.tobytes() for sprite in cropper.crop_all(BOXES)]
+
+
+def test_crop_accepts_array_rows():
+    cropper = SpriteCropper(indexed_sheet())
+    assert cropper.crop(BOXES.to_numpy()[1]).size == (4, 4)
@@ -0,0 +1,23 @@
+from Debounce import Debouncer
+import threading
+import time
+
+
+def test_burst_calls_function_once():
+    calls = []
+    done = threading.Event()
+    debouncer = Debouncer(lambda: (calls.append(1), done.set()), delay=0.05)
+    for _ in range(10):
+        debouncer("event")
+    assert done.wait(1)
+    time.sleep(0.1)
+    assert calls == [1]
+
+
+def test_cancel_drops_pending_call():
+    calls = []
+    debouncer = Debouncer(lambda: calls.append(1), delay=0.05)
+    debouncer()
+    debouncer.cancel()
+    time.sleep(0.1)
+    assert calls == []
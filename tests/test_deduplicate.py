@@ -0,0 +1,75 @@
+from PIL import Image
+from ImageDeduplicate import (
+    ImageDeduplicator,
+    DeduplicateStrategy,
+    DeduplicateFlipStrategy,
+    DeduplicateRotateStrategy,
+)
+import pytest
+
+
+def sprite(pixels):
+    image = Image.new("L", (len(pixels[0]), len(pixels)))
+    image.putdata([value for row in pixels for value in row])
+    return image
+
+
+ARROW = sprite([
+    [1, 2, 3],
+    [4, 5, 6],
+])
+
+
+def test_exact_keeps_first_copy():
+    copy = ARROW.copy()
+    other = sprite([[9, 9, 9], [9, 9, 9]])
+    uniques, frames = ImageDeduplicator().deduplicate([ARROW, other, copy])
+    assert len(uniques) == 2
+    assert uniques[0] is ARROW
+    assert frames == [(0, "identity"), (1, "identity"), (0, "identity")]
+
+
+def test_exact_ignores_mirrors():
+    mirror = ARROW.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+    uniques, _ = ImageDeduplicator(DeduplicateStrategy()).deduplicate([ARROW, mirror])
+    assert len(uniques) == 2
+
+
+def test_exact_key_depends_on_mode():
+    assert DeduplicateStrategy.exact_key(ARROW) != DeduplicateStrategy.exact_key(ARROW.convert("RGB"))
+
+
+def test_flip_maps_mirror_on_original():
+    mirror = ARROW.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+    flipped = ARROW.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+    uniques, frames = ImageDeduplicator(DeduplicateFlipStrategy()).deduplicate([ARROW, mirror, flipped])
+    assert len(uniques) == 1
+    assert frames == [(0, "identity"), (0, "flip_horizontal"), (0, "flip_vertical")]
+
+
+def test_flip_ignores_rotation():
+    rotated = ARROW.transpose(Image.Transpose.ROTATE_90)
+    uniques, _ = ImageDeduplicator(DeduplicateFlipStrategy()).deduplicate([ARROW, rotated])
+    assert len(uniques) == 2
+
+
+def test_rotate_maps_rotation_on_original():
+    rotated = ARROW.transpose(Image.Transpose.ROTATE_90)
+    uniques, frames = ImageDeduplicator(DeduplicateRotateStrategy()).deduplicate([ARROW, rotated])
+    assert len(uniques) == 1
+    unique, name = frames[1]
+    transformed = DeduplicateRotateStrategy.transform(uniques[unique], name)
+    assert transformed.tobytes() == rotated.tobytes()
+
+
+def test_find_transform_rejects_other_sprite():
+    with pytest.raises(ValueError):
+        DeduplicateFlipStrategy().find_transform(ARROW, sprite([[0, 0, 0], [0, 0, 0]]))
+
+
+def test_from_name():
+    assert ImageDeduplicator.from_name(None) is None
+    assert ImageDeduplicator.from_name("none") is None
+    assert isinstance(ImageDeduplicator.from_name("rotate").strategy, DeduplicateRotateStrategy)
+    with pytest.raises(ValueError):
+        ImageDeduplicator.from_name("unknown")
@@ -0,0 +1,56 @@
+from PIL import Image
+from ImageEncoder import ImageEncoder, RawEncoderStrategy
+import io
+import pytest
+
+
+def sheet(mode):
+    image = Image.new("RGBA", (5, 3), (10, 20, 30, 255))
+    image.putpixel((1, 1), (200, 100, 50, 128))
+    return image.convert(mode)
+
+
+@pytest.mark.parametrize("mode", ["1", "L", "LA", "RGB", "RGBA", "YCbCr", "I", "F", "I;16", "I;16B"])
+def test_raw_round_trip(mode):
+    image = sheet("L").convert(mode) if mode.startswith("I;16") else sheet(mode)
+    decoded = RawEncoderStrategy.decode(io.BytesIO(ImageEncoder("raw").encode(image)))
+    assert decoded.mode == image.mode
+    assert decoded.size == image.size
+    assert decoded.tobytes() == image.tobytes()
+
+
+def test_raw_writes_indexed_sprites_as_rgba():
+    image = Image.new("P", (4, 2), 1)
+    image.putpalette([0, 0, 0, 200, 100, 50])
+    image.putpixel((0, 0), 0)
+    image.info["transparency"] = 0
+    decoded = RawEncoderStrategy.decode(io.BytesIO(ImageEncoder("raw").encode(image)))
+    assert decoded.mode == "RGBA"
+    assert decoded.getpixel((0, 0))[3] == 0
+    assert decoded.getpixel((1, 0)) == (200, 100, 50, 255)
+
+
+def test_raw_rejects_other_stream():
+    with pytest.raises(ValueError):
+        RawEncoderStrategy.decode(io.BytesIO(b"\x89PNG\r\n\x1a\n"))
+
+
+@pytest.mark.parametrize("preset", [preset for preset in ImageEncoder.PRESETS if preset not in ("raw", "webp-lossy")])
+def test_lossless_presets_keep_pixels(preset):
+    image = sheet("RGBA")
+    decoded = Image.open(io.BytesIO(ImageEncoder(preset).encode(image)))
+    assert decoded.convert("RGBA").tobytes() == image.tobytes()
+
+
+def test_report_counts_images():
+    encoder = ImageEncoder("png-fast")
+    data = [encoder.encode(sheet("RGB")) for _ in range(3)]
+    report = encoder.report()
+    assert report["preset"] == "png-fast"
+    assert report["count"] == 3
+    assert report["bytes"] == sum(len(item) for item in data)
+
+
+def test_unknown_preset():
+    with pytest.raises(ValueError):
+        ImageEncoder("bmp")
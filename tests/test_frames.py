@@ -0,0 +1,69 @@
+from PIL import Image
+from SpriteSheet import iter_frames, split_frames
+import builtins
+import pytest
+
+
+@pytest.fixture
+def animation(tmp_path):
+    frames = []
+    for i in range(3):
+        frame = Image.new("RGBA", (20, 10), (0, 0, 0, 0))
+        frame.paste((255, 0, 0, 255), (2 + i, 2, 6 + i, 6 + i))
+        frames.append(frame)
+    path = tmp_path / "walk.gif"
+    frames[0].save(path, save_all=True, append_images=frames[1:], disposal=2)
+    return path
+
+
+def test_iter_frames_reads_every_frame(animation):
+    frames = list(iter_frames(str(animation)))
+    assert len(frames) == 3
+    assert all(frame.size == (20, 10) for frame in frames)
+
+
+def test_iter_frames_closes_the_file(animation, monkeypatch):
+    files = []
+    original = builtins.open
+
+    def tracking_open(*args, **kwargs):
+        files.append(original(*args, **kwargs))
+        return files[-1]
+
+    monkeypatch.setattr(builtins, "open", tracking_open)
+    list(iter_frames(animation))
+    frames = iter_frames(animation)
+    next(frames)
+    frames.close()
+    monkeypatch.undo()
+    assert len(files) == 2
+    assert all(file.closed for file in files)
+
+
+def test_iter_frames_of_an_image(animation):
+    with Image.open(animation) as image:
+        assert len(list(iter_frames(image))) == 3
+
+
+def test_split_frames(animation):
+    results = list(split_frames(str(animation)))
+    assert [index for index, _ in results] == [0, 1, 2]
+    assert [result.boxes.to_list() for _, result in results] == [
+        [(2, 2, 6, 6)], [(3, 2, 7, 7)], [(4, 2, 8, 8)]
+    ]
+
+
+@pytest.mark.parametrize("arguments, manifest", [
+    (["--output", "texturepacker"], "sprite0_.json"),
+    (["--trim"], "sprite0_.json"),
+])
+def test_frame_manifests_name_the_sheet_file(animation, tmp_path, arguments, manifest):
+    import Cli
+    import json
+
+    out = tmp_path / "out"
+    Cli.main([str(animation), "--frames", "-o", str(out), *arguments])
+    with open(out / manifest) as file:
+        document = json.load(file)
+    image = document["meta"]["image"] if "meta" in document else document["image"]
+    assert image == "walk.gif"
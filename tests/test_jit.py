@@ -0,0 +1,46 @@
+from ImageMask import Mask
+import ImageJit
+import logging
+import numpy as np
+import pytest
+
+
+def random_mask(seed, shape=(30, 40)):
+    mask = (np.random.default_rng(seed).random(shape) < 0.5).astype(np.uint8)
+    mask[0, 0] = 0
+    return mask
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_flood_fill_matches_serial(seed):
+    mask = random_mask(seed)
+    assert ImageJit.label(mask) == Mask(mask).find_sprite_contours()
+
+
+def test_flood_fill_grows_contours_past_initial_capacity():
+    mask = np.zeros((20, 20), dtype=np.uint8)
+    mask[::2, ::2] = 1
+    mask[0, 0] = 0
+    contours = ImageJit.label(mask)
+    assert len(contours) == 99
+    assert contours == Mask(mask).find_sprite_contours()
+
+
+def test_diagonal_pixels_are_separate_sprites():
+    mask = np.array([[0, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.uint8)
+    assert ImageJit.label(mask) == [(1, 1, 1, 1), (2, 2, 2, 2)]
+
+
+def test_numba_backend_falls_back_to_serial(monkeypatch, caplog):
+    monkeypatch.setattr(ImageJit, "AVAILABLE", False)
+    mask = Mask(random_mask(3))
+    with caplog.at_level(logging.WARNING, logger="mask"):
+        boxes = mask.find_sprite_boxes(backend="numba")
+    assert boxes == mask.find_sprite_boxes(backend="serial")
+    assert "fall back" in caplog.text
+
+
+@pytest.mark.skipif(not ImageJit.AVAILABLE, reason="numba is not installed")
+def test_compiled_backend_matches_serial():
+    mask = Mask(random_mask(4, (200, 300)))
+    assert mask.find_sprite_boxes(backend="numba") == mask.find_sprite_boxes(backend="serial")
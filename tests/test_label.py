@@ -0,0 +1,70 @@
+from ImageLabel import TileLabeller, label_tile
+from ImageMask import Mask
+import numpy as np
+import pytest
+
+
+def random_mask(seed, shape=(40, 50), density=0.45):
+    mask = (np.random.default_rng(seed).random(shape) < density).astype(np.uint8)
+    mask[0, 0] = 0
+    return mask
+
+
+def spiral_mask():
+    mask = np.zeros((21, 21), dtype=np.uint8)
+    mask[1, 1:20] = 1
+    mask[1:20, 19] = 1
+    mask[19, 3:20] = 1
+    mask[3:20, 3] = 1
+    mask[3, 3:17] = 1
+    mask[3:17, 17] = 1
+    return mask
+
+
+def serial(mask):
+    return Mask(mask).find_sprite_contours()
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("tile_size", [1, 3, 7, 16, 64])
+def test_tiles_match_serial(seed, tile_size):
+    mask = random_mask(seed)
+    assert TileLabeller(tile_size, workers=2).label(mask) == serial(mask)
+
+
+@pytest.mark.parametrize("tile_size", [2, 4, 5])
+def test_component_across_many_seams(tile_size):
+    mask = spiral_mask()
+    contours = TileLabeller(tile_size, workers=3).label(mask)
+    assert contours == serial(mask) == [(1, 19, 1, 19)]
+
+
+def test_process_pool_matches_serial():
+    mask = random_mask(7, (24, 24))
+    assert TileLabeller(8, workers=2, pool="process").label(mask) == serial(mask)
+
+
+def test_empty_mask():
+    assert TileLabeller(4, workers=2).label(np.zeros((9, 9), dtype=np.uint8)) == []
+
+
+def test_label_tile_borders():
+    result = label_tile(np.array([[1, 0], [1, 1]], dtype=bool))
+    assert result["contours"].tolist() == [[0, 1, 0, 1]]
+    assert result["top"].tolist() == [1, 0]
+
+
+def test_find_sprite_boxes_tiles_backend():
+    mask = random_mask(3)
+    masked = Mask(mask)
+    assert masked.find_sprite_boxes(workers=2, tile_size=8) == masked.find_sprite_boxes()
+    assert masked.find_sprite_boxes(backend="tiles", tile_size=8) == masked.find_sprite_boxes()
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        TileLabeller(0)
+    with pytest.raises(ValueError):
+        TileLabeller(8, pool="fiber")
+    with pytest.raises(ValueError):
+        Mask(random_mask(0)).find_sprite_boxes(backend="gpu")
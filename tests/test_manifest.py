@@ -0,0 +1,65 @@
+from ImageManifest import (
+    ImageManifest,
+    ManifestStrategy,
+    ManifestTexturePackerStrategy,
+    ManifestAsepriteStrategy,
+)
+import json
+import os
+
+
+BOXES = [(0, 0, 4, 4), (6, 2, 10, 8)]
+
+
+def read(filename):
+    with open(filename) as file:
+        return json.load(file)
+
+
+def test_json_frames(tmp_path):
+    manifest = ImageManifest("sheet.png", (12, 10), BOXES, "sprite", "png")
+    filename = manifest.save(str(tmp_path))
+    assert os.path.basename(filename) == "sprite.json"
+    document = read(filename)
+    assert document["image"] == "sheet.png"
+    assert document["size"] == {"w": 12, "h": 10}
+    assert document["frames"] == [
+        {"name": "sprite0.png", "x": 0, "y": 0, "w": 4, "h": 4},
+        {"name": "sprite1.png", "x": 6, "y": 2, "w": 4, "h": 6},
+    ]
+
+
+def test_json_trimmed_offsets(tmp_path):
+    sources = [(0, 0, 4, 4), (5, 0, 12, 10)]
+    manifest = ImageManifest("sheet.png", (12, 10), BOXES, "sprite", "png", sources)
+    frame = read(manifest.save(str(tmp_path)))["frames"][1]
+    assert frame["offset"] == {"x": 1, "y": 2}
+    assert frame["sourceSize"] == {"w": 7, "h": 10}
+
+
+def test_texturepacker_hash(tmp_path):
+    manifest = ImageManifest("sheet.png", (12, 10), BOXES, "sprite", "png")
+    document = read(manifest.save(str(tmp_path), ManifestTexturePackerStrategy()))
+    assert list(document["frames"]) == ["sprite0.png", "sprite1.png"]
+    frame = document["frames"]["sprite1.png"]
+    assert frame["frame"] == {"x": 6, "y": 2, "w": 4, "h": 6}
+    assert frame["trimmed"] is False
+    assert frame["spriteSourceSize"] == {"x": 0, "y": 0, "w": 4, "h": 6}
+    assert document["meta"]["size"] == {"w": 12, "h": 10}
+
+
+def test_aseprite_array(tmp_path):
+    sources = [(0, 0, 4, 4), (5, 0, 12, 10)]
+    manifest = ImageManifest("sheet.png", (12, 10), BOXES, "sprite", "png", sources)
+    document = read(manifest.save(str(tmp_path), ManifestAsepriteStrategy()))
+    assert [frame["filename"] for frame in document["frames"]] == ["sprite0.png", "sprite1.png"]
+    frame = document["frames"][1]
+    assert frame["trimmed"] is True
+    assert frame["spriteSourceSize"] == {"x": 1, "y": 2, "w": 4, "h": 6}
+    assert frame["duration"] == ManifestAsepriteStrategy.DURATION
+
+
+def test_strategies_share_extension():
+    for strategy in ImageManifest.STRATEGIES.values():
+        assert issubclass(strategy, ManifestStrategy)
+        assert strategy.EXTENSION == "json"
@@ -0,0 +1,58 @@
+from PIL import Image
+from ImageMask import Mask
+import numpy as np
+
+
+def rgba_sheet():
+    image = Image.new("RGBA", (30, 20), (0, 0, 0, 0))
+    image.paste((255, 0, 0, 255), (2, 2, 8, 6))
+    image.paste((0, 0, 255, 255), (12, 4, 20, 18))
+    image.putpixel((25, 15), (0, 255, 0, 255))
+    return image
+
+
+def indexed_sheet(transparency=None):
+    image = rgba_sheet().convert("RGB").quantize(4)
+    if transparency is not None:
+        image.info["transparency"] = transparency
+    return image
+
+
+EXPECTED = [(2, 2, 8, 6), (12, 4, 20, 18), (25, 15, 26, 16)]
+
+
+def test_rgba_mask():
+    mask = Mask(rgba_sheet())
+    assert mask.bg == [0, 0, 0, 0]
+    assert mask.mask_array.sum() == 6 * 4 + 8 * 14 + 1
+    assert mask.find_sprite_boxes().to_list() == EXPECTED
+
+
+def test_indexed_mask_matches_color_mask():
+    image = indexed_sheet()
+    mask = Mask(image)
+    assert mask.mask_array.dtype == np.uint8
+    assert mask.bg == image.getpixel((0, 0))
+    assert np.array_equal(mask.mask_array, Mask(image.convert("RGB")).mask_array)
+    assert mask.find_sprite_boxes().to_list() == EXPECTED
+
+
+def test_indexed_transparent_index_is_background():
+    image = indexed_sheet()
+    sprite = image.getpixel((2, 2))
+    image.putpixel((0, 0), sprite)
+    mask = Mask(image)
+    assert mask.bg == image.getpixel((0, 0))
+    image.info["transparency"] = image.getpixel((1, 0))
+    mask = Mask(image)
+    assert mask.bg == image.getpixel((1, 0))
+    assert mask.mask_array[0, 0] == 1
+
+
+def test_indexed_alpha_per_index():
+    image = indexed_sheet()
+    background = image.getpixel((0, 0))
+    alphas = bytearray([255] * 4)
+    alphas[background] = 0
+    image.info["transparency"] = bytes(alphas)
+    assert Mask(image).find_sprite_boxes().to_list() == EXPECTED
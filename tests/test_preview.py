@@ -0,0 +1,87 @@
+from PIL import Image
+from ImagePreview import ImagePreview
+import os
+
+
+def sheet(path, size=(3000, 1000), mode="RGBA"):
+    Image.new(mode, size, (0, 0, 0, 0) if mode == "RGBA" else 0).save(path)
+    return str(path)
+
+
+def test_preview_fits_bounds(tmp_path):
+    preview = ImagePreview(sheet(tmp_path / "sheet.png"), 600, 400, str(tmp_path / "cache"))
+    with Image.open(preview.generate()) as thumbnail:
+        assert thumbnail.size == (600, 200)
+    assert preview.source_size == (3000, 1000)
+    assert preview.scale == 0.2
+
+
+def test_preview_is_cached(tmp_path):
+    filename = sheet(tmp_path / "sheet.png")
+    path = ImagePreview(filename, 600, 400, str(tmp_path / "cache")).generate()
+    modified = os.stat(path).st_mtime_ns
+    preview = ImagePreview(filename, 600, 400, str(tmp_path / "cache"))
+    assert preview.generate() == path
+    assert os.stat(path).st_mtime_ns == modified
+    assert preview.size == (600, 200)
+
+
+def test_cache_key_depends_on_bounds(tmp_path):
+    filename = sheet(tmp_path / "sheet.png")
+    small = ImagePreview(filename, 300, 300, str(tmp_path / "cache")).cache_path()
+    large = ImagePreview(filename, 600, 400, str(tmp_path / "cache")).cache_path()
+    assert small != large
+
+
+def test_indexed_sheet_preview(tmp_path):
+    preview = ImagePreview(sheet(tmp_path / "sheet.png", (200, 100), "P"), 100, 100, str(tmp_path / "cache"))
+    with Image.open(preview.generate()) as thumbnail:
+        assert thumbnail.size == (100, 50)
+        assert thumbnail.mode == "RGBA"
+
+
+def sprite_sheet(path):
+    image = Image.new("RGBA", (400, 200), (0, 0, 0, 0))
+    image.paste((255, 0, 0, 255), (20, 20, 100, 100))
+    image.paste((0, 255, 0, 255), (240, 100, 320, 180))
+    image.save(path)
+    return str(path)
+
+
+def test_overlay_boxes_never_decode_the_sheet(tmp_path, monkeypatch):
+    from SpriteSheet import SplitOptions
+
+    preview = ImagePreview(sprite_sheet(tmp_path / "sheet.png"), 200, 200, str(tmp_path / "cache"))
+    preview.generate()
+    monkeypatch.setattr(Image.Image, "load", lambda self: (_ for _ in ()).throw(AssertionError("decoded")))
+    grid = preview.overlay_boxes(SplitOptions(2, 2, mode="grid"))
+    assert grid.to_list() == [(0, 0, 100, 50), (100, 0, 200, 50), (0, 50, 100, 100), (100, 50, 200, 100)]
+    region = preview.overlay_boxes(SplitOptions(1, 2, mode="grid", regions=[(200, 0, 400, 200)]))
+    assert region.to_list() == [(100, 0, 150, 100), (150, 0, 200, 100)]
+
+
+def test_overlay_boxes_from_preview_mask(tmp_path):
+    from SpriteSheet import SplitOptions
+
+    preview = ImagePreview(sprite_sheet(tmp_path / "sheet.png"), 200, 200, str(tmp_path / "cache"))
+    # the thumbnail resampling blurs the edges of the sprites by a pixel
+    boxes = preview.overlay_boxes(SplitOptions()).to_list()
+    assert boxes == [(9, 9, 51, 51), (119, 49, 161, 91)]
+    inside = preview.overlay_boxes(SplitOptions(regions=[(200, 0, 400, 200)]))
+    assert inside.to_list() == boxes[1:]
+    trimmed = preview.overlay_boxes(SplitOptions(1, 2, mode="grid", trim=True))
+    assert trimmed.to_list() == boxes
+
+
+def test_only_the_last_overlay_is_kept(tmp_path):
+    from ImageBoxes import BoxSet
+
+    cache = tmp_path / "cache"
+    preview = ImagePreview(sprite_sheet(tmp_path / "sheet.png"), 200, 200, str(cache))
+    preview.generate()
+    first = preview.draw_overlay(BoxSet([(0, 0, 10, 10)]))
+    second = preview.draw_overlay(BoxSet([(0, 0, 20, 20)]))
+    assert not os.path.exists(first) and os.path.exists(second)
+    assert preview.draw_overlay(BoxSet([(0, 0, 20, 20)])) == second
+    preview.remove_overlay()
+    assert [name for name in os.listdir(cache) if name.endswith(".overlay.png")] == []
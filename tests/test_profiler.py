@@ -0,0 +1,55 @@
+from PIL import Image
+from ImageProfiler import StageProfiler
+from SpriteSheet import split_sheet
+import os
+
+
+def sheet():
+    image = Image.new("RGBA", (40, 20), (0, 0, 0, 0))
+    image.paste((255, 0, 0, 255), (2, 3, 8, 9))
+    return image
+
+
+def test_stages_are_recorded():
+    profiler = StageProfiler(top=5)
+    with profiler.stage("allocate"):
+        data = [bytearray(1 << 20) for _ in range(4)]
+    del data
+    stage = profiler.stages[0]
+    assert stage["name"] == "allocate"
+    assert stage["seconds"] >= 0
+    assert stage["peak"] >= 4 << 20
+    assert len(stage["allocations"]) <= 5
+
+
+def test_disabled_profiler_records_nothing(tmp_path):
+    profiler = StageProfiler(enabled=False)
+    with profiler.stage("nothing"):
+        pass
+    assert profiler.stages == []
+    assert profiler.save(str(tmp_path), "sprite") is None
+
+
+def test_report_and_save(tmp_path):
+    profiler = StageProfiler()
+    with profiler.stage("first"):
+        sum(range(1000))
+    filename = profiler.save(str(tmp_path / "out"), "sprite")
+    assert os.path.basename(filename) == "spriteprofile.txt"
+    with open(filename) as file:
+        report = file.read()
+    assert report == profiler.report()
+    assert "stage first" in report and "top allocations:" in report
+
+
+def test_split_sheet_stages():
+    profiler = StageProfiler()
+    result = split_sheet(sheet(), profiler=profiler, columns=2, mode="grid", trim=True)
+    assert [stage["name"] for stage in profiler.stages] == ["open", "decode", "mask", "label", "trim"]
+    assert {"mask", "label", "boxes", "trim"} <= set(result.stats)
+
+
+def test_split_sheet_region_stage():
+    profiler = StageProfiler()
+    split_sheet(sheet(), profiler=profiler, regions=[(0, 0, 20, 20)])
+    assert [stage["name"] for stage in profiler.stages] == ["open", "decode", "regions"]
@@ -0,0 +1,68 @@
+from PIL import Image
+from ImageSaveComposite import ImageSaveComposite
+from ImageDeduplicate import ImageDeduplicator
+import asyncio
+import json
+import os
+import pytest
+
+
+def sprites():
+    return [Image.new("RGBA", (4, 4), (value, 0, 0, 255)) for value in (10, 20, 10)]
+
+
+def files(path):
+    return sorted(os.listdir(path))
+
+
+def test_save_async_writes_same_files_as_save(tmp_path):
+    ImageSaveComposite.from_images_to_composite(sprites(), str(tmp_path / "sync"), "sprite", "png").save()
+    asyncio.run(
+        ImageSaveComposite.from_images_to_composite(sprites(), str(tmp_path / "async"), "sprite", "png").save_async(2)
+    )
+    assert files(tmp_path / "sync") == files(tmp_path / "async") == ["sprite0.png", "sprite1.png", "sprite2.png"]
+    for name in files(tmp_path / "sync"):
+        with Image.open(tmp_path / "sync" / name) as first, Image.open(tmp_path / "async" / name) as second:
+            assert first.tobytes() == second.tobytes()
+
+
+def test_save_async_creates_nested_directory(tmp_path):
+    path = tmp_path / "deep" / "sprites"
+    asyncio.run(ImageSaveComposite.from_images_to_composite(sprites(), str(path), "sprite", "png").save_async())
+    assert len(files(path)) == 3
+
+
+def test_save_async_deduplicates(tmp_path):
+    composite = ImageSaveComposite.from_images_to_composite(sprites(), str(tmp_path), "sprite", "png")
+    composite.deduplicator = ImageDeduplicator.from_name("exact")
+    asyncio.run(composite.save_async())
+    assert files(tmp_path) == ["sprite0.png", "sprite1.png", "spritemapping.json"]
+    with open(tmp_path / "spritemapping.json") as file:
+        assert [frame["file"] for frame in json.load(file)["frames"]] == ["sprite0.png", "sprite1.png", "sprite0.png"]
+
+
+def test_save_async_rejects_no_concurrency(tmp_path):
+    composite = ImageSaveComposite.from_images_to_composite(sprites(), str(tmp_path), "sprite", "png")
+    with pytest.raises(ValueError):
+        asyncio.run(composite.save_async(0))
+
+
+def test_save_archive_rejects_unknown_type(tmp_path):
+    composite = ImageSaveComposite.from_images_to_composite(sprites(), str(tmp_path / "out"), "sprite", "png")
+    with pytest.raises(ValueError, match="tar"):
+        composite.save_archive("rar")
+    assert not (tmp_path / "out").exists()
+
+
+def test_shared_directories_are_created_once(tmp_path, monkeypatch):
+    calls = []
+    makedirs = os.makedirs
+    monkeypatch.setattr(os, "makedirs", lambda path, **kwargs: calls.append(path) or makedirs(path, **kwargs))
+    directories = set()
+    for suffix in ("", "@2x"):
+        composite = ImageSaveComposite.from_images_to_composite(sprites(), str(tmp_path / "out"), "sprite", "png")
+        composite.suffix = suffix
+        composite.directories = directories
+        asyncio.run(composite.save_async())
+    assert len(calls) == 1
+    assert len(files(tmp_path / "out")) == 6
@@ -0,0 +1,52 @@
+from PIL import Image
+from ImageScale import SpriteScaler, UpscaleStrategy, DownscaleStrategy
+import pytest
+
+
+def sprite(mode="RGBA"):
+    image = Image.new("RGBA", (3, 2), (0, 0, 0, 0))
+    image.putpixel((1, 0), (255, 0, 0, 255))
+    image.putpixel((2, 1), (0, 0, 255, 128))
+    return image if mode == "RGBA" else image.convert(mode)
+
+
+@pytest.mark.parametrize("mode", ["RGBA", "RGB", "L", "P", "I"])
+def test_upscale_matches_nearest_resize(mode):
+    image = sprite(mode)
+    scaled = UpscaleStrategy(3).scale(image)
+    assert scaled.mode == image.mode
+    assert scaled.tobytes() == image.resize((9, 6), Image.NEAREST).tobytes()
+
+
+def test_upscale_keeps_palette():
+    image = sprite("P")
+    assert UpscaleStrategy(2).scale(image).getpalette() == image.getpalette()
+
+
+def test_downscale_reduces():
+    image = sprite().resize((6, 4), Image.NEAREST)
+    assert DownscaleStrategy(2).scale(image).tobytes() == sprite().tobytes()
+    assert DownscaleStrategy(2).scale(image.convert("P")).mode == "RGBA"
+
+
+@pytest.mark.parametrize("text, scale", [("2", 2), ("@4x", 4), ("0.5x", 0.5), (0.25, 0.25), (1, 1)])
+def test_parse(text, scale):
+    assert SpriteScaler.parse(text) == scale
+
+
+@pytest.mark.parametrize("text", ["0", "-2", "1.5", "0.3"])
+def test_parse_rejects(text):
+    with pytest.raises(ValueError):
+        SpriteScaler.parse(text)
+
+
+def test_suffix():
+    assert [SpriteScaler.suffix(scale) for scale in (1, 2, 0.5)] == ["@1x", "@2x", "@0.5x"]
+
+
+def test_variants_of_every_scale():
+    variants = SpriteScaler(["1", "2", "0.5"]).variants([sprite(), sprite("L")])
+    assert list(variants) == [1, 2, 0.5]
+    assert [image.size for image in variants[2]] == [(6, 4), (6, 4)]
+    assert [image.size for image in variants[0.5]] == [(2, 1), (2, 1)]
+    assert variants[1][0].tobytes() == sprite().tobytes()
@@ -0,0 +1,125 @@
+from PIL import Image
+from ImageMask import Mask
+from ImageScheduler import MemoryBudget, MemoryScheduler
+import threading
+import time
+import pytest
+
+
+def test_estimate_counts_bands_of_every_mode():
+    size = (100, 100)
+    assert Mask.estimate(size, "YCbCr") == Mask.estimate(size, "RGB")
+    assert Mask.estimate(size, "I;16B") == Mask.estimate(size, "I;16")
+    assert Mask.estimate(size, "I;16") < Mask.estimate(size, "I")
+    assert Mask.estimate(size, "RGBA") > Mask.estimate(size, "RGB") > Mask.estimate(size, "L")
+
+
+def test_estimate_low_memory_counts_the_strip():
+    size = (1000, 2000)
+    low = Mask.estimate(size, "RGBA", low_memory=True)
+    assert low < Mask.estimate(size, "RGBA")
+    assert low > 2000 * 1000 * (4 + 2)
+    assert Mask.estimate(size, "RGBA", True, strip_height=512) > low
+    assert Mask.estimate((1000, 10), "RGBA", True, 256) == Mask.estimate((1000, 10), "RGBA", True, 512)
+
+
+def test_estimate_indexed_ignores_low_memory():
+    assert Mask.estimate((50, 50), "P") == Mask.estimate((50, 50), "P", low_memory=True)
+
+
+def test_plan_routes_large_sheets_to_low_memory(tmp_path):
+    path = str(tmp_path / "sheet.png")
+    Image.new("RGBA", (200, 100)).save(path)
+    standard = Mask.estimate((200, 100), "RGBA")
+    low = Mask.estimate((200, 100), "RGBA", low_memory=True)
+    assert MemoryScheduler(standard).plan(path)["path"] == "standard"
+    plan = MemoryScheduler(low).plan(path)
+    assert plan["path"] == "low-memory" and plan["bytes"] == low
+    assert plan["size"] == (200, 100) and plan["mode"] == "RGBA"
+
+
+def test_plan_follows_split_options(tmp_path):
+    from SpriteSheet import SplitOptions
+
+    path = str(tmp_path / "sheet.png")
+    Image.new("RGBA", (200, 100)).save(path)
+    decoded = 200 * 100 * 4
+    scheduler = MemoryScheduler(10 ** 9)
+    grid = scheduler.plan(path, SplitOptions(2, 2, mode="grid"))
+    assert grid["path"] == "grid" and grid["bytes"] == decoded
+    trim = scheduler.plan(path, SplitOptions(2, 2, mode="grid", trim=True))
+    assert trim["bytes"] == Mask.estimate((200, 100), "RGBA", low_memory=True)
+    low = scheduler.plan(path, SplitOptions(low_memory=True))
+    assert low["path"] == "low-memory" and low["bytes"] == Mask.estimate((200, 100), "RGBA", low_memory=True)
+    assert scheduler.plan(path, SplitOptions(2, 2, mode="grid"), sprites=True)["bytes"] == 2 * decoded
+    assert MemoryScheduler(decoded).plan(path, SplitOptions(mode="grid"))["path"] == "grid"
+
+
+def test_oversized_job_runs_alone():
+    budget = MemoryBudget(10)
+    budget.acquire(50)
+    assert budget.used == 50
+    budget.release(50)
+    assert budget.used == 0
+
+
+def test_waiting_large_job_blocks_later_small_jobs():
+    budget = MemoryBudget(10)
+    budget.acquire(6)
+    order = []
+
+    def job(name, size):
+        budget.acquire(size)
+        order.append(name)
+
+    large = threading.Thread(target=job, args=("large", 10), daemon=True)
+    large.start()
+    while not budget.waiting:
+        time.sleep(0.001)
+    small = threading.Thread(target=job, args=("small", 3), daemon=True)
+    small.start()
+    time.sleep(0.05)
+    assert order == []
+    budget.release(6)
+    large.join(5)
+    time.sleep(0.05)
+    assert order == ["large"]
+    budget.release(10)
+    small.join(5)
+    assert order == ["large", "small"]
+
+
+def test_run_keeps_budget_and_order(tmp_path):
+    paths = []
+    for i in range(6):
+        paths.append(str(tmp_path / f"sheet{i}.png"))
+        Image.new("L", (10 * (i + 1), 10)).save(paths[-1])
+    estimates = [Mask.estimate((10 * (i + 1), 10), "L") for i in range(6)]
+    scheduler = MemoryScheduler(sum(estimates[:3]), workers=4)
+    lock = threading.Lock()
+    peak = [0]
+
+    def function(plan):
+        with lock:
+            peak[0] = max(peak[0], scheduler.budget.used)
+        time.sleep(0.01)
+        return plan["filename"]
+
+    assert scheduler.run(paths, function) == paths
+    assert peak[0] <= scheduler.budget.budget
+    assert scheduler.budget.used == 0
+
+
+def test_split_results(tmp_path):
+    path = str(tmp_path / "sheet.png")
+    image = Image.new("RGBA", (20, 10), (0, 0, 0, 0))
+    image.paste((255, 0, 0, 255), (2, 2, 6, 6))
+    image.save(path)
+    low = Mask.estimate((20, 10), "RGBA", low_memory=True)
+    results = MemoryScheduler(low, workers=2).split([path, path])
+    assert [result.boxes.to_list() for result in results] == [[(2, 2, 6, 6)]] * 2
+
+
+def test_invalid_budget():
+    with pytest.raises(ValueError):
+        MemoryBudget(0)
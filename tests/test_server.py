@@ -0,0 +1,170 @@
+from PIL import Image
+from ImageServer import SplitCache, SplitService, SplitServer, SplitClient, SplitRequestHandler
+from urllib.error import HTTPError
+import io
+import queue
+import threading
+import time
+import zipfile
+import pytest
+
+
+def sheet_bytes():
+    image = Image.new("RGBA", (40, 20), (0, 0, 0, 0))
+    image.paste((255, 0, 0, 255), (2, 3, 8, 9))
+    image.paste((0, 255, 0, 255), (24, 10, 30, 18))
+    stream = io.BytesIO()
+    image.save(stream, format="PNG")
+    return stream.getvalue()
+
+
+@pytest.fixture
+def blocked(monkeypatch):
+    """make the workers wait until the event is set."""
+    release = threading.Event()
+    started = threading.Semaphore(0)
+    split = SplitService.split
+
+    def blocking_split(data, options):
+        started.release()
+        release.wait(5)
+        return split(data, options)
+
+    monkeypatch.setattr(SplitService, "split", staticmethod(blocking_split))
+    yield release, started
+    release.set()
+
+
+@pytest.fixture
+def server():
+    servers = []
+
+    def start(workers=2, queue_size=8):
+        instance = SplitServer(("127.0.0.1", 0), SplitService(workers, queue_size))
+        threading.Thread(target=instance.serve_forever, daemon=True).start()
+        servers.append(instance)
+        return instance
+
+    yield start
+    for instance in servers:
+        instance.shutdown()
+        instance.server_close()
+
+
+def status(call):
+    with pytest.raises(HTTPError) as error:
+        call()
+    return error.value.code, error.value.headers
+
+
+def test_parse_options():
+    options = SplitService.parse_options({"rows": "2", "trim": "true", "mode": "grid"})
+    assert options["rows"] == 2 and options["trim"] is True and options["mode"] == "grid"
+    assert options["output"] == "boxes"
+    for query in ({"rows": "two"}, {"colour": "red"}, {"output": "tar"}, {"mode": "magic"}, {"encoder": "gif"}):
+        with pytest.raises(ValueError):
+            SplitService.parse_options(query)
+
+
+def test_boxes_key_ignores_encoder():
+    png = SplitService.parse_options({"encoder": "png"})
+    raw = SplitService.parse_options({"encoder": "raw"})
+    assert SplitCache.key(b"sheet", png) == SplitCache.key(b"sheet", raw)
+    png["output"] = raw["output"] = "zip"
+    assert SplitCache.key(b"sheet", png) != SplitCache.key(b"sheet", raw)
+
+
+@pytest.mark.parametrize("length, code", [(None, 411), ("ten", 400), ("-1", 400)])
+def test_content_length_errors(server, length, code):
+    import http.client
+
+    instance = server()
+    connection = http.client.HTTPConnection(*instance.server_address[:2], timeout=5)
+    connection.putrequest("POST", "/split")
+    if length is not None:
+        connection.putheader("Content-Length", length)
+    connection.endheaders()
+    response = connection.getresponse()
+    assert response.status == code
+    connection.close()
+
+
+def test_split_boxes(server):
+    client = SplitClient(server().url)
+    result = client.split(sheet_bytes())
+    assert result["size"] == [40, 20]
+    assert result["boxes"] == [{"x": 2, "y": 3, "w": 6, "h": 6}, {"x": 24, "y": 10, "w": 6, "h": 8}]
+    assert result["sources"] is None
+
+
+def test_split_grid_trim(server):
+    result = SplitClient(server().url).split(sheet_bytes(), mode="grid", columns=2, trim="true")
+    assert result["boxes"][1] == {"x": 24, "y": 10, "w": 6, "h": 8}
+    assert result["sources"][1] == {"x": 20, "y": 0, "w": 20, "h": 20}
+
+
+def test_split_zip(server):
+    body = SplitClient(server().url).split(sheet_bytes(), "zip", encoder="png-fast")
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        assert archive.namelist() == ["sprite0.png", "sprite1.png"]
+
+
+def test_cache_hit(server):
+    client = SplitClient(server().url)
+    assert client.split(sheet_bytes()) == client.split(sheet_bytes())
+    metrics = client.metrics()
+    assert metrics["requests"] == 2
+    assert metrics["cache_hits"] == 1
+    assert metrics["completed"] == 2
+
+
+def test_error_codes(server):
+    client = SplitClient(server().url)
+    assert status(lambda: client.split(sheet_bytes(), rows="zero"))[0] == 400
+    assert status(lambda: client.split(sheet_bytes(), output="tar"))[0] == 400
+    assert status(lambda: client.split(b""))[0] == 400
+    assert status(lambda: client.split(b"not an image"))[0] == 422
+    assert status(lambda: SplitClient(client.url + "/unknown").metrics())[0] == 404
+
+
+def test_service_rejects_when_queue_is_full(blocked):
+    release, started = blocked
+    service = SplitService(workers=1, queue_size=1)
+    running = service.submit(sheet_bytes(), SplitService.parse_options({}))
+    assert started.acquire(timeout=5)
+    queued = service.submit(sheet_bytes(), SplitService.parse_options({"rows": "2"}))
+    with pytest.raises(queue.Full):
+        service.submit(sheet_bytes(), SplitService.parse_options({"rows": "3"}))
+    assert service.metrics.snapshot()["rejected"] == 1
+    release.set()
+    assert running.result(5)["size"] == [40, 20]
+    assert queued.result(5)["size"] == [40, 20]
+    service.close()
+
+
+def test_server_answers_503_with_retry_after(server, blocked):
+    release, started = blocked
+    instance = server(workers=1, queue_size=1)
+    client = SplitClient(instance.url)
+    threads = [
+        threading.Thread(target=lambda rows=rows: client.split(sheet_bytes(), rows=rows))
+        for rows in (1, 2)
+    ]
+    threads[0].start()
+    assert started.acquire(timeout=5)
+    threads[1].start()
+    deadline = time.monotonic() + 5
+    while instance.service.queue.qsize() < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    code, headers = status(lambda: client.split(sheet_bytes(), rows=3))
+    assert code == 503
+    assert headers["Retry-After"] == "1"
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+
+def test_server_answers_504_on_timeout(server, blocked, monkeypatch):
+    monkeypatch.setattr(SplitRequestHandler, "timeout_seconds", 0.05)
+    code, _ = status(lambda: SplitClient(server().url).split(sheet_bytes()))
+    assert code == 504
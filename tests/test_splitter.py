@@ -0,0 +1,101 @@
+from PIL import Image
+from ImageSplitter import ImageSplitterDecorator, SplitterStrategy, SplitterAutoStrategy
+from ImageMask import Mask
+import numpy as np
+import pytest
+
+
+def sheet():
+    image = Image.new("RGBA", (40, 20), (0, 0, 0, 0))
+    image.paste((255, 0, 0, 255), (2, 3, 8, 9))
+    image.paste((0, 255, 0, 255), (24, 10, 30, 18))
+    return image
+
+
+def test_auto_mode_finds_sprites():
+    splitter = ImageSplitterDecorator(sheet(), 1, 1)
+    assert isinstance(splitter.strategy, SplitterAutoStrategy)
+    assert splitter.boxes().to_list() == [(2, 3, 8, 9), (24, 10, 30, 18)]
+
+
+def test_grid_mode_cuts_after_margins():
+    splitter = ImageSplitterDecorator(sheet(), 2, 2, left=4, right=4, top=2, bottom=2, mode="grid")
+    assert type(splitter.strategy) is SplitterStrategy
+    assert splitter.boxes().to_list() == [(4, 2, 20, 10), (20, 2, 36, 10), (4, 10, 20, 18), (20, 10, 36, 18)]
+    assert [sprite.size for sprite in splitter.split()] == [(16, 8)] * 4
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        ImageSplitterDecorator(sheet(), 1, 1, mode="magic")
+
+
+def test_no_rows():
+    with pytest.raises(ValueError):
+        ImageSplitterDecorator(sheet(), 0, 1)
+
+
+def test_grid_trim_reaches_content():
+    splitter = ImageSplitterDecorator(sheet(), 1, 2, mode="grid", trim=True)
+    assert splitter.boxes().to_list() == [(2, 3, 8, 9), (24, 10, 30, 18)]
+    assert splitter.sources.to_list() == [(0, 0, 20, 20), (20, 0, 40, 20)]
+    assert [sprite.size for sprite in splitter.split()] == [(6, 6), (6, 8)]
+
+
+def test_grid_trim_builds_striped_mask(monkeypatch):
+    def no_lists(self):
+        raise AssertionError("the standard mask builds Python lists")
+
+    monkeypatch.setattr(Mask, "get_mask", lambda self: self.get_striped_mask() if self.low_memory else no_lists(self))
+    splitter = ImageSplitterDecorator(sheet(), 1, 2, mode="grid", trim=True)
+    assert splitter.boxes().to_list() == [(2, 3, 8, 9), (24, 10, 30, 18)]
+
+
+def test_auto_trim_reuses_strategy_mask(monkeypatch):
+    import ImageSplitter
+
+    splitter = ImageSplitterDecorator(sheet(), 1, 1, trim=True)
+    built = []
+    original = ImageSplitter.Mask
+
+    def counting_mask(*args, **kwargs):
+        built.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(ImageSplitter, "Mask", counting_mask)
+    splitter.boxes()
+    assert len(built) == 1
+
+
+def test_content_box():
+    assert SplitterStrategy.content_box(np.array([[0, 0, 0], [0, 1, 0], [0, 0, 1]])) == (1, 1, 3, 3)
+    assert SplitterStrategy.content_box(np.zeros((2, 2))) is None
+
+
+def opaque_sheet():
+    image = Image.new("RGB", (40, 20), (255, 255, 255))
+    image.paste((255, 0, 0), (2, 3, 8, 9))
+    image.paste((0, 255, 0), (24, 10, 30, 18))
+    return image
+
+
+@pytest.mark.parametrize("low_memory", [False, True])
+def test_region_starting_inside_a_sprite(low_memory):
+    strategy = SplitterAutoStrategy(1, 1, low_memory=low_memory)
+    boxes, _ = strategy.region_boxes(opaque_sheet(), [(4, 5, 40, 20)])
+    assert boxes.to_list() == [(4, 5, 8, 9), (24, 10, 30, 18)]
+
+
+def test_region_trim_uses_sheet_background():
+    strategy = SplitterStrategy(1, 1, 0, 0, 0, 0)
+    boxes, sources = strategy.region_boxes(opaque_sheet(), [(4, 5, 12, 12)], trim=True)
+    assert sources.to_list() == [(4, 5, 12, 12)]
+    assert boxes.to_list() == [(4, 5, 8, 9)]
+
+
+def test_mask_background_can_be_given():
+    image = opaque_sheet().crop((4, 5, 12, 12))
+    assert Mask(image).bg == [255, 0, 0]
+    mask = Mask(image, bg=(255, 255, 255))
+    assert mask.bg == [255, 255, 255]
+    assert mask.mask_array[:4, :4].all() and not mask.mask_array[4:].any()
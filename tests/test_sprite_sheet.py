@@ -0,0 +1,56 @@
+from PIL import Image
+from SpriteSheet import SplitOptions, SplitResult, split_sheet
+import pytest
+
+
+def sheet():
+    image = Image.new("RGBA", (40, 20), (0, 0, 0, 0))
+    image.paste((255, 0, 0, 255), (2, 3, 8, 9))
+    image.paste((0, 255, 0, 255), (24, 10, 30, 18))
+    return image
+
+
+def test_split_path(tmp_path):
+    sheet().save(tmp_path / "sheet.png")
+    result = split_sheet(str(tmp_path / "sheet.png"))
+    assert isinstance(result, SplitResult)
+    assert len(result) == 2
+    assert result.size == (40, 20)
+    assert result.boxes.to_list() == [(2, 3, 8, 9), (24, 10, 30, 18)]
+    assert result.sources is None
+    assert result.background == (0, 0, 0, 0)
+    assert {"open", "boxes", "total"} <= set(result.stats)
+
+
+def test_sprites_are_cropped_lazily():
+    result = split_sheet(sheet())
+    assert result.sprites.cropper is None
+    assert result.sprites[1].size == (6, 8)
+    assert [sprite.getpixel((0, 0)) for sprite in result.sprites] == [(255, 0, 0, 255), (0, 255, 0, 255)]
+
+
+def test_grid_trim_keeps_sources():
+    result = split_sheet(sheet(), columns=2, mode="grid", trim=True)
+    assert result.boxes.to_list() == [(2, 3, 8, 9), (24, 10, 30, 18)]
+    assert result.sources.to_list() == [(0, 0, 20, 20), (20, 0, 40, 20)]
+    assert result.background == (0, 0, 0, 0)
+    assert "trim" in result.stats
+
+
+def test_options_and_kwargs_agree():
+    assert split_sheet(sheet(), SplitOptions(2, 2, mode="grid")).boxes == split_sheet(
+        sheet(), rows=2, columns=2, mode="grid"
+    ).boxes
+
+
+@pytest.mark.parametrize("kwargs", [{"rows": 0}, {"columns": 0}, {"mode": "magic"}])
+def test_invalid_options(kwargs):
+    with pytest.raises(ValueError):
+        SplitOptions(**kwargs)
+
+
+def test_backends_agree():
+    boxes = split_sheet(sheet()).boxes
+    for backend in ("serial", "tiles", "numba"):
+        assert split_sheet(sheet(), backend=backend).boxes == boxes
+    assert split_sheet(sheet(), low_memory=True).boxes == boxes
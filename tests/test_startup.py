@@ -0,0 +1,21 @@
+import Startup
+import io
+import sys
+
+
+def test_import_times_run_in_a_fresh_interpreter():
+    import argparse
+
+    assert "argparse" in sys.modules
+    times = dict(Startup.import_times(["argparse", "missing_module_name"]))
+    # argparse is loaded here, a cold import still costs more than a cache hit
+    assert times["argparse"] > 0.001
+    assert times["missing_module_name"] is None
+
+
+def test_import_report_lists_both_groups():
+    stream = io.StringIO()
+    Startup.print_import_report(["json"], ["ImageBoxes"], stream)
+    report = stream.getvalue()
+    assert report.index("startup imports") < report.index("json") < report.index("deferred imports")
+    assert "ImageBoxes" in report
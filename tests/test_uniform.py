@@ -0,0 +1,51 @@
+from PIL import Image
+from ImageUniform import UniformSheet
+import Cli
+import json
+import pytest
+
+
+def sprites():
+    return [Image.new("RGBA", (4, 8), (255, 0, 0, 255)), Image.new("RGBA", (6, 4), (0, 255, 0, 255))]
+
+
+def test_cells_are_largest_sprite():
+    sheet = UniformSheet(sprites(), columns=2)
+    assert sheet.cell == (6, 8)
+    assert sheet.build().size == (12, 8)
+    assert sheet.position(1) == (6, 4)
+
+
+def test_square_grid_by_default():
+    sheet = UniformSheet(sprites() * 3)
+    assert (sheet.columns, sheet.rows) == (3, 2)
+
+
+def test_mixed_modes_give_rgba():
+    sheet = UniformSheet([Image.new("RGB", (2, 2)), Image.new("L", (2, 2))])
+    assert sheet.mode() == "RGBA"
+
+
+@pytest.mark.parametrize("type_img, mode", [("png", "RGBA"), ("jpg", "RGB"), ("JPEG", "RGB")])
+def test_save_drops_alpha_for_jpeg(tmp_path, type_img, mode):
+    filename = UniformSheet(sprites()).save(str(tmp_path), "sheet", type_img)
+    with Image.open(filename) as image:
+        assert image.mode == mode
+    with open(tmp_path / "sheetcells.json") as file:
+        assert json.load(file)["image"] == "sheet." + type_img
+
+
+def test_uniform_jpeg_from_command_line(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    image = Image.new("RGB", (20, 10), (255, 255, 255))
+    image.paste((255, 0, 0), (2, 2, 6, 8))
+    image.paste((0, 0, 255), (12, 3, 18, 6))
+    image.save(tmp_path / "sheet.jpg", quality=100)
+    Cli.main(["sheet.jpg", "--uniform", "--anchor", "center", "-o", "out"])
+    with Image.open(tmp_path / "out" / "sprite.jpg") as sheet:
+        assert sheet.mode == "RGB"
+
+
+def test_parser_rejects_unknown_anchor():
+    with pytest.raises(SystemExit):
+        Cli.build_parser().parse_args(["sheet.png", "--uniform", "--anchor", "middle"])
@@ -0,0 +1,123 @@
+from PIL import Image
+from ImageWatcher import SheetWatcher
+import json
+import os
+import time
+import pytest
+
+
+def write_sheet(path, count, color=(255, 0, 0, 255)):
+    image = Image.new("RGBA", (10 * count, 8), (0, 0, 0, 0))
+    for i in range(count):
+        image.paste(color, (10 * i + 2, 2, 10 * i + 6, 6))
+    image.save(path)
+
+
+@pytest.fixture
+def sheets(tmp_path):
+    directory = tmp_path / "sheets"
+    directory.mkdir()
+    return directory, tmp_path / "out"
+
+
+def test_resplit_writes_and_removes_stale_sprites(sheets):
+    directory, out = sheets
+    write_sheet(directory / "hero.png", 3)
+    watcher = SheetWatcher(str(directory), str(out))
+    assert watcher.resplit(str(directory / "hero.png"))
+    assert sorted(os.listdir(out / "hero")) == ["hero0.png", "hero1.png", "hero2.png"]
+    write_sheet(directory / "hero.png", 1)
+    assert watcher.resplit(str(directory / "hero.png"))
+    assert os.listdir(out / "hero") == ["hero0.png"]
+
+
+def test_unchanged_content_is_skipped(sheets):
+    directory, out = sheets
+    write_sheet(directory / "hero.png", 2)
+    watcher = SheetWatcher(str(directory), str(out))
+    assert watcher.resplit(str(directory / "hero.png"))
+    assert not watcher.resplit(str(directory / "hero.png"))
+
+
+def test_scan_debounces_changes(sheets):
+    directory, out = sheets
+    write_sheet(directory / "hero.png", 2)
+    watcher = SheetWatcher(str(directory), str(out), delay=0.05)
+    assert watcher.scan() == [str(directory / "hero.png")]
+    assert watcher.scan() == []
+    deadline = time.monotonic() + 5
+    while not (out / "hero" / "hero1.png").exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert (out / "hero" / "hero1.png").exists()
+
+
+def test_forget_drops_everything(sheets):
+    directory, out = sheets
+    path = str(directory / "hero.png")
+    write_sheet(path, 2)
+    watcher = SheetWatcher(str(directory), str(out), delay=10)
+    watcher.scan()
+    watcher.resplit(path)
+    digest = watcher.hashes[path]
+    assert digest in watcher.cache and path in watcher.counts
+    os.remove(path)
+    watcher.scan()
+    assert path not in watcher.stats
+    assert path not in watcher.hashes
+    assert path not in watcher.counts
+    assert path not in watcher.debouncers
+    assert digest not in watcher.cache
+
+
+def test_forget_keeps_boxes_shared_with_another_sheet(sheets):
+    directory, out = sheets
+    write_sheet(directory / "hero.png", 2)
+    write_sheet(directory / "copy.png", 2)
+    watcher = SheetWatcher(str(directory), str(out))
+    watcher.resplit(str(directory / "hero.png"))
+    watcher.resplit(str(directory / "copy.png"))
+    watcher.forget(str(directory / "hero.png"))
+    assert watcher.hashes[str(directory / "copy.png")] in watcher.cache
+
+
+def test_dedup_writes_unique_sprites_and_mapping(sheets):
+    directory, out = sheets
+    write_sheet(directory / "hero.png", 3)
+    watcher = SheetWatcher(str(directory), str(out), dedup="exact")
+    watcher.resplit(str(directory / "hero.png"))
+    assert sorted(os.listdir(out / "hero")) == ["hero0.png", "heromapping.json"]
+    with open(out / "hero" / "heromapping.json") as file:
+        assert len(json.load(file)["frames"]) == 3
+
+
+def test_manifest_output(sheets):
+    directory, out = sheets
+    write_sheet(directory / "hero.png", 2)
+    watcher = SheetWatcher(str(directory), str(out), output="texturepacker")
+    watcher.resplit(str(directory / "hero.png"))
+    assert os.listdir(out / "hero") == ["hero.json"]
+
+
+def test_trim_manifest_names_the_sheet_file(sheets):
+    from SpriteSheet import SplitOptions
+
+    directory, out = sheets
+    write_sheet(directory / "hero.png", 2)
+    watcher = SheetWatcher(str(directory), str(out), SplitOptions(1, 2, mode="grid", trim=True))
+    watcher.resplit(str(directory / "hero.png"))
+    with open(out / "hero" / "hero.json") as file:
+        assert json.load(file)["image"] == "hero.png"
+
+
+def test_archive_output(sheets):
+    directory, out = sheets
+    write_sheet(directory / "hero.png", 2)
+    watcher = SheetWatcher(str(directory), str(out), output="zip")
+    watcher.resplit(str(directory / "hero.png"))
+    assert os.listdir(out / "hero") == ["hero.zip"]
+
+
+def test_unknown_output(sheets):
+    directory, out = sheets
+    with pytest.raises(ValueError):
+        SheetWatcher(str(directory), str(out), output="rar")